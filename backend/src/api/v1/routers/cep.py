@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Query, HTTPException, Path
+from typing import List
+
+from fastapi import APIRouter, Body, Query, HTTPException, Path
 from ..services.viacep_service import viacep_service
 
 router = APIRouter(prefix="/cep", tags=["CEP & Exchange"])
@@ -26,6 +28,16 @@ async def get_address_by_cep(
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 
+@router.post("/batch")
+async def get_addresses_by_ceps(
+    ceps: List[str] = Body(..., min_length=1, max_length=50, description="Até 50 CEPs para consultar")
+):
+    try:
+        return await viacep_service.get_addresses_by_ceps(ceps)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+
 @router.get("/search/{state}/{city}/{street}")
 async def search_addresses_by_location(
     state: str = Path(..., description="UF do estado (ex: SP, RJ, RS)"),
@@ -83,6 +95,7 @@ async def cep_health():
         "providers": ["ViaCEP"],
         "endpoints": [
             "/cep/{cep}",
+            "/cep/batch",
             "/cep/search/{state}/{city}/{street}",
             "/cep/validate/{cep}"
         ]
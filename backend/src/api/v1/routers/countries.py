@@ -18,7 +18,10 @@ async def list_countries():
 @router.get("/search/{name}", response_model=SuccessResponse)
 async def get_country(name: str):
     try:
-        return await countries_service.get_country_by_name(name)
+        result = await countries_service.get_country_by_name(name)
+        if result.get("not_found"):
+            raise ValueError(result["error"])
+        return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -28,7 +31,10 @@ async def get_country(name: str):
 @router.get("/region/{region}", response_model=SuccessResponse)
 async def get_countries_by_region(region: str):
     try:
-        return await countries_service.get_countries_by_region(region)
+        result = await countries_service.get_countries_by_region(region)
+        if result.get("not_found"):
+            raise ValueError(result["error"])
+        return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
-from ..services.worldbank_service import worldbank_service
+from ..services.worldbank_service import COMMON_INDICATORS, worldbank_service
 
 router = APIRouter(prefix="/worldbank", tags=["World Bank"])
 
@@ -54,46 +54,5 @@ async def get_economic_indicator(
 async def get_common_indicators():
     return {
         "success": True,
-        "indicators": [
-            {
-                "code": "NY.GDP.MKTP.CD",
-                "name": "PIB (US$ correntes)",
-                "description": "Produto Interno Bruto em dólares americanos correntes"
-            },
-            {
-                "code": "NY.GDP.PCAP.CD", 
-                "name": "PIB per capita (US$ correntes)",
-                "description": "PIB per capita em dólares americanos correntes"
-            },
-            {
-                "code": "SP.POP.TOTL",
-                "name": "População total",
-                "description": "População total do país"
-            },
-            {
-                "code": "SL.UEM.TOTL.ZS",
-                "name": "Taxa de desemprego (%)",
-                "description": "Taxa de desemprego como percentual da força de trabalho"
-            },
-            {
-                "code": "FP.CPI.TOTL.ZG",
-                "name": "Inflação (CPI %)",
-                "description": "Inflação medida pelo índice de preços ao consumidor"
-            },
-            {
-                "code": "NE.EXP.GNFS.ZS",
-                "name": "Exportações (% do PIB)",
-                "description": "Exportações de bens e serviços como % do PIB"
-            },
-            {
-                "code": "NE.IMP.GNFS.ZS", 
-                "name": "Importações (% do PIB)",
-                "description": "Importações de bens e serviços como % do PIB"
-            },
-            {
-                "code": "SE.ADT.LITR.ZS",
-                "name": "Taxa de alfabetização (%)",
-                "description": "Taxa de alfabetização de adultos"
-            }
-        ]
+        "indicators": COMMON_INDICATORS
     }
@@ -2,8 +2,9 @@
 Countries API Client
 Cliente para comunicação com RestCountries API
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from src.utils.http_client import http_client
+from src.utils.json_projection import JSONProjection
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,7 +16,11 @@ class CountriesAPIClient:
     def __init__(self):
         self.base_url = "https://restcountries.com/v3.1"
     
-    async def fetch_all(self, fields: str = None) -> Dict[str, Any]:
+    async def fetch_all(
+        self,
+        fields: str = None,
+        projection: Optional[JSONProjection] = None
+    ) -> Dict[str, Any]:
         """Busca todos os países"""
         url = f"{self.base_url}/all"
         params = {}
@@ -25,7 +30,7 @@ class CountriesAPIClient:
         logger.info("Buscando todos os países")
         
         async with http_client() as client:
-            return await client.request("GET", url, params=params)
+            return await client.request("GET", url, params=params, projection=projection)
     
     async def fetch_by_name(self, name: str) -> Dict[str, Any]:
         """Busca país por nome"""
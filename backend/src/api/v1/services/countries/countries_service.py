@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from src.utils.cache import cached
+from src.utils.http_client import is_not_found_error
 from src.utils.logger import get_logger
 from .api_client import CountriesAPIClient
 from .processors import CountriesDataProcessor
@@ -17,6 +18,7 @@ class CountriesService:
     async def get_all_countries(self) -> Dict[str, Any]:
         try:
             fields = "name,capital,region,population,area,flags,currencies,cca2,cca3"
+            # Projeção e cache da lista vêm da política "countries_all" (raw)
             response = await self.api_client.fetch_all(fields=fields)
             
             data = response.get("data", [])
@@ -47,7 +49,9 @@ class CountriesService:
             if not data:
                 return {
                     "success": False,
-                    "error": f"País '{name}' não encontrado"
+                    "message": f"País '{name}' não encontrado",
+                    "error": f"País '{name}' não encontrado",
+                    "not_found": True
                 }
             
             country = self.processor.process_country_detailed(data[0])
@@ -61,6 +65,15 @@ class CountriesService:
                 "cache_info": response.get("cache_info", {})
             }
         except Exception as e:
+            if is_not_found_error(e):
+                # 404 da RestCountries: cacheado com o TTL negativo
+                logger.info(f"País {name} não encontrado")
+                return {
+                    "success": False,
+                    "message": f"País '{name}' não encontrado",
+                    "error": f"País '{name}' não encontrado",
+                    "not_found": True
+                }
             logger.error(f"Erro ao buscar país {name}: {e}")
             return {
                 "success": False,
@@ -77,7 +90,9 @@ class CountriesService:
             if not data:
                 return {
                     "success": False,
-                    "error": f"Região '{region}' não encontrada"
+                    "message": f"Região '{region}' não encontrada",
+                    "error": f"Região '{region}' não encontrada",
+                    "not_found": True
                 }
             
             countries = []
@@ -109,6 +124,14 @@ class CountriesService:
                 "cache_info": response.get("cache_info", {})
             }
         except Exception as e:
+            if is_not_found_error(e):
+                logger.info(f"Região {region} não encontrada")
+                return {
+                    "success": False,
+                    "message": f"Região '{region}' não encontrada",
+                    "error": f"Região '{region}' não encontrada",
+                    "not_found": True
+                }
             logger.error(f"Erro ao buscar países da região {region}: {e}")
             return {
                 "success": False,
@@ -44,7 +44,8 @@ class NewsAPIClient:
                 url,
                 params=params,
                 headers=headers,
-                cache_ttl=cache_ttl
+                cache_ttl=cache_ttl,
+                quota="news"
             )
         
         await api_metrics_logger.log_api_metrics(
@@ -3,9 +3,28 @@ from src.utils.http_client import http_client
 from src.utils.cache import cached
 from src.core.settings import settings
 from src.utils.logger import get_logger
+from src.utils.json_projection import JSONProjection
 import urllib.parse
 
 
+# Campos de /search.json efetivamente usados por search_books
+SEARCH_PROJECTION = JSONProjection([
+    "numFound",
+    "start",
+    "docs.item.title",
+    "docs.item.author_name",
+    "docs.item.first_publish_year",
+    "docs.item.isbn",
+    "docs.item.language",
+    "docs.item.subject",
+    "docs.item.publisher",
+    "docs.item.cover_i",
+    "docs.item.key",
+    "docs.item.ratings_average",
+    "docs.item.ratings_count"
+])
+
+
 class OpenLibraryService:
     
     def __init__(self):
@@ -38,7 +57,9 @@ class OpenLibraryService:
             self.logger.info(f"Buscando livros: query='{query}', limit={limit}")
 
             async with http_client() as client:
-                response = await client.request("GET", url, params=params)
+                response = await client.request(
+                    "GET", url, params=params, projection=SEARCH_PROJECTION
+                )
             response_data = response.get("data", {})
             if response_data.get("docs"):
                 books = []
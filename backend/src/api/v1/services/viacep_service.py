@@ -1,6 +1,12 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import asyncio
 import re
 
+from src.utils.cache import cached, cached_batch
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class ViaCEPService:
 
@@ -18,54 +24,74 @@ class ViaCEPService:
         
         raise ValueError(f"CEP inválido: {cep}. Deve conter 8 dígitos.")
     
+    async def _lookup_cep(self, validated_cep: str) -> Dict[str, Any]:
+        from src.utils.http_client import http_client
+        
+        # A entrada do cache é compartilhada por todas as grafias do CEP
+        cep = f"{validated_cep[:5]}-{validated_cep[5:]}"
+        url = f"{self.base_url}/{validated_cep}/json/"
+        
+        logger.info(f"Consultando CEP: {cep}")
+        
+        async with http_client() as client:
+            response = await client.request("GET", url)
+        
+        data = response.get("data", {})
+        
+        if data.get("erro"):
+            # CEP inexistente: cacheado com o TTL negativo do namespace "cep"
+            return {
+                "success": False,
+                "error": "CEP não encontrado",
+                "cep": cep,
+                "not_found": True
+            }
+        
+        return {
+            "success": True,
+            "message": f"CEP {cep} encontrado com sucesso",
+            "data": {
+                "cep": data.get("cep"),
+                "street": data.get("logradouro"),
+                "complement": data.get("complemento"),
+                "neighborhood": data.get("bairro"), 
+                "city": data.get("localidade"),
+                "state": data.get("uf"),
+                "ibge_code": data.get("ibge"),
+                "gia_code": data.get("gia"),
+                "ddd": data.get("ddd"),
+                "siafi_code": data.get("siafi")
+            },
+            "cache_info": response.get("cache_info", {})
+        }
+    
+    @cached(ttl=86400, key_prefix="cep")
+    async def _fetch_cep(self, validated_cep: str) -> Dict[str, Any]:
+        return await self._lookup_cep(validated_cep)
+    
+    # Mesmas entradas do _fetch_cep: um MGET para o lote todo
+    @cached_batch("validated_ceps", ttl=86400, key_prefix="cep", item_key="validated_cep")
+    async def _fetch_ceps(self, validated_ceps: List[str]) -> Dict[str, Dict[str, Any]]:
+        responses = await asyncio.gather(
+            *(self._lookup_cep(c) for c in validated_ceps),
+            return_exceptions=True
+        )
+        found = {}
+        errors = []
+        for validated_cep, result in zip(validated_ceps, responses):
+            if isinstance(result, Exception):
+                logger.error(f"Erro ao consultar CEP {validated_cep}: {result}")
+                errors.append(result)
+            else:
+                found[validated_cep] = result
+        if errors and not found:
+            raise errors[0]
+        return found
+    
     async def get_address_by_cep(self, cep: str) -> Dict[str, Any]:
         try:
-            from src.utils.http_client import http_client
-            from src.utils.logger import get_logger
-            from src.utils.cache import cached
-            
-            logger = get_logger(__name__)
-            
-
             clean_cep = self._validate_cep(cep)
-            
-            @cached(ttl=86400, key_prefix="cep") 
-            async def _fetch_cep(validated_cep: str):
-                url = f"{self.base_url}/{validated_cep}/json/"
-                
-                logger.info(f"Consultando CEP: {cep}")
-                
-                async with http_client() as client:
-                    response = await client.request("GET", url)
-                
-                data = response.get("data", {})
-                
-                if data.get("erro"):
-                    return {
-                        "success": False,
-                        "error": "CEP não encontrado",
-                        "cep": cep
-                    }
-                
-                return {
-                    "success": True,
-                    "message": f"CEP {cep} encontrado com sucesso",
-                    "data": {
-                        "cep": data.get("cep"),
-                        "street": data.get("logradouro"),
-                        "complement": data.get("complemento"),
-                        "neighborhood": data.get("bairro"), 
-                        "city": data.get("localidade"),
-                        "state": data.get("uf"),
-                        "ibge_code": data.get("ibge"),
-                        "gia_code": data.get("gia"),
-                        "ddd": data.get("ddd"),
-                        "siafi_code": data.get("siafi")
-                    },
-                    "cache_info": response.get("cache_info", {})
-                }
-            
-            return await _fetch_cep(clean_cep)
+            return await self._fetch_cep(clean_cep)
             
         except ValueError as ve:
             return {
@@ -75,8 +101,6 @@ class ViaCEPService:
                 "data": {"cep": cep}
             }
         except Exception as e:
-            from src.utils.logger import get_logger
-            logger = get_logger(__name__)
             logger.error(f"Erro ao consultar CEP {cep}: {e}")
             return {
                 "success": False,
@@ -85,6 +109,37 @@ class ViaCEPService:
                 "data": {"cep": cep}
             }
     
+    async def get_addresses_by_ceps(self, ceps: List[str]) -> Dict[str, Any]:
+        # CEP limpo -> como foi informado
+        valid: Dict[str, str] = {}
+        invalid: List[str] = []
+        for cep in ceps:
+            try:
+                valid.setdefault(self._validate_cep(cep), cep)
+            except ValueError:
+                invalid.append(cep)
+        
+        try:
+            results = await self._fetch_ceps(list(valid)) if valid else {}
+        except Exception as e:
+            logger.error(f"Erro ao consultar lote de {len(valid)} CEPs: {e}")
+            results = {}
+        
+        addresses = {
+            cep: results.get(
+                clean_cep,
+                {"success": False, "error": f"Erro ao consultar CEP {cep}", "cep": cep}
+            )
+            for clean_cep, cep in valid.items()
+        }
+        return {
+            "success": True,
+            "total": len(addresses),
+            "found": sum(1 for address in addresses.values() if address.get("success")),
+            "results": addresses,
+            "invalid": invalid
+        }
+    
     async def search_addresses_by_location(
         self, 
         state: str, 
@@ -93,11 +148,8 @@ class ViaCEPService:
     ) -> Dict[str, Any]:
         try:
             from src.utils.http_client import http_client
-            from src.utils.logger import get_logger
             import urllib.parse
             
-            logger = get_logger(__name__)
-            
             if len(state) != 2:
                 raise ValueError("Estado deve ter 2 caracteres (UF)")
             
@@ -158,8 +210,6 @@ class ViaCEPService:
                 "search_params": {"state": state, "city": city, "street": street}
             }
         except Exception as e:
-            from src.utils.logger import get_logger
-            logger = get_logger(__name__)
             logger.error(f"Erro ao buscar endereços: {e}")
             return {
                 "success": False,
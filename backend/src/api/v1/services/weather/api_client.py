@@ -47,7 +47,9 @@ class WeatherAPIClient:
         )
         
         async with http_client() as client:
-            response = await client.request("GET", url, params=params, cache_ttl=cache_ttl)
+            response = await client.request(
+                "GET", url, params=params, cache_ttl=cache_ttl, quota="weather"
+            )
         
         await api_metrics_logger.log_api_metrics(
             api_name="OpenWeatherMap",
@@ -74,7 +76,9 @@ class WeatherAPIClient:
         )
         
         async with http_client() as client:
-            response = await client.request("GET", url, params=params, cache_ttl=cache_ttl)
+            response = await client.request(
+                "GET", url, params=params, cache_ttl=cache_ttl, quota="weather"
+            )
         
         await api_metrics_logger.log_api_metrics(
             api_name="OpenWeatherMap",
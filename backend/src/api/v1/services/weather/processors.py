@@ -10,7 +10,6 @@ class WeatherDataProcessor:
     def process_current_weather(weather_data: CurrentWeatherData) -> Dict[str, Any]:
         """Processa dados de clima atual"""
         return {
-            "raw_data": weather_data.dict(),
             "processed": {
                 "location": {
                     "city": weather_data.name,
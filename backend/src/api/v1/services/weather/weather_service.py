@@ -67,7 +67,6 @@ class WeatherService:
         
         result = {
             "processed": processed_forecast,
-            "raw_data": forecast_data,
             "cache_info": response["cache_info"]
         }
         
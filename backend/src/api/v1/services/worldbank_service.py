@@ -1,10 +1,67 @@
 
 from typing import Dict, Any, List, Optional
+from src.utils.cache import cached
 from src.utils.http_client import http_client
 from src.utils.logger import get_logger
+from src.utils.json_projection import JSONProjection
 
 logger = get_logger(__name__)
 
+# Respostas do World Bank são [metadados, [registros]]; a projeção da lista
+# de países fica na política "worldbank_countries" (cache raw)
+INDICATOR_PROJECTION = JSONProjection([
+    "item.total",
+    "item.item.date",
+    "item.item.value",
+    "item.item.country.value",
+    "item.item.countryiso3code",
+    "item.item.indicator.value"
+])
+
+# Indicadores mais consultados (listados em /indicators/common e aquecidos no cache)
+COMMON_INDICATORS = [
+    {
+        "code": "NY.GDP.MKTP.CD",
+        "name": "PIB (US$ correntes)",
+        "description": "Produto Interno Bruto em dólares americanos correntes"
+    },
+    {
+        "code": "NY.GDP.PCAP.CD", 
+        "name": "PIB per capita (US$ correntes)",
+        "description": "PIB per capita em dólares americanos correntes"
+    },
+    {
+        "code": "SP.POP.TOTL",
+        "name": "População total",
+        "description": "População total do país"
+    },
+    {
+        "code": "SL.UEM.TOTL.ZS",
+        "name": "Taxa de desemprego (%)",
+        "description": "Taxa de desemprego como percentual da força de trabalho"
+    },
+    {
+        "code": "FP.CPI.TOTL.ZG",
+        "name": "Inflação (CPI %)",
+        "description": "Inflação medida pelo índice de preços ao consumidor"
+    },
+    {
+        "code": "NE.EXP.GNFS.ZS",
+        "name": "Exportações (% do PIB)",
+        "description": "Exportações de bens e serviços como % do PIB"
+    },
+    {
+        "code": "NE.IMP.GNFS.ZS", 
+        "name": "Importações (% do PIB)",
+        "description": "Importações de bens e serviços como % do PIB"
+    },
+    {
+        "code": "SE.ADT.LITR.ZS",
+        "name": "Taxa de alfabetização (%)",
+        "description": "Taxa de alfabetização de adultos"
+    }
+]
+
 
 class WorldBankService:
 
@@ -12,6 +69,7 @@ class WorldBankService:
     def __init__(self):
         self.base_url = "https://api.worldbank.org/v2"
     
+    @cached(ttl=86400, key_prefix="worldbank_countries")
     async def get_countries(self, per_page: int = 100) -> Dict[str, Any]:
     
         try:
@@ -65,6 +123,7 @@ class WorldBankService:
                 "error": str(e)
             }
     
+    @cached(ttl=3600, key_prefix="worldbank_indicator")
     async def get_economic_indicator(
         self, 
         country_code: str, 
@@ -84,10 +143,14 @@ class WorldBankService:
             logger.info(f"Buscando indicador {indicator} para país {country_code}")
             
             async with http_client() as client:
-                response_data = await client.request("GET", url, params=params)
+                response_data = await client.request(
+                    "GET", url, params=params, projection=INDICATOR_PROJECTION
+                )
                 response = response_data.get("data")
             
-            if isinstance(response, list) and len(response) > 1:
+            # Sem registros o World Bank devolve [metadados, null] e, para
+            # código inválido, só [mensagem]
+            if isinstance(response, list) and len(response) > 1 and response[1]:
                 metadata = response[0]
                 data = response[1]
                 
@@ -113,7 +176,8 @@ class WorldBankService:
             return {
                 "success": True,
                 "data": [],
-                "message": "Nenhum dado encontrado"
+                "message": "Nenhum dado encontrado",
+                "not_found": True
             }
             
         except Exception as e:
@@ -1,9 +1,16 @@
+import asyncio
+import importlib.util
 import logging
+import random
 import sys
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict, Optional
 
+import httpx
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -59,34 +66,237 @@ def setup_logging():
 
 redis_client: redis.Redis = None
 
+# connected, reconnecting (fora do ar, com reconexão em andamento) ou disconnected
+redis_state: Dict[str, Any] = {
+    "status": "disconnected",
+    "since": None,
+    "attempts": 0,
+    "last_error": None
+}
+_redis_reconnect_task: Optional[asyncio.Task] = None
+
+
+def _new_redis_client() -> redis.Redis:
+    return redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_password,
+        db=settings.redis_db,
+        decode_responses=True,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+        health_check_interval=30,
+    )
+
+
+def _set_redis_status(status: str, error: Optional[Exception] = None) -> None:
+    from src.utils.metrics import REDIS_CONNECTED
+    
+    redis_state.update(
+        status=status,
+        since=time.time(),
+        last_error=str(error) if error else None
+    )
+    if status != "reconnecting":
+        redis_state["attempts"] = 0
+    REDIS_CONNECTED.set(1 if status == "connected" else 0)
+
 
 async def init_redis():
     global redis_client
     
     try:
-        redis_client = redis.Redis(
-            host=settings.redis_host,
-            port=settings.redis_port,
-            password=settings.redis_password,
-            db=settings.redis_db,
-            decode_responses=True,
-            socket_timeout=5,
-            socket_connect_timeout=5,
-            health_check_interval=30,
-        )
+        redis_client = _new_redis_client()
         await redis_client.ping()
+        _set_redis_status("connected")
         logging.info(f"Redis conectado em {settings.redis_host}:{settings.redis_port}")
         
     except Exception as e:
         logging.error(f"Erro ao conectar com Redis: {e}")
-        redis_client = None
+        _set_redis_status("reconnecting", e)
+        _start_redis_reconnect()
 
 
-async def close_redis():
+async def _reconnect_redis():
+    """Tenta reconectar com backoff exponencial com jitter até conseguir"""
     global redis_client
+    from src.utils.local_cache import fallback_cache
+    from src.utils.metrics import REDIS_RECONNECT_ATTEMPTS
+    
+    delay = settings.redis_reconnect_min_delay
+    while True:
+        await asyncio.sleep(delay)
+        redis_state["attempts"] += 1
+        try:
+            client = redis_client or _new_redis_client()
+            await client.ping()
+        except Exception as e:
+            redis_state["last_error"] = str(e)
+            REDIS_RECONNECT_ATTEMPTS.labels("error").inc()
+            delay = min(
+                settings.redis_reconnect_max_delay,
+                random.uniform(settings.redis_reconnect_min_delay, delay * 3)
+            )
+            continue
+        
+        redis_client = client
+        attempts = redis_state["attempts"]
+        _set_redis_status("connected")
+        # Valores gravados durante a queda não estão no Redis: recomeça por lá
+        fallback_cache.clear()
+        REDIS_RECONNECT_ATTEMPTS.labels("success").inc()
+        logging.info(f"Redis reconectado após {attempts} tentativas")
+        return
+
+
+def _start_redis_reconnect() -> None:
+    global _redis_reconnect_task
+    if _redis_reconnect_task and not _redis_reconnect_task.done():
+        return
+    _redis_reconnect_task = asyncio.get_running_loop().create_task(_reconnect_redis())
+
+
+def report_redis_error(error: Exception) -> None:
+    """
+    Chamado pelos usuários do Redis ao falhar uma operação: erro de conexão
+    tira o Redis de uso (get_redis_client passa a devolver None, e o cache
+    usa a memória local) até a reconexão em segundo plano ter sucesso.
+    """
+    if not isinstance(error, (RedisConnectionError, RedisTimeoutError, OSError)):
+        return
+    if redis_state["status"] != "connected":
+        return
+    logging.error(f"Redis indisponível, usando cache local até reconectar: {error}")
+    _set_redis_status("reconnecting", error)
+    _start_redis_reconnect()
+
+
+async def close_redis():
+    global redis_client, _redis_reconnect_task
+    if _redis_reconnect_task and not _redis_reconnect_task.done():
+        _redis_reconnect_task.cancel()
+        try:
+            await _redis_reconnect_task
+        except asyncio.CancelledError:
+            pass
+    _redis_reconnect_task = None
     if redis_client:
         await redis_client.aclose()
         logging.info("Redis conexão fechada")
+    _set_redis_status("disconnected")
+
+
+http_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    http2 = settings.http2_enabled
+    if http2 and importlib.util.find_spec("h2") is None:
+        logging.warning("HTTP/2 habilitado mas pacote 'h2' não instalado, usando HTTP/1.1")
+        http2 = False
+    
+    limits = httpx.Limits(
+        max_keepalive_connections=settings.http_max_keepalive_per_host,
+        max_connections=settings.http_max_connections_per_host,
+        keepalive_expiry=settings.http_keepalive_expiry
+    )
+    if settings.dns_cache_enabled:
+        # Import local: src.utils importa este módulo
+        from src.utils.dns_cache import CachingDNSTransport, dns_cache
+        transport = CachingDNSTransport(dns_cache, http2=http2, limits=limits)
+    else:
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+    
+    if settings.upstream_mode != "live":
+        from src.utils.replay import wrap_transport
+        transport = wrap_transport(transport)
+    
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout=settings.http_timeout),
+        follow_redirects=True,
+        transport=transport
+    )
+
+
+async def init_http_clients():
+    for base_url in settings.api_endpoints.values():
+        host = httpx.URL(base_url).host
+        if host not in http_clients:
+            http_clients[host] = _build_http_client()
+    
+    logging.info(f"Pools HTTP criados para {len(http_clients)} hosts")
+
+
+# Estado do aquecimento dos pools, informado no /health
+http_warmup: Dict[str, Any] = {"done": False, "hosts": {}}
+_warmup_task: Optional[asyncio.Task] = None
+
+
+async def _warm_up_host(host: str, base_url: str) -> Dict[str, Any]:
+    client = get_http_pool(base_url)
+    started = time.monotonic()
+    # Requisições simultâneas abrem conexões distintas (com TLS) no pool
+    results = await asyncio.gather(
+        *(
+            client.head(base_url, timeout=settings.http_warmup_timeout)
+            for _ in range(settings.http_warmup_connections)
+        ),
+        return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, Exception)]
+    if len(errors) == len(results):
+        logging.warning(f"Falha ao aquecer conexões com {host}: {errors[0]}")
+        return {"status": "failed", "error": str(errors[0])}
+    return {
+        "status": "warm",
+        "connections": len(results) - len(errors),
+        "time_ms": round((time.monotonic() - started) * 1000, 1)
+    }
+
+
+async def warm_up_http_clients():
+    """Resolve os hosts e abre conexões com cada upstream antes do tráfego"""
+    hosts = {}
+    for base_url in settings.api_endpoints.values():
+        hosts.setdefault(httpx.URL(base_url).host, base_url)
+    
+    try:
+        if settings.dns_cache_enabled:
+            from src.utils.dns_cache import dns_cache
+            await dns_cache.prefetch(hosts)
+        
+        results = await asyncio.gather(
+            *(_warm_up_host(host, base_url) for host, base_url in hosts.items())
+        )
+        http_warmup["hosts"] = dict(zip(hosts, results))
+        warm = sum(1 for r in results if r["status"] == "warm")
+        logging.info(f"Conexões aquecidas para {warm}/{len(hosts)} hosts")
+    finally:
+        http_warmup["done"] = True
+
+
+def start_http_warmup():
+    global _warmup_task
+    if not settings.http_warmup_enabled:
+        http_warmup["done"] = True
+        return
+    _warmup_task = asyncio.create_task(warm_up_http_clients())
+
+
+async def stop_http_warmup():
+    if _warmup_task and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+
+
+async def close_http_clients():
+    for client in http_clients.values():
+        await client.aclose()
+    http_clients.clear()
+    logging.info("Pools HTTP fechados")
 
 
 @asynccontextmanager
@@ -97,6 +307,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     if settings.cache_enabled:
         await init_redis()
     
+    await init_http_clients()
+    start_http_warmup()
+    
+    from src.utils.cache_warmer import cache_warmer
+    cache_warmer.start()
+    
     logging.info("Aplicação iniciada com sucesso!")
     
     yield
@@ -104,6 +320,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Shutdown
     logging.info("Encerrando aplicação...")
     
+    await cache_warmer.stop()
+    await stop_http_warmup()
+    await close_http_clients()
+    
     if settings.cache_enabled:
         await close_redis()
     
@@ -135,6 +355,12 @@ def create_app() -> FastAPI:
         allowed_hosts=["*"] if settings.debug else ["localhost", "127.0.0.1"]
     )
     
+    # Import local: src.utils importa este módulo
+    from src.utils.deadline import DeadlineMiddleware
+    from src.utils.disconnect import DisconnectMiddleware
+    app.add_middleware(DeadlineMiddleware)
+    app.add_middleware(DisconnectMiddleware)
+    
     @app.exception_handler(Exception)
     async def global_exception_handler(request, exc):
         logging.error(f"Erro não tratado: {str(exc)}", exc_info=True)
@@ -156,15 +382,58 @@ def create_app() -> FastAPI:
             "redis": "disconnected"
         }
         
-        if settings.cache_enabled and redis_client:
+        if settings.cache_enabled and get_redis_client():
             try:
                 await redis_client.ping()
                 health_status["redis"] = "connected"
-            except Exception:
+            except Exception as e:
+                report_redis_error(e)
                 health_status["redis"] = "error"
         
+        health_status["redis_connection"] = dict(redis_state)
+        if settings.cache_enabled and redis_state["status"] == "reconnecting":
+            from src.utils.local_cache import fallback_cache
+            # Servindo do cache local: funciona, mas com mais chamadas ao upstream
+            health_status["redis"] = "reconnecting"
+            health_status["redis_fallback_cache"] = fallback_cache.snapshot()
+            health_status["status"] = "degraded"
+        
+        from src.utils.circuit_breaker import circuit_breakers_status
+        from src.utils.quota import quotas_status
+        
+        breakers = circuit_breakers_status()
+        health_status["circuit_breakers"] = breakers
+        if any(b["state"] != "closed" for b in breakers.values()):
+            health_status["status"] = "degraded"
+        
+        health_status["quotas"] = await quotas_status()
+        
+        from src.utils.cache import cache_stats
+        health_status["cache"] = cache_stats()
+        
+        if settings.cache_warm_enabled and settings.cache_enabled:
+            from src.utils.cache_warmer import cache_warmer
+            health_status["cache_warmer"] = await cache_warmer.coverage()
+        
+        health_status["warmup"] = http_warmup
+        health_status["ready"] = http_warmup["done"]
+        if settings.dns_cache_enabled:
+            from src.utils.dns_cache import dns_cache
+            health_status["dns_cache"] = dns_cache.snapshot()
+        # Liveness: aquecimento em andamento não é falha, a prontidão fica no /ready
+        
         return health_status
     
+    @app.get("/ready", tags=["Health"])
+    async def readiness_check():
+        # Readiness: o balanceador só manda tráfego depois do aquecimento
+        if not http_warmup["done"]:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "warming_up", "warmup": http_warmup}
+            )
+        return {"status": "ready", "warmup": http_warmup}
+    
 
     @app.get("/info", tags=["Info"])
     async def app_info():
@@ -182,5 +451,18 @@ def create_app() -> FastAPI:
     
     return app
 
-def get_redis_client() -> redis.Redis:
+def get_redis_client() -> Optional[redis.Redis]:
+    # Fora do ar: quem chama segue sem Redis em vez de esperar o timeout
+    if redis_state["status"] == "reconnecting":
+        return None
     return redis_client
+
+
+def get_http_pool(url: str) -> httpx.AsyncClient:
+    """Cliente HTTP de longa duração compartilhado por host upstream"""
+    host = httpx.URL(url).host
+    client = http_clients.get(host)
+    if client is None or client.is_closed:
+        client = _build_http_client()
+        http_clients[host] = client
+    return client
@@ -24,6 +24,13 @@ class Settings(BaseSettings):
     redis_port: int = Field(default=6379, env="REDIS_PORT")
     redis_password: Optional[str] = Field(default=None, env="REDIS_PASSWORD")
     redis_db: int = Field(default=0, env="REDIS_DB")
+    # Redis fora do ar: reconexão em segundo plano com backoff e, enquanto
+    # isso, cache limitado na memória do processo
+    redis_reconnect_min_delay: float = Field(default=0.5, env="REDIS_RECONNECT_MIN_DELAY")  # segundos
+    redis_reconnect_max_delay: float = Field(default=30.0, env="REDIS_RECONNECT_MAX_DELAY")  # segundos
+    redis_fallback_enabled: bool = Field(default=True, env="REDIS_FALLBACK_ENABLED")
+    redis_fallback_max_bytes: int = Field(default=64 * 1024 * 1024, env="REDIS_FALLBACK_MAX_BYTES")
+    redis_fallback_max_ttl: float = Field(default=3600.0, env="REDIS_FALLBACK_MAX_TTL")  # segundos
     
 
     rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
@@ -37,6 +44,65 @@ class Settings(BaseSettings):
 
     cache_ttl: int = Field(default=3600, env="CACHE_TTL")  # 1 hora
     cache_enabled: bool = Field(default=True, env="CACHE_ENABLED")
+    # Prefixo de todas as chaves de cache; incrementar a versão no deploy
+    # descarta as entradas antigas sem precisar limpar o Redis
+    cache_namespace: str = Field(default="nexus", env="CACHE_NAMESPACE")
+    cache_key_version: str = Field(default="v1", env="CACHE_KEY_VERSION")
+    # Depois do TTL: serve vencido enquanto atualiza em segundo plano
+    # (stale-while-revalidate) e, se o upstream falhar, até stale-if-error
+    cache_stale_while_revalidate: int = Field(default=300, env="CACHE_STALE_WHILE_REVALIDATE")
+    cache_stale_if_error: int = Field(default=3600, env="CACHE_STALE_IF_ERROR")
+    cache_refresh_lock_ttl: int = Field(default=30, env="CACHE_REFRESH_LOCK_TTL")
+    # Peso do XFetch (atualização antecipada probabilística); 0 desliga
+    cache_xfetch_beta: float = Field(default=1.0, env="CACHE_XFETCH_BETA")
+    # Índices de tags (namespace e provedor) para invalidar sem KEYS; o índice
+    # vive ao menos cache_tag_ttl e a remoção vai em lotes de UNLINK
+    cache_tag_ttl: int = Field(default=7 * 86400, env="CACHE_TAG_TTL")
+    cache_invalidate_batch: int = Field(default=500, env="CACHE_INVALIDATE_BATCH")
+    cache_scan_count: int = Field(default=1000, env="CACHE_SCAN_COUNT")
+    # Cache negativo: resultados "não encontrado" (marcados com not_found)
+    # ficam pouco tempo no cache, com TTL próprio por endpoint
+    cache_negative_ttl: int = Field(default=300, env="CACHE_NEGATIVE_TTL")
+    cache_negative_ttl_cep: int = Field(default=3600, env="CACHE_NEGATIVE_TTL_CEP")
+    cache_negative_ttl_countries: int = Field(default=1800, env="CACHE_NEGATIVE_TTL_COUNTRIES")
+    cache_negative_ttl_worldbank: int = Field(default=900, env="CACHE_NEGATIVE_TTL_WORLDBANK")
+    # Aquecedor: renova as chamadas quentes ao atingir cache_warm_refresh_ratio
+    # do TTL, com no máximo cache_warm_rate_per_minute chamadas ao upstream
+    cache_warm_enabled: bool = Field(default=True, env="CACHE_WARM_ENABLED")
+    cache_warm_refresh_ratio: float = Field(default=0.8, env="CACHE_WARM_REFRESH_RATIO")
+    cache_warm_rate_per_minute: int = Field(default=30, env="CACHE_WARM_RATE_PER_MINUTE")
+    cache_warm_check_interval: float = Field(default=15.0, env="CACHE_WARM_CHECK_INTERVAL")  # segundos
+    cache_warm_retry_delay: float = Field(default=60.0, env="CACHE_WARM_RETRY_DELAY")  # segundos
+    # APIs com cota: o aquecedor gasta no máximo cache_warm_quota_share da cota
+    # diária (o que alonga o intervalo de renovação) e para de renovar quando
+    # resta menos de cache_warm_quota_reserve dela, guardada para os usuários
+    cache_warm_quota_share: float = Field(default=0.2, env="CACHE_WARM_QUOTA_SHARE")
+    cache_warm_quota_reserve: float = Field(default=0.5, env="CACHE_WARM_QUOTA_RESERVE")
+    cache_warm_weather_cities: List[str] = [
+        "São Paulo", "Rio de Janeiro", "Brasília", "Belo Horizonte", "Salvador"
+    ]
+    # Parâmetros de NewsRequest (os padrões do endpoint /news/headlines)
+    cache_warm_news_headlines: List[dict] = [{"country": "br"}]
+    cache_warm_worldbank_countries: List[str] = ["br"]
+    # Camada dos namespaces do @cached sem política própria (processed ou raw)
+    cache_default_layer: str = Field(default="processed", env="CACHE_DEFAULT_LAYER")
+    # Formato dos valores no Redis: binário com cabeçalho (lê também o JSON
+    # antigo); compressão zstd ou lz4 a partir de cache_compression_min_bytes
+    cache_binary_codec: bool = Field(default=True, env="CACHE_BINARY_CODEC")
+    cache_serializer: str = Field(default="msgpack", env="CACHE_SERIALIZER")  # msgpack ou json
+    cache_compression: str = Field(default="zstd", env="CACHE_COMPRESSION")  # zstd, lz4 ou none
+    cache_compression_min_bytes: int = Field(default=1024, env="CACHE_COMPRESSION_MIN_BYTES")
+    cache_compression_level: int = Field(default=3, env="CACHE_COMPRESSION_LEVEL")
+    # Dicionários zstd treinados por namespace do @cached (key_prefix -> arquivo)
+    cache_zstd_dictionaries: dict = {}
+    # Quanto tempo uma resposta com ETag/Last-Modified fica guardada após expirar,
+    # para ser revalidada com requisição condicional em vez de baixada de novo
+    http_cache_revalidate_window: int = Field(default=86400, env="HTTP_CACHE_REVALIDATE_WINDOW")
+    # Cache em memória (L1) na frente do Redis; TTL limitado ao do Redis
+    l1_cache_enabled: bool = Field(default=True, env="L1_CACHE_ENABLED")
+    l1_cache_max_bytes: int = Field(default=32 * 1024 * 1024, env="L1_CACHE_MAX_BYTES")
+    l1_cache_max_ttl: float = Field(default=60.0, env="L1_CACHE_MAX_TTL")  # segundos
+    l1_cache_policy: str = Field(default="lru", env="L1_CACHE_POLICY")  # lru ou lfu
     
     openweather_api_key: Optional[str] = Field(default=None, env="OPENWEATHER_API_KEY")
     newsapi_key: Optional[str] = Field(default=None, env="NEWSAPI_KEY")
@@ -54,6 +120,89 @@ class Settings(BaseSettings):
     
     http_timeout: int = Field(default=30, env="HTTP_TIMEOUT")
     max_retries: int = Field(default=3, env="MAX_RETRIES")
+    retry_base_delay: float = Field(default=0.2, env="RETRY_BASE_DELAY")  # segundos
+    retry_max_delay: float = Field(default=5.0, env="RETRY_MAX_DELAY")  # segundos
+    retry_budget_ratio: float = Field(default=0.2, env="RETRY_BUDGET_RATIO")  # retries / requisições
+    retry_budget_min_per_second: float = Field(default=1.0, env="RETRY_BUDGET_MIN_PER_SECOND")
+    
+    http2_enabled: bool = Field(default=False, env="HTTP2_ENABLED")
+    http_max_connections_per_host: int = Field(default=50, env="HTTP_MAX_CONNECTIONS_PER_HOST")
+    http_max_keepalive_per_host: int = Field(default=20, env="HTTP_MAX_KEEPALIVE_PER_HOST")
+    http_keepalive_expiry: float = Field(default=60.0, env="HTTP_KEEPALIVE_EXPIRY")  # segundos
+    # Aquecimento dos pools no startup (conexões abertas por host)
+    http_warmup_enabled: bool = Field(default=True, env="HTTP_WARMUP_ENABLED")
+    http_warmup_connections: int = Field(default=2, env="HTTP_WARMUP_CONNECTIONS")
+    http_warmup_timeout: float = Field(default=5.0, env="HTTP_WARMUP_TIMEOUT")
+    # Cache de DNS (segundos); o TTL do registro é limitado a [min, max]
+    dns_cache_enabled: bool = Field(default=True, env="DNS_CACHE_ENABLED")
+    dns_cache_default_ttl: float = Field(default=60.0, env="DNS_CACHE_DEFAULT_TTL")
+    dns_cache_min_ttl: float = Field(default=5.0, env="DNS_CACHE_MIN_TTL")
+    dns_cache_max_ttl: float = Field(default=600.0, env="DNS_CACHE_MAX_TTL")
+    
+    # live: APIs reais; record: grava as respostas em fixtures; replay:
+    # serve as fixtures (no processo ou pelo servidor substituto em
+    # upstream_replay_url) com a latência e as falhas de cada perfil
+    upstream_mode: str = Field(default="live", env="UPSTREAM_MODE")
+    upstream_fixtures_dir: str = Field(default="fixtures/upstream", env="UPSTREAM_FIXTURES_DIR")
+    upstream_replay_url: Optional[str] = Field(default=None, env="UPSTREAM_REPLAY_URL")
+    upstream_replay_seed: Optional[int] = Field(default=None, env="UPSTREAM_REPLAY_SEED")
+    upstream_replay_profiles: dict = {
+        "default": {"median_ms": 80, "p99_ms": 400},
+        "openlibrary": {"median_ms": 250, "p99_ms": 2500, "error_rate": 0.01},
+        "worldbank": {"median_ms": 300, "p99_ms": 3000, "error_rate": 0.02},
+        "news": {"median_ms": 120, "p99_ms": 600},
+        "weather": {"median_ms": 90, "p99_ms": 500},
+        "viacep": {"median_ms": 60, "p99_ms": 300},
+        "countries": {"median_ms": 150, "p99_ms": 800}
+    }
+    
+    # Hedging por provedor (chaves de api_endpoints): quantil de latência que
+    # dispara a segunda requisição e fração máxima do tráfego que pode ser duplicada
+    hedge_policies: dict = {
+        "openlibrary": {"quantile": 0.95, "max_ratio": 0.1},
+        "worldbank": {"quantile": 0.95, "max_ratio": 0.1}
+    }
+    hedge_min_samples: int = Field(default=20, env="HEDGE_MIN_SAMPLES")
+    hedge_min_delay: float = Field(default=0.05, env="HEDGE_MIN_DELAY")  # segundos
+    
+    concurrency_limit_enabled: bool = Field(default=True, env="CONCURRENCY_LIMIT_ENABLED")
+    concurrency_initial_limit: int = Field(default=20, env="CONCURRENCY_INITIAL_LIMIT")
+    concurrency_min_limit: int = Field(default=2, env="CONCURRENCY_MIN_LIMIT")
+    concurrency_max_limit: int = Field(default=50, env="CONCURRENCY_MAX_LIMIT")
+    concurrency_queue_timeout: float = Field(default=2.0, env="CONCURRENCY_QUEUE_TIMEOUT")  # segundos
+    concurrency_latency_tolerance: float = Field(default=2.0, env="CONCURRENCY_LATENCY_TOLERANCE")
+    concurrency_backoff_ratio: float = Field(default=0.9, env="CONCURRENCY_BACKOFF_RATIO")
+    
+    # Cotas das APIs com chave (chaves de api_endpoints)
+    api_quotas: dict = {
+        "news": {"daily": 100, "per_minute": None},
+        "weather": {"daily": 1000, "per_minute": 60}
+    }
+    quota_throttle_ratio: float = Field(default=0.8, env="QUOTA_THROTTLE_RATIO")
+    # Por quanto tempo respostas de APIs com cota ficam guardadas após expirar
+    quota_stale_window: int = Field(default=86400, env="QUOTA_STALE_WINDOW")
+    
+    circuit_breaker_enabled: bool = Field(default=True, env="CIRCUIT_BREAKER_ENABLED")
+    circuit_breaker_failure_rate: float = Field(default=0.5, env="CIRCUIT_BREAKER_FAILURE_RATE")
+    circuit_breaker_min_requests: int = Field(default=10, env="CIRCUIT_BREAKER_MIN_REQUESTS")
+    circuit_breaker_window: int = Field(default=60, env="CIRCUIT_BREAKER_WINDOW")  # segundos
+    circuit_breaker_open_seconds: int = Field(default=30, env="CIRCUIT_BREAKER_OPEN_SECONDS")
+    circuit_breaker_half_open_probes: int = Field(default=2, env="CIRCUIT_BREAKER_HALF_OPEN_PROBES")
+    
+    # Prazo total de cada requisição recebida (segundos), nunca acima de
+    # request_deadline_max; o header X-Request-Timeout só pode reduzi-lo
+    request_deadline_enabled: bool = Field(default=True, env="REQUEST_DEADLINE_ENABLED")
+    request_deadline_default: float = Field(default=25.0, env="REQUEST_DEADLINE_DEFAULT")
+    request_deadline_max: float = Field(default=60.0, env="REQUEST_DEADLINE_MAX")
+    request_deadlines: dict = {
+        "/api/v1/books": 15.0,
+        "/api/v1/worldbank": 15.0,
+        "/api/v1/cep": 10.0
+    }
+    # Tempo mínimo que ainda justifica uma tentativa ao upstream
+    deadline_min_attempt: float = Field(default=0.25, env="DEADLINE_MIN_ATTEMPT")
+    # Cancela o processamento quando o cliente fecha a conexão
+    cancel_on_disconnect: bool = Field(default=True, env="CANCEL_ON_DISCONNECT")
     
     class Config:
         env_file = ".env"
@@ -1,5 +1,5 @@
 from .http_client import HTTPClient, http_client, quick_request
-from .cache import CacheManager, cached, RateLimiter
+from .cache import CacheManager, cached, cached_batch, RateLimiter
 from .logger import StructuredLogger, get_logger, log_execution_time, api_metrics_logger
 
 __all__ = [
@@ -8,6 +8,7 @@ __all__ = [
     "quick_request",
     "CacheManager",
     "cached",
+    "cached_batch",
     "RateLimiter",
     "StructuredLogger",
     "get_logger",
@@ -1,32 +1,265 @@
+import asyncio
+import contextvars
+import enum
+import hashlib
+import inspect
 import json
 import logging
-from typing import Any, Optional, Union
-from functools import wraps
+import math
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from functools import lru_cache, wraps
+
+from pydantic import BaseModel
+from redis.client import NEVER_DECODE
 
-from src.core.config import get_redis_client
+from src.core.config import get_redis_client, report_redis_error
 from src.core.settings import settings
+from src.utils.cache_codec import codec_snapshot, decode, encode
+from src.utils.cache_policy import (
+    CachePolicy,
+    get_cache_policy,
+    reset_current_policy,
+    set_current_policy,
+)
+from src.utils.local_cache import fallback_cache, key_namespace, local_cache, metric_namespace
+from src.utils.metrics import (
+    CACHE_EARLY_REFRESHES,
+    CACHE_ERRORS,
+    CACHE_LOOKUPS,
+    CACHE_NEGATIVE_HITS,
+    CACHE_OPERATION_SECONDS,
+    CACHE_STALE_SERVED,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Contadores do Redis (L2); os do L1 ficam no próprio local_cache
+_l2_stats = {"hits": 0, "misses": 0}
+
+
+def _use_l1(local: bool) -> bool:
+    return local and settings.l1_cache_enabled
+
+
+def _namespace_label(key: str) -> str:
+    return metric_namespace(key)
+
+
+def _observe(key: str, operation: str, started: float) -> None:
+    CACHE_OPERATION_SECONDS.labels(_namespace_label(key), operation).observe(
+        time.perf_counter() - started
+    )
+
+
+def _error(key: str, operation: str, error: Optional[Exception] = None) -> None:
+    CACHE_ERRORS.labels(_namespace_label(key), operation).inc()
+    if error is not None:
+        report_redis_error(error)
+
+
+def _fallback_get(key: str) -> Optional[Any]:
+    """Leitura no cache local que substitui o Redis enquanto ele está fora"""
+    if not settings.redis_fallback_enabled:
+        return None
+    value = fallback_cache.get(key)
+    CACHE_LOOKUPS.labels(
+        _namespace_label(key), "fallback", "miss" if value is None else "hit"
+    ).inc()
+    return value
+
+
+def _fallback_get_many(keys: List[str]) -> Dict[str, Any]:
+    values = {key: _fallback_get(key) for key in keys}
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def _fallback_set_many(items: Dict[str, Any], ttl: int) -> bool:
+    return all([_fallback_set(key, value, ttl) for key, value in items.items()])
+
+
+def _fallback_set(key: str, value: Any, ttl: int) -> bool:
+    if not settings.redis_fallback_enabled:
+        return False
+    size = len(json.dumps(value, default=str, separators=(",", ":")))
+    fallback_cache.set(key, value, size, ttl if ttl > 0 else None)
+    return True
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Taxa de acerto por camada de cache"""
+    lookups = _l2_stats["hits"] + _l2_stats["misses"]
+    return {
+        "l1": {"enabled": settings.l1_cache_enabled, **local_cache.snapshot()},
+        "l2": {
+            **_l2_stats,
+            "hit_ratio": round(_l2_stats["hits"] / lookups, 4) if lookups else None
+        },
+        "codec": codec_snapshot()
+    }
+
+
+# Partes da chave maiores que isso viram hash (chaves curtas e sem espaços)
+MAX_KEY_PART_LENGTH = 64
+
+
+def namespaced_key(key: str) -> str:
+    """Prefixa a chave com o namespace e a versão; trocar a versão invalida tudo"""
+    return f"{settings.cache_namespace}:{settings.cache_key_version}:{key}"
+
+
+def namespace_tag(namespace: str) -> str:
+    return f"ns:{namespace}"
+
+
+def provider_tag(provider: str) -> str:
+    return f"provider:{provider}"
+
+
+def tag_key(tag: str) -> str:
+    """Índice da tag: sorted set de chaves com a expiração como score"""
+    return namespaced_key(f"tag:{tag}")
+
+
+def _tags_for(key: str, tags: Optional[Iterable[str]]) -> List[str]:
+    all_tags = list(tags or ())
+    namespace = key_namespace(key)
+    if namespace:
+        all_tags.append(namespace_tag(namespace))
+    return all_tags
+
+
+def _index_tags(pipe, keys: Iterable[str], ttl: int, tags: Iterable[str]) -> None:
+    now = time.time()
+    expires_at = now + ttl if ttl > 0 else float("inf")
+    members = {key: expires_at for key in keys}
+    for tag in tags:
+        index = tag_key(tag)
+        pipe.zadd(index, members)
+        # Membros já expirados saem a cada gravação: o índice acompanha só
+        # as chaves vivas, mesmo em namespaces com milhões de entradas
+        pipe.zremrangebyscore(index, "-inf", now)
+        pipe.expire(index, max(ttl, settings.cache_tag_ttl))
+
+
+def _canonical(value: Any) -> str:
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    elif isinstance(value, enum.Enum):
+        value = value.value
+    
+    if isinstance(value, str):
+        text = value
+    elif isinstance(value, (dict, list, tuple, set)):
+        if isinstance(value, set):
+            value = sorted(value, key=str)
+        text = json.dumps(value, sort_keys=True, default=_canonical, separators=(",", ":"))
+    else:
+        text = str(value)
+    
+    if len(text) > MAX_KEY_PART_LENGTH:
+        return hashlib.sha1(text.encode()).hexdigest()
+    return text
+
+
+# inspect.signature é caro para rodar a cada hit
+_signature = lru_cache(maxsize=1024)(inspect.signature)
+
+
+def cache_namespace(func: Callable, key_prefix: str = "") -> str:
+    """Namespace do @cached: `key_prefix` ou o nome qualificado da função"""
+    return key_prefix or func.__qualname__
+
+
+def build_cache_key(
+    func: Callable,
+    key_prefix: str,
+    args: tuple,
+    kwargs: dict,
+    use_args: bool = True,
+    use_kwargs: bool = True,
+    names: Optional[Dict[str, str]] = None
+) -> str:
+    """
+    Chave estável para o resultado de `func(*args, **kwargs)`.
+
+    Os argumentos são associados aos nomes da assinatura (posicionais e
+    nomeados geram a mesma chave, padrões incluídos), a instância ligada
+    (`self`/`cls`) é ignorada e modelos pydantic, dicts e listas são
+    serializados de forma canônica. `names` troca o nome de argumentos
+    na chave.
+    """
+    signature = _signature(func)
+    params = list(signature.parameters)
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    positional = set(params[:len(args)])
+    
+    key_parts = [cache_namespace(func, key_prefix)]
+    for name, value in bound.arguments.items():
+        if name in ("self", "cls") and params and name == params[0]:
+            continue
+        if name in positional and not use_args:
+            continue
+        if name not in positional and not use_kwargs:
+            continue
+        kind = signature.parameters[name].kind
+        if kind == inspect.Parameter.VAR_KEYWORD:
+            key_parts.extend(f"{k}={_canonical(v)}" for k, v in sorted(value.items()))
+        else:
+            key_parts.append(f"{(names or {}).get(name, name)}={_canonical(value)}")
+    
+    return namespaced_key(":".join(key_parts))
+
 
 class CacheManager:
     
     @staticmethod
-    async def get(key: str) -> Optional[Any]:
+    async def get(key: str, local: bool = True) -> Optional[Any]:
         if not settings.cache_enabled:
             return None
+        
+        namespace = _namespace_label(key)
+        if _use_l1(local):
+            value = local_cache.get(key)
+            if value is not None:
+                CACHE_LOOKUPS.labels(namespace, "l1", "hit").inc()
+                return value
+            CACHE_LOOKUPS.labels(namespace, "l1", "miss").inc()
             
         redis_client = get_redis_client()
         if not redis_client:
-            return None
+            return _fallback_get(key)
             
+        started = time.perf_counter()
         try:
-            value = await redis_client.get(key)
+            # Valores binários (codec): lidos sem a decodificação UTF-8 do cliente
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.execute_command("GET", key, **{NEVER_DECODE: True})
+            if _use_l1(local):
+                # TTL restante junto do valor: o L1 nunca vive mais que o Redis
+                pipe.pttl(key)
+                value, ttl_ms = await pipe.execute()
+            else:
+                (value,) = await pipe.execute()
+                ttl_ms = None
+            _observe(key, "get", started)
+            
             if value:
-                return json.loads(value)
+                _l2_stats["hits"] += 1
+                CACHE_LOOKUPS.labels(namespace, "l2", "hit").inc()
+                data, raw_size = decode(value)
+                if ttl_ms is not None:
+                    local_cache.set(key, data, raw_size, ttl_ms / 1000 if ttl_ms > 0 else None)
+                return data
+            _l2_stats["misses"] += 1
+            CACHE_LOOKUPS.labels(namespace, "l2", "miss").inc()
         except Exception as e:
+            _error(key, "get", e)
             logger.warning(f"Erro ao recuperar do cache {key}: {e}")
+            return _fallback_get(key)
         
         return None
     
@@ -34,48 +267,209 @@ class CacheManager:
     async def set(
         key: str, 
         value: Any, 
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        local: bool = True,
+        tags: Optional[Iterable[str]] = None
     ) -> bool:
+        """
+        Grava o valor e registra a chave no índice de cada tag (sempre a do
+        namespace, mais as informadas), para `invalidate_tags`.
+        """
         if not settings.cache_enabled:
             return False
             
+        ttl = ttl or settings.cache_ttl
         redis_client = get_redis_client()
         if not redis_client:
-            return False
+            return _fallback_set(key, value, ttl)
             
         try:
-            ttl = ttl or settings.cache_ttl
-            serialized_value = json.dumps(value, default=str)
+            serialized_value, raw_size = encode(value, key_namespace(key))
             
+            started = time.perf_counter()
+            pipe = redis_client.pipeline(transaction=False)
             if ttl > 0:
-                await redis_client.setex(key, ttl, serialized_value)
+                pipe.setex(key, ttl, serialized_value)
             else:
-                await redis_client.set(key, serialized_value)
+                pipe.set(key, serialized_value)
+            _index_tags(pipe, [key], ttl, _tags_for(key, tags))
+            await pipe.execute()
+            _observe(key, "set", started)
+            
+            if _use_l1(local):
+                local_cache.set(key, value, raw_size, ttl if ttl > 0 else None)
+            else:
+                local_cache.delete(key)
                 
             logger.debug(f"Valor salvo no cache: {key} (TTL: {ttl}s)")
             return True
             
         except Exception as e:
+            _error(key, "set", e)
             logger.warning(f"Erro ao salvar no cache {key}: {e}")
-            return False
+            return _fallback_set(key, value, ttl)
     
     @staticmethod
     async def delete(key: str) -> bool:
         if not settings.cache_enabled:
             return False
+        
+        local_cache.delete(key)
+        fallback_cache.delete(key)
             
         redis_client = get_redis_client()
         if not redis_client:
             return False
             
         try:
+            started = time.perf_counter()
             result = await redis_client.delete(key)
+            _observe(key, "delete", started)
             logger.debug(f"Chave removida do cache: {key}")
             return bool(result)
         except Exception as e:
+            _error(key, "delete", e)
             logger.warning(f"Erro ao remover do cache {key}: {e}")
             return False
     
+    @staticmethod
+    async def get_many(keys: Iterable[str], local: bool = True) -> Dict[str, Any]:
+        """
+        Busca várias chaves com um único MGET; retorna só as encontradas.
+
+        As que estão no L1 nem vão ao Redis; as demais saem num pipeline
+        (MGET mais o TTL restante de cada uma, para popular o L1).
+        """
+        if not settings.cache_enabled:
+            return {}
+        
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        missing = keys
+        if _use_l1(local):
+            missing = []
+            for key in keys:
+                value = local_cache.get(key)
+                if value is not None:
+                    found[key] = value
+                    CACHE_LOOKUPS.labels(_namespace_label(key), "l1", "hit").inc()
+                else:
+                    missing.append(key)
+                    CACHE_LOOKUPS.labels(_namespace_label(key), "l1", "miss").inc()
+        if not missing:
+            return found
+        
+        redis_client = get_redis_client()
+        if not redis_client:
+            return {**found, **_fallback_get_many(missing)}
+        
+        started = time.perf_counter()
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.execute_command("MGET", *missing, **{NEVER_DECODE: True})
+            if _use_l1(local):
+                for key in missing:
+                    pipe.pttl(key)
+            values, *ttls = await pipe.execute()
+            # Lote rotulado pelo namespace da primeira chave
+            _observe(missing[0], "get_many", started)
+        except Exception as e:
+            _error(missing[0], "get_many", e)
+            logger.warning(f"Erro ao recuperar {len(missing)} chaves do cache: {e}")
+            return {**found, **_fallback_get_many(missing)}
+        
+        for index, (key, value) in enumerate(zip(missing, values)):
+            if not value:
+                _l2_stats["misses"] += 1
+                CACHE_LOOKUPS.labels(_namespace_label(key), "l2", "miss").inc()
+                continue
+            try:
+                data, raw_size = decode(value)
+            except Exception as e:
+                _error(key, "decode")
+                logger.warning(f"Erro ao decodificar do cache {key}: {e}")
+                continue
+            _l2_stats["hits"] += 1
+            CACHE_LOOKUPS.labels(_namespace_label(key), "l2", "hit").inc()
+            found[key] = data
+            if ttls:
+                ttl_ms = ttls[index]
+                local_cache.set(key, data, raw_size, ttl_ms / 1000 if ttl_ms > 0 else None)
+        
+        return found
+    
+    @staticmethod
+    async def set_many(
+        items: Dict[str, Any],
+        ttl: Optional[int] = None,
+        local: bool = True,
+        tags: Optional[Iterable[str]] = None
+    ) -> bool:
+        """Grava vários valores com o mesmo TTL num único pipeline de SETEX"""
+        if not settings.cache_enabled or not items:
+            return False
+            
+        ttl = ttl or settings.cache_ttl
+        redis_client = get_redis_client()
+        if not redis_client:
+            return _fallback_set_many(items, ttl)
+        
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            by_namespace: Dict[Optional[str], List[str]] = {}
+            sizes: Dict[str, int] = {}
+            for key, value in items.items():
+                serialized_value, sizes[key] = encode(value, key_namespace(key))
+                if ttl > 0:
+                    pipe.setex(key, ttl, serialized_value)
+                else:
+                    pipe.set(key, serialized_value)
+                by_namespace.setdefault(key_namespace(key), []).append(key)
+            for keys in by_namespace.values():
+                _index_tags(pipe, keys, ttl, _tags_for(keys[0], tags))
+            started = time.perf_counter()
+            await pipe.execute()
+            _observe(next(iter(items)), "set_many", started)
+            
+            for key, value in items.items():
+                if _use_l1(local):
+                    local_cache.set(key, value, sizes[key], ttl if ttl > 0 else None)
+                else:
+                    local_cache.delete(key)
+            
+            logger.debug(f"{len(items)} valores salvos no cache (TTL: {ttl}s)")
+            return True
+            
+        except Exception as e:
+            _error(next(iter(items)), "set_many", e)
+            logger.warning(f"Erro ao salvar {len(items)} chaves no cache: {e}")
+            return _fallback_set_many(items, ttl)
+    
+    @staticmethod
+    async def delete_many(keys: Iterable[str]) -> int:
+        if not settings.cache_enabled:
+            return 0
+        
+        keys = list(keys)
+        for key in keys:
+            local_cache.delete(key)
+            fallback_cache.delete(key)
+        
+        redis_client = get_redis_client()
+        if not redis_client or not keys:
+            return 0
+            
+        try:
+            started = time.perf_counter()
+            result = await redis_client.delete(*keys)
+            _observe(keys[0], "delete_many", started)
+            logger.debug(f"{result} chaves removidas do cache")
+            return result
+        except Exception as e:
+            _error(keys[0], "delete_many", e)
+            logger.warning(f"Erro ao remover {len(keys)} chaves do cache: {e}")
+            return 0
+    
     @staticmethod
     async def exists(key: str) -> bool:
         if not settings.cache_enabled:
@@ -89,63 +483,490 @@ class CacheManager:
             result = await redis_client.exists(key)
             return bool(result)
         except Exception as e:
+            _error(key, "exists", e)
             logger.warning(f"Erro ao verificar existência no cache {key}: {e}")
             return False
     
+    @staticmethod
+    async def invalidate_tags(*tags: str) -> int:
+        """
+        Remove as entradas marcadas com as tags, sem varrer o keyspace.
+
+        O índice de cada tag é lido em lotes de `cache_invalidate_batch` e
+        cada lote sai num pipeline (UNLINK das chaves + remoção do índice),
+        então o Redis nunca bloqueia por muito tempo. O L1 deste processo é
+        limpo junto; o dos outros expira em até `l1_cache_max_ttl`.
+        """
+        if not settings.cache_enabled:
+            return 0
+        
+        # O cache local de contingência não tem índice de tags: sai inteiro
+        fallback_cache.clear()
+            
+        redis_client = get_redis_client()
+        if not redis_client:
+            return 0
+        
+        removed = 0
+        for tag in tags:
+            index = tag_key(tag)
+            tag_removed = 0
+            try:
+                while True:
+                    keys = await redis_client.zrange(index, 0, settings.cache_invalidate_batch - 1)
+                    if not keys:
+                        break
+                    for key in keys:
+                        local_cache.delete(key)
+                    pipe = redis_client.pipeline(transaction=False)
+                    pipe.unlink(*keys)
+                    pipe.zrem(index, *keys)
+                    unlinked, _ = await pipe.execute()
+                    tag_removed += unlinked
+                await redis_client.unlink(index)
+                logger.info(f"Removidas {tag_removed} chaves da tag: {tag}")
+            except Exception as e:
+                _error(index, "invalidate", e)
+                logger.warning(f"Erro ao invalidar a tag {tag}: {e}")
+            removed += tag_removed
+        
+        return removed
+    
     @staticmethod
     async def clear_pattern(pattern: str) -> int:
+        """
+        Remove as chaves que casam com o padrão usando SCAN incremental.
+
+        Alternativa para chaves fora dos índices de tag (gravadas antes
+        deles existirem); prefira `invalidate_tags`, que não percorre o
+        keyspace.
+        """
         if not settings.cache_enabled:
             return 0
+        
+        local_cache.delete_matching(pattern)
+        fallback_cache.delete_matching(pattern)
             
         redis_client = get_redis_client()
         if not redis_client:
             return 0
             
         try:
-            keys = await redis_client.keys(pattern)
-            if keys:
-                result = await redis_client.delete(*keys)
-                logger.info(f"Removidas {result} chaves do padrão: {pattern}")
-                return result
-            return 0
+            removed = 0
+            batch: List[str] = []
+            async for key in redis_client.scan_iter(match=pattern, count=settings.cache_scan_count):
+                batch.append(key)
+                if len(batch) >= settings.cache_invalidate_batch:
+                    removed += await redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                removed += await redis_client.unlink(*batch)
+            logger.info(f"Removidas {removed} chaves do padrão: {pattern}")
+            return removed
         except Exception as e:
+            _error(pattern, "clear_pattern", e)
             logger.warning(f"Erro ao limpar padrão do cache {pattern}: {e}")
             return 0
 
 
+def is_upstream_error(exc: Exception) -> bool:
+    """Falha que justifica servir dado vencido (4xx do próprio pedido não)"""
+    status_code = getattr(exc, "status_code", None)
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+def mark_stale(value: Any, reason: str, age: float) -> Any:
+    """Marca no cache_info que o valor servido está vencido"""
+    if not isinstance(value, dict):
+        return value
+    return {
+        **value,
+        "cache_info": {
+            **(value.get("cache_info") or {}),
+            "cached": True,
+            "stale": True,
+            "stale_reason": reason,
+            "stale_age": round(age, 3)
+        }
+    }
+
+
+def is_negative_result(value: Any) -> bool:
+    """Resultado "não encontrado" marcado pelo serviço com `not_found`"""
+    return isinstance(value, dict) and value.get("not_found") is True
+
+
+def is_failed_result(value: Any) -> bool:
+    """
+    Falha tratada pelo serviço (`success: False` sem `not_found`): não vai
+    para o cache e, como uma exceção, aciona o stale-if-error
+    """
+    return (
+        isinstance(value, dict)
+        and value.get("success") is False
+        and not is_negative_result(value)
+    )
+
+
+def is_cacheable_result(value: Any) -> bool:
+    return value is not None and not is_failed_result(value)
+
+
+def _negative_ttl(negative_ttl: Optional[int], policy: CachePolicy) -> int:
+    return next(
+        value for value in (
+            negative_ttl, policy.negative_ttl, settings.cache_negative_ttl
+        ) if value is not None
+    )
+
+
+def should_refresh_early(fresh_until: float, delta: Optional[float]) -> bool:
+    """
+    Decisão do XFetch: com a entrada ainda válida, atualiza antes da hora
+    com probabilidade que cresce perto do vencimento e com o custo do
+    recálculo (`delta`, em segundos). Cada worker sorteia por conta
+    própria, então o recálculo não acontece em todos ao mesmo tempo.
+    """
+    beta = settings.cache_xfetch_beta
+    if beta <= 0 or not delta:
+        return False
+    # 1 - random() fica em (0, 1]: log nunca recebe zero
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= fresh_until
+
+
+# Atualizações em segundo plano em andamento neste processo
+_refreshing: Dict[str, asyncio.Task] = {}
+
+
+async def _run_refresh(key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+    redis_client = get_redis_client()
+    lock_key = f"{key}:refresh"
+    locked = False
+    try:
+        if redis_client:
+            try:
+                # Um worker atualiza; os demais seguem servindo o valor vencido
+                locked = bool(await redis_client.set(
+                    lock_key, "1", nx=True, ex=settings.cache_refresh_lock_ttl
+                ))
+                if not locked:
+                    return
+            except Exception as e:
+                logger.warning(f"Erro ao obter trava de atualização {lock_key}: {e}")
+        await refresh()
+        logger.debug(f"Entrada atualizada em segundo plano: {key}")
+    except Exception as e:
+        logger.warning(f"Falha ao atualizar {key} em segundo plano: {e}")
+    finally:
+        if locked:
+            try:
+                await redis_client.delete(lock_key)
+            except Exception:
+                pass
+
+
+def refresh_in_background(key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+    """
+    Agenda uma única atualização da chave, fora da requisição atual.
+
+    Roda num contexto vazio: não herda o prazo nem o cancelamento da
+    requisição que a disparou.
+    """
+    if key in _refreshing:
+        return False
+    task = asyncio.get_running_loop().create_task(
+        _run_refresh(key, refresh), context=contextvars.Context()
+    )
+    _refreshing[key] = task
+    task.add_done_callback(lambda _: _refreshing.pop(key, None))
+    return True
+
+
+# Renovação forçada (aquecedor): ignora o valor guardado e recalcula
+_force_refresh: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "cache_force_refresh", default=False
+)
+
+
+def force_refresh_active() -> bool:
+    return _force_refresh.get()
+
+
+def set_force_refresh(value: bool = True):
+    return _force_refresh.set(value)
+
+
+def reset_force_refresh(token) -> None:
+    _force_refresh.reset(token)
+
+
 def cached(
     ttl: Optional[int] = None,
     key_prefix: str = "",
     use_args: bool = True,
-    use_kwargs: bool = True
+    use_kwargs: bool = True,
+    local: bool = True,
+    stale_while_revalidate: Optional[int] = None,
+    stale_if_error: Optional[int] = None,
+    negative_ttl: Optional[int] = None
 ):
+    """
+    Cacheia o resultado da função com TTL suave e TTL rígido.
+
+    Até `ttl` o valor é servido direto. Depois, por até
+    `stale_while_revalidate` segundos, o valor vencido é servido na hora
+    enquanto uma atualização roda em segundo plano; por até
+    `stale_if_error` segundos ele ainda substitui o resultado quando a
+    função falha, seja levantando exceção ou devolvendo `success: False`.
+    O Redis guarda a entrada até o maior desses prazos.
+
+    Resultados com `success: False` não são cacheados, exceto os marcados
+    com `not_found`: esses ficam só `negative_ttl` segundos (do decorator,
+    da CachePolicy ou `cache_negative_ttl`), sem servir vencido, para que
+    consultas repetidas a itens inexistentes não voltem ao upstream.
+
+    A CachePolicy do namespace decide a camada: com `raw` nada é guardado
+    aqui e o cache fica a cargo do HTTPClient.
+    """
     def decorator(func):
+        namespace = cache_namespace(func, key_prefix)
+        policy = get_cache_policy(namespace)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             if not settings.cache_enabled:
                 return await func(*args, **kwargs)
             
-            key_parts = [key_prefix or func.__name__]
+            fresh_ttl = ttl or settings.cache_ttl
+            active_policy = policy.resolve(fresh_ttl)
             
-            if use_args and args:
-                key_parts.extend([str(arg) for arg in args])
-                
-            if use_kwargs and kwargs:
-                key_parts.extend([f"{k}:{v}" for k, v in sorted(kwargs.items())])
-                
-            cache_key = ":".join(key_parts)
-
-            cached_result = await CacheManager.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit para função {func.__name__}: {cache_key}")
-                return cached_result
-            result = await func(*args, **kwargs)
+            async def call():
+                # As chamadas ao upstream feitas aqui dentro enxergam a política
+                token = set_current_policy(active_policy)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    reset_current_policy(token)
             
-            if result is not None:
-                await CacheManager.set(cache_key, result, ttl)
+            if policy.layer == CachePolicy.RAW:
+                return await call()
+            
+            swr = (
+                settings.cache_stale_while_revalidate
+                if stale_while_revalidate is None else stale_while_revalidate
+            )
+            sie = next(
+                value for value in (
+                    stale_if_error, policy.stale_if_error, settings.cache_stale_if_error
+                ) if value is not None
+            )
+            cache_key = build_cache_key(
+                func, key_prefix, args, kwargs, use_args, use_kwargs
+            )
+            
+            async def recompute():
+                started = time.time()
+                result = await call()
+                if not is_cacheable_result(result):
+                    return result
+                # delta: quanto custou recalcular, usado pelo XFetch
+                entry = {"value": result, "delta": time.time() - started}
+                if is_negative_result(result):
+                    lifetime = _negative_ttl(negative_ttl, policy)
+                    entry.update(fresh_until=time.time() + lifetime, negative=True)
+                else:
+                    lifetime = fresh_ttl + max(swr, sie)
+                    entry["fresh_until"] = time.time() + fresh_ttl
+                await CacheManager.set(
+                    cache_key, entry, lifetime, local=local,
+                    tags=[provider_tag(policy.provider)] if policy.provider else None
+                )
                 logger.debug(f"Resultado cacheado para função {func.__name__}: {cache_key}")
+                return result
+
+            if _force_refresh.get():
+                return await recompute()
+
+            entry = await CacheManager.get(cache_key, local=local)
+            if not (isinstance(entry, dict) and "fresh_until" in entry):
+                # Formato anterior ao envelope: trata como ausente
+                entry = None
+            stale_age = None
+            if entry is not None and entry.get("negative"):
+                # "Não encontrado" nunca é servido vencido nem renovado antes
+                if entry["fresh_until"] > time.time():
+                    CACHE_NEGATIVE_HITS.labels(namespace).inc()
+                    return entry["value"]
+                entry = None
+            if entry is not None:
+                stale_age = time.time() - entry["fresh_until"]
+                if stale_age < 0:
+                    logger.debug(f"Cache hit para função {func.__name__}: {cache_key}")
+                    if should_refresh_early(entry["fresh_until"], entry.get("delta")):
+                        if refresh_in_background(cache_key, recompute):
+                            CACHE_EARLY_REFRESHES.labels(namespace).inc()
+                    return entry["value"]
+                if stale_age < swr:
+                    refresh_in_background(cache_key, recompute)
+                    CACHE_STALE_SERVED.labels(namespace, "revalidating").inc()
+                    return mark_stale(entry["value"], "revalidating", stale_age)
+            
+            try:
+                result = await recompute()
+            except Exception as e:
+                if stale_age is None or stale_age >= sie or not is_upstream_error(e):
+                    raise
+                logger.warning(
+                    f"Falha ao recalcular {cache_key}, servindo valor vencido "
+                    f"há {stale_age:.0f}s: {e}"
+                )
+                CACHE_STALE_SERVED.labels(namespace, "upstream_error").inc()
+                return mark_stale(entry["value"], "upstream_error", stale_age)
             
+            if is_failed_result(result) and stale_age is not None and stale_age < sie:
+                logger.warning(
+                    f"Recálculo de {cache_key} devolveu falha, servindo valor "
+                    f"vencido há {stale_age:.0f}s: {result.get('error')}"
+                )
+                CACHE_STALE_SERVED.labels(namespace, "upstream_error").inc()
+                return mark_stale(entry["value"], "upstream_error", stale_age)
             return result
+        
+        # Lido pelo aquecedor para saber quando renovar
+        wrapper.cache_ttl = ttl
+        return wrapper
+    return decorator
+
+
+def cached_batch(
+    items_arg: str,
+    ttl: Optional[int] = None,
+    key_prefix: str = "",
+    item_key: Optional[str] = None,
+    local: bool = True,
+    stale_if_error: Optional[int] = None,
+    negative_ttl: Optional[int] = None
+):
+    """
+    Versão em lote do @cached, para funções que recebem uma lista de itens
+    no argumento `items_arg` e devolvem um dict item -> resultado.
+
+    Cada item tem sua entrada, no mesmo formato do @cached: um único MGET
+    busca todas, a função roda uma vez só com os itens ausentes ou
+    vencidos e os resultados novos são gravados num único pipeline. Com
+    `item_key` igual ao nome do argumento da versão unitária (mesmo
+    `key_prefix`), as duas compartilham as entradas. Itens que a função
+    não devolve não são cacheados; se ela falhar, os vencidos dentro de
+    `stale_if_error` são servidos, desde que cubram todos os que faltam.
+    Itens devolvidos com `success: False` e resultados `not_found` seguem
+    as mesmas regras do @cached, item a item.
+    """
+    def decorator(func):
+        namespace = cache_namespace(func, key_prefix)
+        policy = get_cache_policy(namespace)
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not settings.cache_enabled:
+                return await func(*args, **kwargs)
+            
+            fresh_ttl = ttl or settings.cache_ttl
+            active_policy = policy.resolve(fresh_ttl)
+            bound = _signature(func).bind(*args, **kwargs)
+            items = list(bound.arguments[items_arg])
+            
+            async def call(batch: List[Any]) -> Dict[Any, Any]:
+                bound.arguments[items_arg] = batch
+                token = set_current_policy(active_policy)
+                try:
+                    return await func(*bound.args, **bound.kwargs)
+                finally:
+                    reset_current_policy(token)
+            
+            if policy.layer == CachePolicy.RAW:
+                return await call(items)
+            
+            swr = settings.cache_stale_while_revalidate
+            sie = next(
+                value for value in (
+                    stale_if_error, policy.stale_if_error, settings.cache_stale_if_error
+                ) if value is not None
+            )
+            names = {items_arg: item_key or items_arg}
+            keys: Dict[Any, str] = {}
+            for item in items:
+                bound.arguments[items_arg] = item
+                keys[item] = build_cache_key(
+                    func, key_prefix, bound.args, bound.kwargs, names=names
+                )
+            
+            entries = await CacheManager.get_many(keys.values(), local=local)
+            now = time.time()
+            results: Dict[Any, Any] = {}
+            stale: Dict[Any, Any] = {}
+            missing: List[Any] = []
+            for item, cache_key in keys.items():
+                entry = entries.get(cache_key)
+                if isinstance(entry, dict) and "fresh_until" in entry:
+                    if entry["fresh_until"] > now:
+                        if entry.get("negative"):
+                            CACHE_NEGATIVE_HITS.labels(namespace).inc()
+                        results[item] = entry["value"]
+                        continue
+                    if not entry.get("negative"):
+                        stale[item] = entry
+                missing.append(item)
+            
+            if missing:
+                started = time.time()
+                try:
+                    computed = await call(missing)
+                except Exception as e:
+                    usable = {
+                        item: mark_stale(entry["value"], "upstream_error", now - entry["fresh_until"])
+                        for item, entry in stale.items()
+                        if now - entry["fresh_until"] < sie
+                    }
+                    if len(usable) < len(missing) or not is_upstream_error(e):
+                        raise
+                    logger.warning(
+                        f"Falha ao recalcular {len(missing)} itens de {namespace}, "
+                        f"servindo valores vencidos: {e}"
+                    )
+                    CACHE_STALE_SERVED.labels(namespace, "upstream_error").inc(len(usable))
+                    computed = usable
+                else:
+                    now = time.time()
+                    delta = now - started
+                    lifetime = _negative_ttl(negative_ttl, policy)
+                    positive: Dict[str, Any] = {}
+                    negative: Dict[str, Any] = {}
+                    for item, value in computed.items():
+                        if item not in keys or not is_cacheable_result(value):
+                            continue
+                        if is_negative_result(value):
+                            negative[keys[item]] = {
+                                "value": value, "fresh_until": now + lifetime,
+                                "delta": delta, "negative": True
+                            }
+                        else:
+                            positive[keys[item]] = {
+                                "value": value, "fresh_until": now + fresh_ttl, "delta": delta
+                            }
+                    tags = [provider_tag(policy.provider)] if policy.provider else None
+                    for batch, batch_ttl in (
+                        (positive, fresh_ttl + max(swr, sie)), (negative, lifetime)
+                    ):
+                        if batch:
+                            await CacheManager.set_many(batch, batch_ttl, local=local, tags=tags)
+                    for item, entry in stale.items():
+                        age = now - entry["fresh_until"]
+                        if age < sie and is_failed_result(computed.get(item)):
+                            computed[item] = mark_stale(entry["value"], "upstream_error", age)
+                            CACHE_STALE_SERVED.labels(namespace, "upstream_error").inc()
+                results.update(computed)
+            
+            return {item: results[item] for item in keys if item in results}
             
         return wrapper
     return decorator
@@ -197,7 +1018,6 @@ class RateLimiter:
             }
             
         except Exception as e:
+            report_redis_error(e)
             logger.warning(f"Erro no rate limiting: {e}")
             return True, {"remaining": max_requests}
-
-import time
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+from typing import Iterable
+
+from src.core.config import close_redis, get_redis_client, init_redis
+from src.core.settings import settings
+from src.utils.cache import CacheManager, namespace_tag, namespaced_key, provider_tag
+
+
+async def invalidate(
+    providers: Iterable[str] = (),
+    namespaces: Iterable[str] = (),
+    tags: Iterable[str] = (),
+    patterns: Iterable[str] = ()
+) -> int:
+    """
+    Remove do Redis os dados dos provedores, namespaces e tags informados.
+
+    Usa os índices de tag (UNLINK em lotes); padrões só passam pelo SCAN
+    incremental, para chaves gravadas fora dos índices.
+    """
+    all_tags = [
+        *(provider_tag(provider) for provider in providers),
+        *(namespace_tag(namespace) for namespace in namespaces),
+        *tags
+    ]
+    removed = await CacheManager.invalidate_tags(*all_tags) if all_tags else 0
+    for pattern in patterns:
+        removed += await CacheManager.clear_pattern(namespaced_key(pattern))
+    return removed
+
+
+async def _main(args: argparse.Namespace) -> int:
+    await init_redis()
+    if get_redis_client() is None:
+        return 1
+    try:
+        removed = await invalidate(args.provider, args.namespace, args.tag, args.pattern)
+        print(f"{removed} chaves removidas")
+        return 0
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Invalidação do cache no Redis")
+    parser.add_argument(
+        "--provider", action="append", default=[],
+        help=f"Provedor (um de: {', '.join(settings.api_endpoints)})"
+    )
+    parser.add_argument(
+        "--namespace", action="append", default=[],
+        help="Namespace do @cached (key_prefix) ou http_cache"
+    )
+    parser.add_argument("--tag", action="append", default=[], help="Tag arbitrária")
+    parser.add_argument(
+        "--pattern", action="append", default=[],
+        help="Padrão glob após o prefixo do namespace (usa SCAN; evite em produção)"
+    )
+    args = parser.parse_args()
+    if not (args.provider or args.namespace or args.tag or args.pattern):
+        parser.error("informe ao menos um --provider, --namespace, --tag ou --pattern")
+
+    raise SystemExit(asyncio.run(_main(args)))
@@ -0,0 +1,196 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from src.core.settings import settings
+from src.utils.metrics import CACHE_CODEC_BYTES, CACHE_VALUE_BYTES
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependência opcional
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - dependência opcional
+    lz4_frame = None
+
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho: MAGIC + serializador (1 byte) + compressão (1 byte). O 0xff
+# nunca inicia texto UTF-8, então valores antigos (JSON puro) seguem legíveis
+MAGIC = b"\xffNX"
+
+SERIALIZER_JSON = 1
+SERIALIZER_MSGPACK = 2
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+_COMPRESSIONS = {"none": COMPRESSION_NONE, "zstd": COMPRESSION_ZSTD, "lz4": COMPRESSION_LZ4}
+
+# Totais do processo para /health (os contadores do Prometheus são por namespace)
+codec_stats = {"raw_bytes": 0, "stored_bytes": 0}
+
+
+def _serialize(value: Any) -> Tuple[int, bytes]:
+    if msgpack is not None and settings.cache_serializer == "msgpack":
+        return SERIALIZER_MSGPACK, msgpack.packb(value, default=str, use_bin_type=True)
+    return SERIALIZER_JSON, json.dumps(value, default=str, separators=(",", ":")).encode()
+
+
+def _deserialize(serializer: int, data: bytes) -> Any:
+    if serializer == SERIALIZER_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Valor em msgpack no cache, mas o pacote não está instalado")
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data)
+
+
+class _ZstdDictionaries:
+    """Dicionários zstd treinados por namespace, carregados sob demanda"""
+
+    def __init__(self):
+        self._by_namespace: Optional[Dict[str, "zstandard.ZstdCompressionDict"]] = None
+        self._by_id: Dict[int, "zstandard.ZstdCompressionDict"] = {}
+        # Preparar um dicionário é caro: compressores reaproveitados
+        self._compressors: Dict[Optional[str], "zstandard.ZstdCompressor"] = {}
+        self._decompressors: Dict[int, "zstandard.ZstdDecompressor"] = {}
+
+    def _load(self) -> None:
+        self._by_namespace = {}
+        for namespace, path in settings.cache_zstd_dictionaries.items():
+            try:
+                dictionary = zstandard.ZstdCompressionDict(Path(path).read_bytes())
+            except OSError as e:
+                logger.warning(f"Dicionário zstd de {namespace} indisponível ({path}): {e}")
+                continue
+            self._by_namespace[namespace] = dictionary
+            self._by_id[dictionary.dict_id()] = dictionary
+
+    def compressor(self, namespace: Optional[str]) -> "zstandard.ZstdCompressor":
+        if self._by_namespace is None:
+            self._load()
+        if namespace not in self._by_namespace:
+            namespace = None
+        compressor = self._compressors.get(namespace)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(
+                level=settings.cache_compression_level,
+                dict_data=self._by_namespace.get(namespace) if namespace else None
+            )
+            self._compressors[namespace] = compressor
+        return compressor
+
+    def decompressor(self, data: bytes) -> "zstandard.ZstdDecompressor":
+        if self._by_namespace is None:
+            self._load()
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            dictionary = self._by_id.get(dict_id) if dict_id else None
+            if dict_id and dictionary is None:
+                raise ValueError(f"Dicionário zstd {dict_id} não carregado")
+            decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+            self._decompressors[dict_id] = decompressor
+        return decompressor
+
+
+_zstd_dictionaries = _ZstdDictionaries()
+
+
+def _compression() -> int:
+    compression = _COMPRESSIONS.get(settings.cache_compression.lower(), COMPRESSION_NONE)
+    if compression == COMPRESSION_ZSTD and zstandard is None:
+        compression = COMPRESSION_LZ4
+    if compression == COMPRESSION_LZ4 and lz4_frame is None:
+        compression = COMPRESSION_NONE
+    return compression
+
+
+def _compress(compression: int, data: bytes, namespace: Optional[str]) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        return _zstd_dictionaries.compressor(namespace).compress(data)
+    if compression == COMPRESSION_LZ4:
+        return lz4_frame.compress(data)
+    return data
+
+
+def _decompress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise ValueError("Valor comprimido com zstd, mas o pacote não está instalado")
+        return _zstd_dictionaries.decompressor(data).decompress(data)
+    if compression == COMPRESSION_LZ4:
+        if lz4_frame is None:
+            raise ValueError("Valor comprimido com lz4, mas o pacote não está instalado")
+        return lz4_frame.decompress(data)
+    return data
+
+
+def encode(value: Any, namespace: Optional[str] = None) -> Tuple[bytes, int]:
+    """
+    Serializa um valor para o cache; retorna (bytes gravados, bytes crus).
+
+    Valores acima de `cache_compression_min_bytes` são comprimidos (zstd,
+    com o dicionário do namespace se houver, ou lz4).
+    """
+    if not settings.cache_binary_codec:
+        raw = json.dumps(value, default=str).encode()
+        _record(namespace, len(raw), len(raw))
+        return raw, len(raw)
+
+    serializer, raw = _serialize(value)
+    compression = COMPRESSION_NONE
+    payload = raw
+    if len(raw) >= settings.cache_compression_min_bytes:
+        compression = _compression()
+        payload = _compress(compression, raw, namespace)
+        if len(payload) >= len(raw):
+            # Não compensou (dado já compacto ou aleatório)
+            compression, payload = COMPRESSION_NONE, raw
+
+    stored = MAGIC + bytes((serializer, compression)) + payload
+    _record(namespace, len(raw), len(stored))
+    return stored, len(raw)
+
+
+def decode(data: Union[bytes, str]) -> Tuple[Any, int]:
+    """Lê um valor do cache em qualquer formato; retorna (valor, bytes crus)"""
+    if isinstance(data, str):
+        data = data.encode()
+    if not data.startswith(MAGIC):
+        # Formato antigo: JSON em texto
+        return json.loads(data), len(data)
+
+    serializer, compression = data[len(MAGIC)], data[len(MAGIC) + 1]
+    raw = _decompress(compression, data[len(MAGIC) + 2:])
+    return _deserialize(serializer, raw), len(raw)
+
+
+def _record(namespace: Optional[str], raw: int, stored: int) -> None:
+    codec_stats["raw_bytes"] += raw
+    codec_stats["stored_bytes"] += stored
+    label = namespace or "default"
+    CACHE_CODEC_BYTES.labels(label, "raw").inc(raw)
+    CACHE_CODEC_BYTES.labels(label, "stored").inc(stored)
+    CACHE_VALUE_BYTES.labels(label).observe(stored)
+
+
+def codec_snapshot() -> Dict[str, Any]:
+    raw, stored = codec_stats["raw_bytes"], codec_stats["stored_bytes"]
+    return {
+        "serializer": settings.cache_serializer if msgpack is not None else "json",
+        "compression": {v: k for k, v in _COMPRESSIONS.items()}[_compression()],
+        "raw_bytes": raw,
+        "stored_bytes": stored,
+        "ratio": round(stored / raw, 4) if raw else None
+    }
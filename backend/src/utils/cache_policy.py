@@ -0,0 +1,138 @@
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from src.core.settings import settings
+from src.utils.json_projection import JSONProjection
+
+
+class CachePolicy:
+    """
+    Em que camada um dado é cacheado.
+
+    `processed`: o @cached guarda o resultado do serviço e as chamadas ao
+    upstream feitas durante o cálculo não gravam o corpo cru no cache
+    HTTP (o resultado processado já cobre). `raw`: o @cached não guarda
+    nada e o HTTPClient guarda a resposta do upstream, com o TTL do
+    decorator e a projeção da política.
+
+    `provider` (chave de api_endpoints) marca as entradas com a tag do
+    provedor, para invalidar tudo o que veio dele de uma vez.
+    `negative_ttl` é o TTL dos resultados "não encontrado" do namespace.
+    """
+
+    PROCESSED = "processed"
+    RAW = "raw"
+
+    def __init__(
+        self,
+        layer: str,
+        ttl: Optional[int] = None,
+        projection: Optional[JSONProjection] = None,
+        stale_if_error: Optional[int] = None,
+        provider: Optional[str] = None,
+        negative_ttl: Optional[int] = None
+    ):
+        self.layer = layer
+        self.ttl = ttl
+        self.projection = projection
+        self.stale_if_error = stale_if_error
+        self.provider = provider
+        self.negative_ttl = negative_ttl
+
+    def resolve(self, ttl: int) -> "CachePolicy":
+        return CachePolicy(
+            self.layer, self.ttl or ttl, self.projection, self.stale_if_error,
+            self.provider, self.negative_ttl
+        )
+
+
+# Campos lidos por CountriesDataProcessor.process_country_basic em cada país
+COUNTRIES_LIST_PROJECTION = JSONProjection([
+    "item.name.common",
+    "item.name.official",
+    "item.capital",
+    "item.region",
+    "item.population",
+    "item.area",
+    "item.flags.png",
+    "item.currencies",
+    "item.cca2",
+    "item.cca3"
+])
+
+# Respostas do World Bank são [metadados, [registros]]
+WORLDBANK_COUNTRIES_PROJECTION = JSONProjection([
+    "item.total",
+    "item.item.id",
+    "item.item.name",
+    "item.item.capitalCity",
+    "item.item.region.value",
+    "item.item.incomeLevel.value",
+    "item.item.longitude",
+    "item.item.latitude"
+])
+
+# Uma entrada por namespace (key_prefix do @cached)
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    # Com cota: sem o cache cru, o resultado processado vencido é o que
+    # segura a API quando a cota acaba
+    "weather_current": CachePolicy(
+        CachePolicy.PROCESSED, stale_if_error=settings.quota_stale_window, provider="weather"
+    ),
+    "weather_forecast": CachePolicy(
+        CachePolicy.PROCESSED, stale_if_error=settings.quota_stale_window, provider="weather"
+    ),
+    "news_headlines": CachePolicy(
+        CachePolicy.PROCESSED, stale_if_error=settings.quota_stale_window, provider="news"
+    ),
+    "news_search": CachePolicy(
+        CachePolicy.PROCESSED, stale_if_error=settings.quota_stale_window, provider="news"
+    ),
+    "news_sources": CachePolicy(
+        CachePolicy.PROCESSED, stale_if_error=settings.quota_stale_window, provider="news"
+    ),
+    # Listas grandes: ficam no cache HTTP só com os campos projetados, e
+    # ele revalida com GET condicional (ETag) em vez de baixar tudo de novo
+    "countries_all": CachePolicy(
+        CachePolicy.RAW, projection=COUNTRIES_LIST_PROJECTION, provider="countries"
+    ),
+    "worldbank_countries": CachePolicy(
+        CachePolicy.RAW, projection=WORLDBANK_COUNTRIES_PROJECTION, provider="worldbank"
+    ),
+    "country_detail": CachePolicy(
+        CachePolicy.PROCESSED, provider="countries",
+        negative_ttl=settings.cache_negative_ttl_countries
+    ),
+    "countries_region": CachePolicy(
+        CachePolicy.PROCESSED, provider="countries",
+        negative_ttl=settings.cache_negative_ttl_countries
+    ),
+    "books_search": CachePolicy(CachePolicy.PROCESSED, provider="openlibrary"),
+    "book_details": CachePolicy(CachePolicy.PROCESSED, provider="openlibrary"),
+    "cep": CachePolicy(
+        CachePolicy.PROCESSED, provider="viacep", negative_ttl=settings.cache_negative_ttl_cep
+    ),
+    "worldbank_indicator": CachePolicy(
+        CachePolicy.PROCESSED, provider="worldbank",
+        negative_ttl=settings.cache_negative_ttl_worldbank
+    ),
+}
+
+# Política do @cached em execução (lida pelo HTTPClient)
+_current_policy: ContextVar[Optional[CachePolicy]] = ContextVar("cache_policy", default=None)
+
+
+def get_cache_policy(namespace: str) -> CachePolicy:
+    return CACHE_POLICIES.get(namespace) or CachePolicy(settings.cache_default_layer)
+
+
+def current_cache_policy() -> Optional[CachePolicy]:
+    return _current_policy.get()
+
+
+def set_current_policy(policy: Optional[CachePolicy]):
+    return _current_policy.set(policy)
+
+
+def reset_current_policy(token) -> None:
+    _current_policy.reset(token)
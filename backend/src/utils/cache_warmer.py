@@ -0,0 +1,283 @@
+import asyncio
+import contextvars
+import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.core.config import get_redis_client
+from src.core.settings import settings
+from src.utils.cache import namespaced_key, reset_force_refresh, set_force_refresh
+from src.utils.metrics import CACHE_WARM_COVERAGE, CACHE_WARM_RUNS
+from src.utils.quota import get_quota
+
+
+logger = logging.getLogger(__name__)
+
+
+class WarmTarget:
+    """Chamada quente mantida no cache: `call` passa pelo serviço (e pelo @cached)"""
+
+    def __init__(self, name: str, provider: str, ttl: Optional[int], call: Callable[[], Awaitable[Any]]):
+        self.name = name
+        self.provider = provider
+        self.ttl = ttl
+        self.call = call
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.retry_at = 0.0
+
+
+def _warm_ttl(func: Callable) -> Optional[int]:
+    """TTL do @cached da função; None se ela não passa pelo cache"""
+    if not hasattr(func, "cache_ttl"):
+        return None
+    return func.cache_ttl or settings.cache_ttl
+
+
+def default_targets() -> List[WarmTarget]:
+    """
+    Chamadas quentes configuradas nas settings (cache_warm_*).
+
+    Alvos cuja função não tem @cached são ignorados: renová-los só
+    chamaria o upstream sem gravar nada.
+    """
+    from src.api.v1.schemas.news import NewsRequest
+    from src.api.v1.schemas.weather import WeatherRequest
+    from src.api.v1.services.countries.countries_service import countries_service
+    from src.api.v1.services.news.news_service import news_service
+    from src.api.v1.services.weather.weather_service import weather_service
+    from src.api.v1.services.worldbank_service import COMMON_INDICATORS, worldbank_service
+
+    targets = [
+        WarmTarget(
+            "countries_all", "countries",
+            _warm_ttl(countries_service.get_all_countries),
+            countries_service.get_all_countries
+        )
+    ]
+    # Mesmos parâmetros dos routers: a chave do cache tem de ser a mesma
+    for city in settings.cache_warm_weather_cities:
+        request = WeatherRequest(city=city, units="metric", lang="pt_br")
+        targets.append(WarmTarget(
+            f"weather_current:{city}", "weather",
+            _warm_ttl(weather_service.get_current_weather),
+            partial(weather_service.get_current_weather, request)
+        ))
+    for params in settings.cache_warm_news_headlines:
+        request = NewsRequest(**params)
+        label = ":".join(str(v) for v in params.values())
+        targets.append(WarmTarget(
+            f"news_headlines:{label}", "news",
+            _warm_ttl(news_service.get_top_headlines),
+            partial(news_service.get_top_headlines, request)
+        ))
+    for country in settings.cache_warm_worldbank_countries:
+        for indicator in COMMON_INDICATORS:
+            targets.append(WarmTarget(
+                f"worldbank:{country}:{indicator['code']}", "worldbank",
+                _warm_ttl(worldbank_service.get_economic_indicator),
+                partial(worldbank_service.get_economic_indicator, country.lower(), indicator["code"])
+            ))
+    skipped = [target.name for target in targets if target.ttl is None]
+    if skipped:
+        logger.warning(f"Alvos de aquecimento sem @cached ignorados: {', '.join(skipped)}")
+    return [target for target in targets if target.ttl is not None]
+
+
+class CacheWarmer:
+    """
+    Mantém as chamadas quentes no cache, renovando antes do vencimento.
+
+    Cada alvo é renovado ao atingir `cache_warm_refresh_ratio` do TTL,
+    chamando o serviço com renovação forçada (o @cached e o HTTPClient
+    recalculam e regravam). O horário da última renovação fica num hash
+    no Redis, compartilhado pelos workers, e uma trava por alvo evita que
+    dois renovem a mesma chamada; as chamadas ao upstream respeitam
+    `cache_warm_rate_per_minute`.
+
+    Para APIs com cota diária, o intervalo de renovação é alongado para
+    que os alvos do provedor gastem no máximo `cache_warm_quota_share`
+    da cota, e nenhum é renovado enquanto restar menos de
+    `cache_warm_quota_reserve` dela.
+    """
+
+    def __init__(self, targets: Optional[List[WarmTarget]] = None):
+        self._targets = targets
+        self._task: Optional[asyncio.Task] = None
+        self._last_call = 0.0
+
+    @property
+    def targets(self) -> List[WarmTarget]:
+        if self._targets is None:
+            self._targets = default_targets()
+        return self._targets
+
+    @staticmethod
+    def _status_key() -> str:
+        return namespaced_key("warm:status")
+
+    async def _shared_status(self) -> Dict[str, float]:
+        redis_client = get_redis_client()
+        if redis_client:
+            try:
+                status = await redis_client.hgetall(self._status_key())
+                return {name: float(value) for name, value in status.items()}
+            except Exception as e:
+                logger.warning(f"Erro ao ler estado do aquecedor no Redis: {e}")
+        return {}
+
+    async def _claim(self, target: WarmTarget) -> bool:
+        redis_client = get_redis_client()
+        if not redis_client:
+            return True
+        try:
+            return bool(await redis_client.set(
+                namespaced_key(f"warm:lock:{target.name}"), "1",
+                nx=True, ex=settings.cache_refresh_lock_ttl
+            ))
+        except Exception as e:
+            logger.warning(f"Erro ao obter trava de aquecimento de {target.name}: {e}")
+            return True
+
+    async def _release(self, target: WarmTarget, succeeded: bool) -> None:
+        redis_client = get_redis_client()
+        if not redis_client:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            if succeeded:
+                pipe.hset(self._status_key(), target.name, target.last_success)
+            pipe.delete(namespaced_key(f"warm:lock:{target.name}"))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Erro ao registrar aquecimento de {target.name}: {e}")
+
+    async def _throttle(self) -> None:
+        interval = 60.0 / max(1, settings.cache_warm_rate_per_minute)
+        wait = self._last_call + interval - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_call = time.monotonic()
+
+    def _refresh_interval(self, target: WarmTarget) -> float:
+        interval = target.ttl * settings.cache_warm_refresh_ratio
+        quota = get_quota(target.provider)
+        if quota and quota.daily:
+            # Os alvos do provedor dividem a fatia da cota diária reservada ao aquecedor
+            siblings = sum(1 for t in self.targets if t.provider == target.provider)
+            calls_per_day = max(1.0, quota.daily * settings.cache_warm_quota_share)
+            interval = max(interval, 86400 * siblings / calls_per_day)
+        return interval
+
+    def _is_due(self, target: WarmTarget, shared: Dict[str, float], now: float) -> bool:
+        if now < target.retry_at:
+            return False
+        last = max(shared.get(target.name, 0.0), target.last_success or 0.0)
+        return now >= last + self._refresh_interval(target)
+
+    async def _quota_allows(self, target: WarmTarget) -> bool:
+        quota = get_quota(target.provider)
+        if not quota or not quota.daily:
+            return True
+        status = await quota.status()
+        if status["daily_remaining"] > quota.daily * settings.cache_warm_quota_reserve:
+            return True
+        CACHE_WARM_RUNS.labels(target.name, "quota").inc()
+        logger.info(
+            f"Aquecimento de {target.name} adiado: restam {status['daily_remaining']} "
+            f"chamadas da cota de {target.provider}"
+        )
+        return False
+
+    async def warm(self, target: WarmTarget) -> bool:
+        if not await self._quota_allows(target):
+            return False
+        if not await self._claim(target):
+            return False
+        # Outro worker pode ter renovado entre a leitura do estado e a trava
+        if not self._is_due(target, await self._shared_status(), time.time()):
+            await self._release(target, False)
+            return False
+
+        await self._throttle()
+        token = set_force_refresh()
+        succeeded = False
+        try:
+            result = await target.call()
+            if isinstance(result, dict) and result.get("success") is False:
+                raise RuntimeError(result.get("error") or result.get("message") or "falha")
+            target.last_success = time.time()
+            target.last_error = None
+            succeeded = True
+            CACHE_WARM_RUNS.labels(target.name, "success").inc()
+        except Exception as e:
+            target.last_error = str(e)
+            target.retry_at = time.time() + settings.cache_warm_retry_delay
+            CACHE_WARM_RUNS.labels(target.name, "error").inc()
+            logger.warning(f"Falha ao aquecer {target.name}: {e}")
+        finally:
+            reset_force_refresh(token)
+            await self._release(target, succeeded)
+        return succeeded
+
+    async def run_once(self) -> int:
+        """Renova os alvos vencendo; retorna quantos foram renovados"""
+        shared = await self._shared_status()
+        now = time.time()
+        warmed = 0
+        for target in self.targets:
+            if self._is_due(target, shared, now) and await self.warm(target):
+                warmed += 1
+        if warmed:
+            logger.info(f"Aquecedor de cache renovou {warmed} chamadas")
+        return warmed
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+                await self.coverage()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro no aquecedor de cache: {e}")
+            await asyncio.sleep(settings.cache_warm_check_interval)
+
+    async def coverage(self) -> Dict[str, Any]:
+        """Quais chamadas quentes têm entrada renovada dentro do TTL"""
+        shared = await self._shared_status()
+        now = time.time()
+        targets = {}
+        for target in self.targets:
+            last = max(shared.get(target.name, 0.0), target.last_success or 0.0)
+            targets[target.name] = {
+                "provider": target.provider,
+                "warm": now - last < target.ttl,
+                "age": round(now - last, 1) if last else None,
+                "last_error": target.last_error
+            }
+        warm = sum(1 for t in targets.values() if t["warm"])
+        ratio = warm / len(targets) if targets else 1.0
+        CACHE_WARM_COVERAGE.set(ratio)
+        return {"coverage": round(ratio, 4), "warm": warm, "total": len(targets), "targets": targets}
+
+    def start(self) -> None:
+        if not settings.cache_warm_enabled or not settings.cache_enabled:
+            return
+        # Contexto vazio: as renovações não herdam prazo nem política de cache
+        self._task = asyncio.get_running_loop().create_task(
+            self.run(), context=contextvars.Context()
+        )
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+cache_warmer = CacheWarmer()
@@ -0,0 +1,165 @@
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from src.core.settings import settings
+from src.utils.metrics import (
+    CIRCUIT_BREAKER_REJECTIONS,
+    CIRCUIT_BREAKER_STATE,
+    CIRCUIT_BREAKER_TRANSITIONS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, provider: str, retry_after: float):
+        self.provider = provider
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuito aberto para {provider}, nova tentativa em {retry_after:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por provedor com janela de taxa de falhas.
+
+    Fechado: registra resultados em uma janela deslizante e abre quando a
+    taxa de falhas passa do limite. Aberto: rejeita sem tocar na rede até
+    `open_seconds`. Meio-aberto: deixa passar algumas requisições de sonda;
+    se todas tiverem sucesso o circuito fecha, se alguma falhar ele reabre.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: Optional[float] = None,
+        min_requests: Optional[int] = None,
+        window: Optional[int] = None,
+        open_seconds: Optional[int] = None,
+        half_open_probes: Optional[int] = None
+    ):
+        self.name = name
+        self.failure_rate = failure_rate or settings.circuit_breaker_failure_rate
+        self.min_requests = min_requests or settings.circuit_breaker_min_requests
+        self.window = window or settings.circuit_breaker_window
+        self.open_seconds = open_seconds or settings.circuit_breaker_open_seconds
+        self.half_open_probes = half_open_probes or settings.circuit_breaker_half_open_probes
+
+        self.state = self.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        CIRCUIT_BREAKER_STATE.labels(name).set(0)
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+        if state == self.CLOSED:
+            self._outcomes.clear()
+        CIRCUIT_BREAKER_STATE.labels(self.name).set(self._STATE_VALUES[state])
+        CIRCUIT_BREAKER_TRANSITIONS.labels(self.name, state).inc()
+
+    def _prune(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def before_request(self) -> None:
+        """Levanta CircuitOpenError se a requisição não deve ser enviada"""
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.open_seconds:
+                CIRCUIT_BREAKER_REJECTIONS.labels(self.name).inc()
+                raise CircuitOpenError(self.name, self.open_seconds - elapsed)
+            self._transition(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                CIRCUIT_BREAKER_REJECTIONS.labels(self.name).inc()
+                raise CircuitOpenError(self.name, 0.0)
+            self._probes_in_flight += 1
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._transition(self.CLOSED)
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, True))
+        self._prune(now)
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._transition(self.OPEN)
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, False))
+        self._prune(now)
+
+        total = len(self._outcomes)
+        if total < self.min_requests:
+            return
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if failures / total >= self.failure_rate:
+            self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """Libera uma sonda que terminou sem resultado (ex.: cancelada)"""
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._prune(now)
+        total = len(self._outcomes)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        info = {
+            "state": self.state,
+            "requests_in_window": total,
+            "failure_rate": round(failures / total, 3) if total else 0.0
+        }
+        if self.state == self.OPEN:
+            info["retry_in"] = round(max(0.0, self.open_seconds - (now - self._opened_at)), 1)
+        return info
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        breaker = CircuitBreaker(provider)
+        _breakers[provider] = breaker
+    return breaker
+
+
+def circuit_breakers_status() -> Dict[str, Dict[str, Any]]:
+    for provider in settings.api_endpoints:
+        get_circuit_breaker(provider)
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
+
+
+def is_failure_status(status_code: int) -> bool:
+    """Só erros do provedor contam como falha; 4xx do cliente não"""
+    return status_code >= 500 or status_code == 429
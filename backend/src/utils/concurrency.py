@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from src.core.settings import settings
+from src.utils.metrics import (
+    CONCURRENCY_IN_FLIGHT,
+    CONCURRENCY_LIMIT,
+    CONCURRENCY_QUEUE_WAIT,
+    CONCURRENCY_QUEUED,
+    CONCURRENCY_REJECTIONS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimitExceeded(Exception):
+    def __init__(self, provider: str, limit: int):
+        self.provider = provider
+        self.limit = limit
+        super().__init__(
+            f"Limite de concorrência de {provider} atingido ({limit} em andamento)"
+        )
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limite de requisições simultâneas a um provedor ajustado por AIMD.
+
+    Cada resposta boa e rápida aumenta o limite em 1/limite (cerca de +1
+    por "janela" cheia); erros de sobrecarga (429, 5xx, timeouts) ou uma
+    latência acima de `latency_tolerance` vezes a menor latência recente
+    reduzem o limite multiplicativamente. Chamadas acima do limite esperam
+    em fila por até `queue_timeout` segundos antes de serem rejeitadas.
+    """
+
+    # Intervalo para esquecer a menor latência e se adaptar a mudanças no upstream
+    MIN_RTT_RESET_SECONDS = 30.0
+
+    def __init__(
+        self,
+        provider: str,
+        initial_limit: Optional[int] = None,
+        min_limit: Optional[int] = None,
+        max_limit: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        self.provider = provider
+        self.min_limit = min_limit or settings.concurrency_min_limit
+        self.max_limit = max_limit or settings.concurrency_max_limit
+        self.queue_timeout = (
+            settings.concurrency_queue_timeout if queue_timeout is None else queue_timeout
+        )
+        self._limit = float(initial_limit or settings.concurrency_initial_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._min_rtt: Optional[float] = None
+        self._min_rtt_at = 0.0
+        self._last_decrease = 0.0
+        CONCURRENCY_LIMIT.labels(provider).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _update_gauges(self) -> None:
+        CONCURRENCY_LIMIT.labels(self.provider).set(self.limit)
+        CONCURRENCY_IN_FLIGHT.labels(self.provider).set(self.in_flight)
+        CONCURRENCY_QUEUED.labels(self.provider).set(len(self._waiters))
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        started = time.monotonic()
+        if timeout is None or timeout > self.queue_timeout:
+            timeout = self.queue_timeout
+        try:
+            # asyncio.wait não cancela o waiter no timeout: a vaga entregue
+            # junto com o fim do prazo não se perde
+            await asyncio.wait((waiter,), timeout=timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A vaga já tinha sido entregue: devolve para o próximo da fila
+                self.cancel()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            CONCURRENCY_QUEUE_WAIT.labels(self.provider).observe(time.monotonic() - started)
+            self._update_gauges()
+
+        if not waiter.done():
+            waiter.cancel()
+            CONCURRENCY_REJECTIONS.labels(self.provider).inc()
+            raise ConcurrencyLimitExceeded(self.provider, self.limit)
+
+    def release(self, rtt: float, dropped: bool = False) -> None:
+        """Devolve a vaga e ajusta o limite com o resultado da chamada"""
+        was_saturated = self.in_flight >= self.limit
+        self.in_flight -= 1
+        now = time.monotonic()
+
+        if not dropped:
+            if self._min_rtt is None or rtt < self._min_rtt or \
+                    now - self._min_rtt_at > self.MIN_RTT_RESET_SECONDS:
+                self._min_rtt = rtt
+                self._min_rtt_at = now
+            if rtt > self._min_rtt * settings.concurrency_latency_tolerance:
+                dropped = True
+
+        if dropped:
+            # No máximo uma redução por "janela" de latência para não colapsar o limite
+            if now - self._last_decrease > max(rtt, 0.1):
+                self._limit = max(
+                    float(self.min_limit),
+                    self._limit * settings.concurrency_backoff_ratio
+                )
+                self._last_decrease = now
+        elif was_saturated:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+
+        self._wake_waiters()
+        self._update_gauges()
+
+    def cancel(self) -> None:
+        """Devolve a vaga de uma chamada que não chegou a ser feita, sem ajustar o limite"""
+        self.in_flight -= 1
+        self._wake_waiters()
+        self._update_gauges()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "min_rtt_ms": round(self._min_rtt * 1000, 1) if self._min_rtt else None
+        }
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(provider: str) -> AdaptiveConcurrencyLimiter:
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        limiter = AdaptiveConcurrencyLimiter(provider)
+        _limiters[provider] = limiter
+    return limiter
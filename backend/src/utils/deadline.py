@@ -0,0 +1,125 @@
+import asyncio
+import contextvars
+import logging
+import math
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+
+from src.core.settings import settings
+from src.utils.metrics import DEADLINE_EXCEEDED
+
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = "x-request-timeout"
+
+# Instante (time.monotonic) em que o cliente deixa de esperar pela resposta
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, url: str):
+        self.url = url
+        super().__init__(f"Prazo da requisição esgotado antes de chamar {url}")
+
+
+def remaining() -> Optional[float]:
+    """Segundos restantes do prazo da requisição atual (None se não houver)"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def set_deadline(seconds: float):
+    """Define o prazo do contexto atual; retorna o token para `reset_deadline`"""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token) -> None:
+    _deadline.reset(token)
+
+
+def deadline_context() -> contextvars.Context:
+    """Contexto vazio que carrega só o prazo atual, para tasks que atendem a requisição"""
+    context = contextvars.Context()
+    deadline = _deadline.get()
+    if deadline is not None:
+        context.run(_deadline.set, deadline)
+    return context
+
+
+def route_budget(path: str, header_value: Optional[str] = None) -> float:
+    budget = settings.request_deadline_default
+    for prefix, seconds in settings.request_deadlines.items():
+        if path.startswith(prefix):
+            budget = seconds
+            break
+
+    budget = min(budget, settings.request_deadline_max)
+
+    if header_value:
+        try:
+            requested = float(header_value)
+        except ValueError:
+            requested = None
+        # O cliente só pode pedir um prazo menor que o da rota; nan, inf e
+        # valores não positivos são ignorados
+        if requested is not None and math.isfinite(requested) and requested > 0:
+            budget = min(requested, budget)
+    return max(0.0, budget)
+
+
+class DeadlineMiddleware:
+    """
+    Middleware ASGI que dá a cada requisição um orçamento de tempo.
+
+    O prazo vem do header `X-Request-Timeout` (segundos) ou do padrão da
+    rota, fica num contextvar lido pelo HTTPClient e, quando esgota, a
+    árvore de tarefas do handler é cancelada e o cliente recebe 504.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.request_deadline_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        header_value = None
+        for name, value in scope.get("headers", []):
+            if name.decode("latin-1").lower() == DEADLINE_HEADER:
+                header_value = value.decode("latin-1")
+                break
+        budget = route_budget(scope["path"], header_value)
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        token = set_deadline(budget)
+        try:
+            async with asyncio.timeout(budget):
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            DEADLINE_EXCEEDED.labels("inbound").inc()
+            logger.warning(f"Prazo de {budget:.1f}s esgotado para {scope['path']}")
+            if not response_started:
+                response = JSONResponse(
+                    status_code=504,
+                    content={
+                        "error": "Tempo limite excedido",
+                        "message": f"A requisição excedeu o prazo de {budget:.1f}s"
+                    }
+                )
+                await response(scope, receive, send)
+        finally:
+            reset_deadline(token)
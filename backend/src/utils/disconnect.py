@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+
+from src.core.settings import settings
+from src.utils.metrics import REQUEST_ABANDONED_SECONDS, REQUESTS_ABANDONED
+
+
+logger = logging.getLogger(__name__)
+
+
+def _route_label(scope) -> str:
+    # O roteador do Starlette grava a rota resolvida no próprio scope
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class DisconnectMiddleware:
+    """
+    Middleware ASGI que cancela o handler quando o cliente desconecta.
+
+    O handler roda em uma task própria enquanto o canal `receive` é
+    observado; ao chegar `http.disconnect` antes do fim da resposta, a
+    árvore de tarefas do handler (inclusive as chamadas em andamento do
+    HTTPClient) é cancelada. Buscas coalescidas com outros chamadores
+    continuam, pois o SingleFlight só as cancela quando todos desistem.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.cancel_on_disconnect:
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue = asyncio.Queue()
+        disconnected = asyncio.Event()
+        response_complete = False
+
+        async def listen():
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        async def send_wrapper(message):
+            nonlocal response_complete
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+            await send(message)
+
+        started = time.monotonic()
+        handler = asyncio.ensure_future(self.app(scope, messages.get, send_wrapper))
+        listener = asyncio.ensure_future(listen())
+        watcher = asyncio.ensure_future(disconnected.wait())
+        try:
+            await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+
+            if not handler.done() and not response_complete:
+                handler.cancel()
+                route = _route_label(scope)
+                elapsed = time.monotonic() - started
+                REQUESTS_ABANDONED.labels(route).inc()
+                REQUEST_ABANDONED_SECONDS.labels(route).observe(elapsed)
+                logger.info(
+                    f"Cliente desconectou de {scope['path']} após {elapsed:.2f}s, "
+                    f"cancelando o processamento"
+                )
+                try:
+                    await handler
+                except asyncio.CancelledError:
+                    pass
+                return
+
+            await handler
+        finally:
+            for task in (handler, listener, watcher):
+                if not task.done():
+                    task.cancel()
@@ -0,0 +1,247 @@
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from src.core.settings import settings
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+except ImportError:  # pragma: no cover - dependência opcional
+    dns = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class DNSCache:
+    """
+    Cache de resolução de nomes com validade pelo TTL do registro.
+
+    Com o dnspython disponível o TTL vem da resposta DNS (limitado entre
+    `dns_cache_min_ttl` e `dns_cache_max_ttl`); sem ele a resolução usa o
+    getaddrinfo do sistema com `dns_cache_default_ttl`. Se a resolução
+    falhar, os endereços vencidos continuam sendo usados.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[List[str], float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def _clamp_ttl(self, ttl: float) -> float:
+        return min(max(ttl, settings.dns_cache_min_ttl), settings.dns_cache_max_ttl)
+
+    async def _lookup(self, host: str) -> Tuple[List[str], float]:
+        if dns is not None:
+            addresses: List[str] = []
+            ttls: List[float] = []
+            for rdtype in ("A", "AAAA"):
+                try:
+                    answer = await dns.asyncresolver.resolve(host, rdtype)
+                except dns.exception.DNSException:
+                    continue
+                addresses.extend(record.to_text() for record in answer)
+                ttls.append(answer.rrset.ttl)
+            if addresses:
+                return addresses, self._clamp_ttl(min(ttls))
+
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, None, type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return addresses, self._clamp_ttl(settings.dns_cache_default_ttl)
+
+    async def _refresh(self, host: str) -> List[str]:
+        try:
+            addresses, ttl = await self._lookup(host)
+            self._entries[host] = (addresses, time.monotonic() + ttl)
+            logger.debug(f"DNS {host} -> {addresses} (TTL {ttl:.0f}s)")
+            return addresses
+        except OSError as e:
+            stale = self._entries.get(host)
+            if stale:
+                logger.warning(f"Falha ao resolver {host}, usando endereços em cache: {e}")
+                return stale[0]
+            raise
+
+    async def resolve(self, host: str) -> List[str]:
+        entry = self._entries.get(host)
+        if entry and time.monotonic() < entry[1]:
+            return entry[0]
+
+        # Uma única resolução por host, mesmo com várias conexões abrindo juntas
+        pending = self._pending.get(host)
+        if pending is None:
+            pending = asyncio.ensure_future(self._refresh(host))
+            self._pending[host] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(host, None))
+        return await asyncio.shield(pending)
+
+    async def prefetch(self, hosts: Iterable[str]) -> None:
+        await asyncio.gather(*(self.resolve(host) for host in hosts), return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        now = time.monotonic()
+        return {
+            host: {"addresses": addresses, "expires_in": round(max(0.0, expires - now), 1)}
+            for host, (addresses, expires) in self._entries.items()
+        }
+
+
+dns_cache = DNSCache()
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Backend do httpcore que resolve o host pelo DNSCache antes de conectar"""
+
+    def __init__(self, cache: DNSCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self._cache = cache
+        self._backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        if _is_ip(host):
+            return await self._backend.connect_tcp(
+                host, port, timeout, local_address, socket_options
+            )
+
+        try:
+            addresses = await self._cache.resolve(host)
+        except OSError as e:
+            raise httpcore.ConnectError(f"Erro ao resolver {host}: {e}") from e
+
+        last_error: Optional[Exception] = None
+        # O TLS continua usando o nome original (SNI), só o TCP vai ao IP
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout, local_address, socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error or httpcore.ConnectError(f"Nenhum endereço para {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# Do mais específico para o mais genérico: o retry e o circuit breaker
+# decidem pelos tipos de exceção do httpx
+_HTTPCORE_ERRORS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _map_httpcore_errors(request: httpx.Request):
+    try:
+        yield
+    except Exception as exc:
+        for core_error, httpx_error in _HTTPCORE_ERRORS:
+            if isinstance(exc, core_error):
+                raise httpx_error(str(exc), request=request) from exc
+        raise
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream, request: httpx.Request):
+        self._stream = stream
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        with _map_httpcore_errors(self._request):
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class CachingDNSTransport(httpx.AsyncBaseTransport):
+    """
+    Transport do httpx sobre um pool do httpcore que conecta pelo
+    CachingNetworkBackend. O pool é montado pela API pública do httpcore
+    (`network_backend`), sem mexer nos atributos internos do
+    AsyncHTTPTransport.
+    """
+
+    def __init__(
+        self,
+        cache: DNSCache,
+        http2: bool = False,
+        limits: httpx.Limits = httpx.Limits(),
+        verify: bool = True
+    ):
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(verify=verify),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=CachingNetworkBackend(cache),
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _map_httpcore_errors(request):
+            response = await self._pool.handle_async_request(core_request)
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream, request),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
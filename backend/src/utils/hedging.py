@@ -0,0 +1,159 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+from src.core.settings import settings
+from src.utils.metrics import (
+    UPSTREAM_HEDGE_CANCELLED,
+    UPSTREAM_HEDGE_DELAY,
+    UPSTREAM_HEDGE_WINS,
+    UPSTREAM_HEDGEABLE_REQUESTS,
+    UPSTREAM_HEDGED_REQUESTS,
+)
+from src.utils.retry import RetryBudget
+
+
+logger = logging.getLogger(__name__)
+
+# Estado da cópia em execução: marcada como perdedora antes de ser cancelada
+_hedge_copy: contextvars.ContextVar[Optional[Dict[str, bool]]] = contextvars.ContextVar(
+    "hedge_copy", default=None
+)
+
+
+def cancelled_by_hedge() -> bool:
+    """Se a tentativa atual foi cancelada por ter perdido a corrida para a outra cópia"""
+    copy = _hedge_copy.get()
+    return bool(copy and copy["lost"])
+
+
+class LatencyTracker:
+    """Janela das latências mais recentes de um provedor"""
+
+    def __init__(self, size: int = 500):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._sorted: Optional[list] = None
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        index = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[index]
+
+
+class Hedger:
+    """
+    Envia uma segunda requisição idêntica quando a primeira passa do
+    quantil de latência observado e fica com a que responder antes.
+    O volume de hedges é limitado a `max_ratio` do tráfego do provedor e,
+    se informado, também ao orçamento de retries (`budget`) do provedor.
+
+    Funciona com respostas em stream: a perdedora é cancelada e, se já
+    tiver respondido, fechada para devolver a conexão ao pool. O
+    cancelamento da perdedora conta só em UPSTREAM_HEDGE_CANCELLED, não
+    como desistência do cliente.
+    """
+
+    def __init__(self, provider: str, quantile: float = 0.95, max_ratio: float = 0.1):
+        self.provider = provider
+        self.quantile = quantile
+        self.latencies = LatencyTracker()
+        self._budget = RetryBudget(ratio=max_ratio, min_per_second=0)
+
+    def hedge_delay(self) -> Optional[float]:
+        if len(self.latencies) < settings.hedge_min_samples:
+            return None
+        delay = max(settings.hedge_min_delay, self.latencies.quantile(self.quantile))
+        UPSTREAM_HEDGE_DELAY.labels(self.provider).set(delay)
+        return delay
+
+    async def run(
+        self,
+        send: Callable[[], Awaitable[httpx.Response]],
+        budget: Optional[RetryBudget] = None
+    ) -> httpx.Response:
+        UPSTREAM_HEDGEABLE_REQUESTS.labels(self.provider).inc()
+        self._budget.record_request()
+        start = time.monotonic()
+        delay = self.hedge_delay()
+
+        copies: Dict[asyncio.Task, Dict[str, bool]] = {}
+
+        def launch() -> asyncio.Task:
+            copy = {"lost": False}
+            context = contextvars.copy_context()
+            context.run(_hedge_copy.set, copy)
+            task = asyncio.get_running_loop().create_task(send(), context=context)
+            copies[task] = copy
+            return task
+
+        primary = launch()
+        tasks = {primary}
+        winner = None
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if (not done and self._budget.try_acquire() and
+                        (budget is None or budget.try_acquire())):
+                    UPSTREAM_HEDGED_REQUESTS.labels(self.provider).inc()
+                    logger.debug(f"Hedge disparado para {self.provider} após {delay:.3f}s")
+                    tasks.add(launch())
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            UPSTREAM_HEDGE_WINS.labels(self.provider).inc()
+                        self.latencies.observe(time.monotonic() - start)
+                        winner = task
+                        return task.result()
+
+            # Todas falharam: propaga o erro da requisição original
+            return primary.result()
+        finally:
+            losers = [task for task in tasks if task is not winner]
+            for task in losers:
+                if winner is not None and not task.done():
+                    copies[task]["lost"] = True
+                    UPSTREAM_HEDGE_CANCELLED.labels(self.provider).inc()
+                task.cancel()
+            if losers:
+                # Espera as canceladas: uma delas pode ter respondido antes do cancelamento
+                await asyncio.wait(losers)
+            for task in losers:
+                # task.exception() também marca o erro da perdedora como tratado
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+
+
+_hedgers: Dict[str, Hedger] = {}
+
+
+def get_hedger(provider: str) -> Optional[Hedger]:
+    """Hedger do provedor, ou None se hedging não está habilitado para ele"""
+    hedger = _hedgers.get(provider)
+    if hedger is None:
+        policy = settings.hedge_policies.get(provider)
+        if not policy:
+            return None
+        hedger = Hedger(provider, **policy)
+        _hedgers[provider] = hedger
+    return hedger
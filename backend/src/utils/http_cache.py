@@ -0,0 +1,88 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str], default_ttl: int) -> Optional[int]:
+    """
+    Tempo de frescor em segundos segundo Cache-Control/Expires do upstream.
+
+    Retorna None quando a resposta não pode ser armazenada (no-store),
+    0 quando precisa ser revalidada a cada uso (no-cache) e `default_ttl`
+    quando o upstream não diz nada.
+    """
+    cache_control = _parse_cache_control(headers.get("cache-control", ""))
+
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0
+
+    for directive in ("s-maxage", "max-age"):
+        if cache_control.get(directive):
+            try:
+                return max(0, int(cache_control[directive]))
+            except ValueError:
+                pass
+
+    expires = _http_date(headers.get("expires"))
+    if expires is not None:
+        date = _http_date(headers.get("date")) or time.time()
+        return max(0, int(expires - date))
+
+    return default_ttl
+
+
+def build_cache_meta(
+    headers: Mapping[str, str],
+    lifetime: int,
+    previous: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Metadados guardados junto da resposta: validadores e validade"""
+    previous = previous or {}
+    return {
+        "etag": headers.get("etag") or previous.get("etag"),
+        "last_modified": headers.get("last-modified") or previous.get("last_modified"),
+        "fresh_until": time.time() + lifetime
+    }
+
+
+def has_validators(meta: Optional[Dict[str, Any]]) -> bool:
+    return bool(meta and (meta.get("etag") or meta.get("last_modified")))
+
+
+def is_fresh(entry: Dict[str, Any]) -> bool:
+    meta = entry.get("cache_meta")
+    if not meta:
+        # Entradas antigas, sem metadados, expiram só pelo TTL do Redis
+        return True
+    return time.time() < meta.get("fresh_until", 0)
+
+
+def conditional_headers(meta: Dict[str, Any]) -> Dict[str, str]:
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
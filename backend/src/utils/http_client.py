@@ -1,47 +1,94 @@
 import asyncio
 import time
 import logging
-from typing import Dict, Any, Optional, Union
+from typing import Awaitable, Dict, Any, Optional, Union
 from contextlib import asynccontextmanager
 
 import httpx
-from src.core.config import get_redis_client
+from src.core.config import get_http_pool
 from src.core.settings import settings
+from src.utils.cache import (
+    CacheManager,
+    force_refresh_active,
+    metric_namespace,
+    namespaced_key,
+    provider_tag,
+    refresh_in_background,
+    should_refresh_early,
+)
+from src.utils.cache_policy import CachePolicy, current_cache_policy
+from src.utils.circuit_breaker import CircuitBreaker, get_circuit_breaker, is_failure_status
+from src.utils.concurrency import AdaptiveConcurrencyLimiter, get_concurrency_limiter
+from src.utils.deadline import DeadlineExceeded, remaining
+from src.utils.hedging import cancelled_by_hedge, get_hedger
+from src.utils.http_cache import (
+    build_cache_meta,
+    conditional_headers,
+    freshness_lifetime,
+    has_validators,
+    is_fresh,
+)
+from src.utils.json_projection import JSONProjection
+from src.utils.metrics import (
+    CACHE_EARLY_REFRESHES,
+    CACHE_STALE_SERVED,
+    DEADLINE_EXCEEDED,
+    UPSTREAM_CANCELLED,
+    UPSTREAM_COALESCED_REQUESTS,
+    UPSTREAM_COALESCED_WAITERS,
+    UPSTREAM_RETRIES,
+    UPSTREAM_RETRY_BUDGET_EXHAUSTED,
+    UPSTREAM_STALE_SERVED,
+)
+from src.utils.quota import ProviderQuota, QuotaExceeded, get_quota
+from src.utils.retry import RetryPolicy, default_retry_policy, get_retry_budget
+from src.utils.singleflight import SingleFlight
 import json
 import hashlib
 
 
 logger = logging.getLogger(__name__)
 
+# Compartilhado por todo o processo: GETs idênticos concorrentes viram um só
+upstream_singleflight = SingleFlight()
+
+
+def resolve_provider(url: str) -> str:
+    """Nome do provedor em settings.api_endpoints (ou o host) para uma URL"""
+    for name, base_url in settings.api_endpoints.items():
+        if url.startswith(base_url):
+            return name
+    return httpx.URL(url).host or "unknown"
+
 
 class HTTPClient:
-    def __init__(self):
-        self.client: Optional[httpx.AsyncClient] = None
-        self._timeout = httpx.Timeout(timeout=settings.http_timeout)
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        # Sem cliente explícito, cada requisição usa o pool compartilhado do host
+        self.client: Optional[httpx.AsyncClient] = client
+        self.retry_policy = retry_policy or default_retry_policy
         
     async def __aenter__(self):
         """Entrada do context manager"""
-        self.client = httpx.AsyncClient(
-            timeout=self._timeout,
-            follow_redirects=True,
-            limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=100,
-                keepalive_expiry=30.0
-            )
-        )
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.client:
-            await self.client.aclose()
+        # Os pools são fechados no shutdown da aplicação (lifespan)
+        pass
+    
+    def _get_client(self, url: str) -> httpx.AsyncClient:
+        return self.client or get_http_pool(url)
     
     def _generate_cache_key(
         self, 
         method: str, 
         url: str, 
         params: Optional[Dict] = None,
-        headers: Optional[Dict] = None
+        headers: Optional[Dict] = None,
+        projection: Optional[JSONProjection] = None
     ) -> str:
         cache_data = {
             "method": method,
@@ -51,91 +98,390 @@ class HTTPClient:
             "auth_headers": {k: v for k, v in (headers or {}).items() 
                            if k.lower() in ['authorization', 'x-api-key', 'x-auth-token']}
         }
+        if projection is not None:
+            # Projeções diferentes guardam documentos diferentes
+            cache_data["projection"] = projection.signature
         cache_string = json.dumps(cache_data, sort_keys=True)
-        return f"http_cache:{hashlib.md5(cache_string.encode()).hexdigest()}"
+        # Provedor na chave: as métricas do cache HTTP saem separadas por provedor
+        digest = hashlib.md5(cache_string.encode()).hexdigest()
+        return namespaced_key(f"http_cache:{resolve_provider(url)}:{digest}")
     
     async def _get_from_cache(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        if not settings.cache_enabled:
-            return None
-            
-        redis_client = get_redis_client()
-        if not redis_client:
-            return None
-            
-        try:
-            cached_data = await redis_client.get(cache_key)
-            if cached_data:
-                logger.debug(f"Cache hit para chave: {cache_key}")
-                return json.loads(cached_data)
-        except Exception as e:
-            logger.warning(f"Erro ao acessar cache: {e}")
-            
-        return None
+        # L1 em memória na frente do Redis (ver CacheManager)
+        cached_data = await CacheManager.get(cache_key)
+        if cached_data:
+            logger.debug(f"Cache hit para chave: {cache_key}")
+        return cached_data
     
     async def _save_to_cache(
         self, 
         cache_key: str, 
         data: Dict[str, Any], 
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        stale_window: int = 0,
+        provider: Optional[str] = None
     ) -> None:
-        if not settings.cache_enabled:
-            return
-            
-        redis_client = get_redis_client()
-        if not redis_client:
+        ttl = settings.cache_ttl if ttl is None else ttl
+        # Entrada vencida ainda serve para stale-while-revalidate/stale-if-error
+        stale_window = max(
+            stale_window,
+            settings.cache_stale_while_revalidate,
+            settings.cache_stale_if_error
+        )
+        if has_validators(data.get("cache_meta")):
+            # Mantém a entrada além do frescor para revalidação condicional
+            stale_window = max(stale_window, settings.http_cache_revalidate_window)
+        ttl += stale_window
+        if ttl <= 0:
             return
             
+        tags = [provider_tag(provider)] if provider else None
+        if await CacheManager.set(cache_key, data, ttl, tags=tags):
+            logger.debug(f"Dados salvos no cache com TTL {ttl}s: {cache_key}")
+    
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        provider: str,
+        stream: bool = False,
+        **kwargs
+    ) -> httpx.Response:
+        client = self._get_client(url)
+        if stream:
+            request = client.build_request(method, url, **kwargs)
+            return await client.send(request, stream=True)
+        return await client.request(method, url, **kwargs)
+    
+    async def _hedged_attempt(
+        self,
+        method: str,
+        url: str,
+        provider: str,
+        stream: bool,
+        breaker: Optional[CircuitBreaker],
+        limiter: Optional[AdaptiveConcurrencyLimiter],
+        quota: Optional[ProviderQuota] = None,
+        **kwargs
+    ) -> httpx.Response:
+        def attempt() -> Awaitable[httpx.Response]:
+            return self._attempt(
+                method, url, provider, stream, breaker, limiter, quota, **kwargs
+            )
+        
+        # Com stream, o Hedger fecha a resposta perdedora
+        hedger = get_hedger(provider) if method.upper() == "GET" else None
+        if hedger is None:
+            return await attempt()
+        # Cada cópia passa pelo limitador e pelo circuit breaker e o hedge
+        # consome o orçamento de retries do provedor
+        return await hedger.run(attempt, budget=get_retry_budget(provider))
+    
+    async def _attempt(
+        self,
+        method: str,
+        url: str,
+        provider: str,
+        stream: bool,
+        breaker: Optional[CircuitBreaker],
+        limiter: Optional[AdaptiveConcurrencyLimiter],
+        quota: Optional[ProviderQuota] = None,
+        **kwargs
+    ) -> httpx.Response:
+        time_left = remaining()
+        if time_left is not None:
+            if time_left < settings.deadline_min_attempt:
+                # O cliente já desistiu (ou vai desistir): não gasta upstream
+                DEADLINE_EXCEEDED.labels("upstream").inc()
+                raise DeadlineExceeded(url)
+            # O timeout da tentativa nunca passa do prazo restante
+            kwargs["timeout"] = min(time_left, settings.http_timeout)
+        
+        if breaker:
+            # Falha imediata com o circuito aberto, sem esperar os retries
+            breaker.before_request()
+        
+        if limiter:
+            try:
+                await limiter.acquire(timeout=time_left)
+            except BaseException:
+                if breaker:
+                    breaker.release()
+                raise
+        
+        if quota:
+            # Por último: circuito aberto ou limitador cheio não gastam cota.
+            # Cada tentativa consome uma unidade; levanta QuotaExceeded sem enviar
+            try:
+                await quota.acquire()
+            except BaseException:
+                if breaker:
+                    breaker.release()
+                if limiter:
+                    limiter.cancel()
+                raise
+        
+        started = time.monotonic()
+        dropped = False
+        recorded = False
         try:
-            ttl = ttl or settings.cache_ttl
-            await redis_client.setex(
-                cache_key, 
-                ttl, 
-                json.dumps(data, default=str)
+            response = await self._send(method, url, provider, stream, **kwargs)
+            
+            if stream and response.status_code >= 400:
+                await response.aread()
+            size = (
+                response.headers.get("content-length", "?")
+                if stream and not response.is_closed else len(response.content)
             )
-            logger.debug(f"Dados salvos no cache com TTL {ttl}s: {cache_key}")
-        except Exception as e:
-            logger.warning(f"Erro ao salvar no cache: {e}")
+            logger.info(
+                f"{method.upper()} {url} - {response.status_code} "
+                f"({size} bytes)"
+            )
+            
+            dropped = is_failure_status(response.status_code)
+            if breaker:
+                recorded = True
+                if dropped:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            
+            if response.status_code >= 400:
+                response.raise_for_status()
+                
+            return response
+            
+        except asyncio.CancelledError:
+            # Cliente desconectou (ou prazo esgotou): a conexão volta ao pool.
+            # A cópia perdedora do hedge é contada à parte, pelo Hedger
+            if not cancelled_by_hedge():
+                UPSTREAM_CANCELLED.labels(provider).inc()
+            raise
+            
+        except httpx.RequestError:
+            dropped = True
+            if breaker:
+                recorded = True
+                breaker.record_failure()
+            raise
+            
+        finally:
+            if breaker and not recorded:
+                # Terminou sem resultado (cancelada, erro de leitura etc.):
+                # libera a sonda para o circuito não ficar meio-aberto preso
+                breaker.release()
+            if limiter:
+                limiter.release(time.monotonic() - started, dropped)
     
     async def _make_request_with_retry(
         self,
         method: str,
         url: str,
+        stream: bool = False,
+        quota: Optional[ProviderQuota] = None,
         **kwargs
     ) -> httpx.Response:
         last_exception = None
+        provider = resolve_provider(url)
+        policy = self.retry_policy
+        budget = get_retry_budget(provider)
+        budget.record_request()
+        breaker = (
+            get_circuit_breaker(provider)
+            if settings.circuit_breaker_enabled else None
+        )
+        limiter = (
+            get_concurrency_limiter(provider)
+            if settings.concurrency_limit_enabled else None
+        )
+        wait_time = None
         
-        for attempt in range(settings.max_retries + 1):
+        for attempt in range(policy.max_retries + 1):
             try:
-                response = await self.client.request(method, url, **kwargs)
-                
-                logger.info(
-                    f"{method.upper()} {url} - {response.status_code} "
-                    f"({len(response.content)} bytes)"
+                return await self._hedged_attempt(
+                    method, url, provider, stream, breaker, limiter, quota, **kwargs
                 )
                 
-                if response.status_code >= 400:
-                    response.raise_for_status()
-                    
-                return response
-                
             except (httpx.RequestError, httpx.HTTPStatusError) as e:
                 last_exception = e
                 
-                if attempt < settings.max_retries:
-                    wait_time = 2 ** attempt  
+                if attempt >= policy.max_retries or not policy.should_retry(method, e):
+                    logger.error(
+                        f"Requisição {method} {url} falhou após {attempt + 1} "
+                        f"tentativa(s). Último erro: {e}"
+                    )
+                    break
+                
+                wait_time = policy.next_delay(wait_time, e)
+                if wait_time is None:
                     logger.warning(
-                        f"Tentativa {attempt + 1} falhou para {method} {url}. "
-                        f"Tentando novamente em {wait_time}s. Erro: {e}"
+                        f"Retry-After de {method} {url} excede o limite, sem nova tentativa"
                     )
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(
-                        f"Todas as {settings.max_retries + 1} tentativas falharam "
-                        f"para {method} {url}. Último erro: {e}"
+                    break
+                
+                time_left = remaining()
+                if time_left is not None and \
+                        time_left - wait_time < settings.deadline_min_attempt:
+                    logger.warning(
+                        f"Prazo restante ({time_left:.2f}s) não comporta nova "
+                        f"tentativa para {method} {url}"
                     )
+                    break
+                
+                if not budget.try_acquire():
+                    UPSTREAM_RETRY_BUDGET_EXHAUSTED.labels(provider).inc()
+                    logger.warning(
+                        f"Orçamento de retries esgotado para {provider}, "
+                        f"sem nova tentativa para {method} {url}"
+                    )
+                    break
+                
+                UPSTREAM_RETRIES.labels(provider, policy.reason(e)).inc()
+                logger.warning(
+                    f"Tentativa {attempt + 1} falhou para {method} {url}. "
+                    f"Tentando novamente em {wait_time:.2f}s. Erro: {e}"
+                )
+                await asyncio.sleep(wait_time)
                     
         raise last_exception
     
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        cache_key: str,
+        cache_ttl: Optional[int],
+        use_cache: bool,
+        stale_entry: Optional[Dict[str, Any]] = None,
+        projection: Optional[JSONProjection] = None,
+        quota: Optional[ProviderQuota] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        start_time = time.time()
+        stale_meta = (stale_entry or {}).get("cache_meta")
+        if has_validators(stale_meta):
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                **conditional_headers(stale_meta)
+            }
+        
+        response = await self._make_request_with_retry(
+            method, url, stream=projection is not None, quota=quota, **kwargs
+        )
+        
+        try:
+            if response.status_code == 304 and stale_entry:
+                # Corpo inalterado: reaproveita os dados já parseados do cache
+                logger.debug(f"Entrada revalidada (304): {cache_key}")
+                result = {
+                    "status_code": stale_entry["status_code"],
+                    "data": stale_entry["data"],
+                    "headers": stale_entry["headers"],
+                    "url": stale_entry["url"],
+                    "cache_info": {
+                        "cached": True,
+                        "revalidated": True,
+                        "cache_key": cache_key,
+                        "response_time": time.time() - start_time
+                    }
+                }
+            else:
+                if projection is not None:
+                    response_data = await projection.parse_stream(response)
+                else:
+                    try:
+                        response_data = response.json()
+                    except json.JSONDecodeError:
+                        response_data = {"content": response.text}
+                
+                result = {
+                    "status_code": response.status_code,
+                    "data": response_data,
+                    "headers": dict(response.headers),
+                    "url": str(response.url),
+                    "cache_info": {
+                        "cached": False,
+                        "cache_key": cache_key,
+                        "response_time": time.time() - start_time
+                    }
+                }
+        finally:
+            await response.aclose()
+        
+        if (method.upper() == "GET" and 
+            use_cache and 
+            (200 <= response.status_code < 300 or response.status_code == 304)):
+            lifetime = freshness_lifetime(
+                response.headers,
+                settings.cache_ttl if cache_ttl is None else cache_ttl
+            )
+            if lifetime is not None:
+                meta = build_cache_meta(response.headers, lifetime, stale_meta)
+                # Custo da busca, usado pelo XFetch para antecipar a atualização
+                meta["delta"] = time.time() - start_time
+                await self._save_to_cache(
+                    cache_key, {**result, "cache_meta": meta}, lifetime,
+                    # Com cota, guarda a resposta vencida para servir quando ela acabar
+                    stale_window=settings.quota_stale_window if quota else 0,
+                    provider=resolve_provider(url)
+                )
+            
+        return result
+    
+    def _stale_response(
+        self,
+        stale_entry: Dict[str, Any],
+        cache_key: str,
+        reason: str,
+        start_time: float
+    ) -> Dict[str, Any]:
+        UPSTREAM_STALE_SERVED.labels(resolve_provider(stale_entry["url"]), reason).inc()
+        CACHE_STALE_SERVED.labels(metric_namespace(cache_key), reason).inc()
+        return {
+            "status_code": stale_entry["status_code"],
+            "data": stale_entry["data"],
+            "headers": stale_entry["headers"],
+            "url": stale_entry["url"],
+            "cache_info": {
+                "cached": True,
+                "stale": True,
+                "stale_reason": reason,
+                "stale_age": round(time.time() - stale_entry["cache_meta"]["fresh_until"], 3),
+                "cache_key": cache_key,
+                "response_time": time.time() - start_time
+            }
+        }
+    
+    def _refresh_in_background(
+        self,
+        method: str,
+        url: str,
+        cache_key: str,
+        cache_ttl: Optional[int],
+        use_cache: bool,
+        entry: Dict[str, Any],
+        projection: Optional[JSONProjection],
+        quota: Optional[ProviderQuota],
+        **kwargs
+    ) -> bool:
+        return refresh_in_background(
+            cache_key,
+            lambda: upstream_singleflight.do(
+                cache_key,
+                lambda: self._fetch(
+                    method, url, cache_key, cache_ttl, use_cache,
+                    stale_entry=entry, projection=projection,
+                    quota=quota, **kwargs
+                )
+            )
+        )
+    
+    @staticmethod
+    def _stale_age(stale_entry: Optional[Dict[str, Any]]) -> Optional[float]:
+        if not stale_entry:
+            return None
+        return time.time() - stale_entry["cache_meta"]["fresh_until"]
+    
     async def request(
         self,
         method: str,
@@ -145,16 +491,62 @@ class HTTPClient:
         json_data: Optional[Dict] = None,
         cache_ttl: Optional[int] = None,
         use_cache: bool = True,
+        projection: Optional[JSONProjection] = None,
+        quota: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
         start_time = time.time()
-        cache_key = self._generate_cache_key(method, url, params, headers)
+        provider_quota = get_quota(quota) if quota else None
+        
+        policy = current_cache_policy()
+        if policy is not None and method.upper() == "GET":
+            if policy.layer == CachePolicy.PROCESSED:
+                # O @cached que chamou já guarda o resultado processado
+                use_cache = False
+            else:
+                cache_ttl = policy.ttl if policy.ttl is not None else cache_ttl
+                projection = projection or policy.projection
+        
+        cache_key = self._generate_cache_key(method, url, params, headers, projection)
+        
+        kwargs_for_request = kwargs.copy()
+        if json_data:
+            kwargs_for_request["json"] = json_data
+        if params:
+            kwargs_for_request["params"] = params
+        if headers:
+            kwargs_for_request["headers"] = headers
+        
+        stale_entry = None
         if method.upper() == "GET" and use_cache:
             cached_response = await self._get_from_cache(cache_key)
-            if cached_response:
+            refreshing = force_refresh_active()
+            if cached_response and (refreshing or not is_fresh(cached_response)):
+                # Expirada (ou renovação forçada pelo aquecedor): revalida com
+                # GET condicional ou serve se a cota acabou
+                stale_entry = cached_response
+                if (not refreshing and
+                        self._stale_age(stale_entry) < settings.cache_stale_while_revalidate):
+                    # Responde com o vencido e revalida fora do caminho da requisição
+                    self._refresh_in_background(
+                        method, url, cache_key, cache_ttl, use_cache, stale_entry,
+                        projection, provider_quota, **kwargs_for_request
+                    )
+                    return self._stale_response(
+                        stale_entry, cache_key, "revalidating", start_time
+                    )
+            elif cached_response:
+                meta = cached_response.get("cache_meta")
+                if meta and should_refresh_early(meta["fresh_until"], meta.get("delta")):
+                    if self._refresh_in_background(
+                        method, url, cache_key, cache_ttl, use_cache, cached_response,
+                        projection, provider_quota, **kwargs_for_request
+                    ):
+                        CACHE_EARLY_REFRESHES.labels(f"http:{resolve_provider(url)}").inc()
+                # A entrada pode vir do L1, compartilhada: não é alterada
                 response_time = time.time() - start_time
                 return {
-                    **cached_response,
+                    **{k: v for k, v in cached_response.items() if k != "cache_meta"},
                     "cache_info": {
                         "cached": True,
                         "cache_key": cache_key,
@@ -163,54 +555,99 @@ class HTTPClient:
                 }
 
         try:
-            kwargs_for_request = kwargs.copy()
-            if json_data:
-                kwargs_for_request["json"] = json_data
-            if params:
-                kwargs_for_request["params"] = params
-            if headers:
-                kwargs_for_request["headers"] = headers
-                
-            response = await self._make_request_with_retry(
-                method, url, **kwargs_for_request
+            if method.upper() != "GET":
+                return await self._fetch(
+                    method, url, cache_key, cache_ttl, use_cache,
+                    projection=projection, quota=provider_quota,
+                    **kwargs_for_request
+                )
+            
+            result, shared, followers = await upstream_singleflight.do(
+                cache_key,
+                lambda: self._fetch(
+                    method, url, cache_key, cache_ttl, use_cache,
+                    stale_entry=stale_entry, projection=projection,
+                    quota=provider_quota, **kwargs_for_request
+                )
             )
             
-            try:
-                response_data = response.json()
-            except json.JSONDecodeError:
-                response_data = {"content": response.text}
-            
-            result = {
-                "status_code": response.status_code,
-                "data": response_data,
-                "headers": dict(response.headers),
-                "url": str(response.url),
-                "cache_info": {
-                    "cached": False,
-                    "cache_key": cache_key,
-                    "response_time": time.time() - start_time
+            provider = resolve_provider(url)
+            if shared:
+                UPSTREAM_COALESCED_REQUESTS.labels(provider).inc()
+                return {
+                    **result,
+                    "cache_info": {
+                        **result["cache_info"],
+                        "coalesced": True,
+                        "response_time": time.time() - start_time
+                    }
                 }
-            }
             
-            if (method.upper() == "GET" and 
-                use_cache and 
-                200 <= response.status_code < 300):
-                await self._save_to_cache(cache_key, result, cache_ttl)
-                
+            UPSTREAM_COALESCED_WAITERS.labels(provider).observe(followers)
+            if followers:
+                logger.info(
+                    f"Requisição {method.upper()} {url} atendeu {followers} "
+                    f"chamadores coalescidos"
+                )
             return result
             
-        except Exception as e:
-            response_time = time.time() - start_time
-            logger.error(f"Erro na requisição {method} {url}: {e}")
+        except DeadlineExceeded as e:
+            stale_age = self._stale_age(stale_entry)
+            if stale_age is not None and stale_age < settings.cache_stale_if_error:
+                return self._stale_response(stale_entry, cache_key, "deadline", start_time)
             
             raise HTTPException(
-                status_code=503,
+                status_code=504,
                 detail={
-                    "message": f"Erro ao acessar API externa: {str(e)}",
+                    "message": str(e),
                     "url": url,
-                    "response_time": response_time
+                    "response_time": time.time() - start_time
                 }
             )
+            
+        except QuotaExceeded as e:
+            if stale_entry:
+                logger.warning(f"Cota de {e.provider} indisponível, servindo cache vencido: {url}")
+                return self._stale_response(stale_entry, cache_key, e.reason, start_time)
+            
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "message": str(e),
+                    "url": url,
+                    "response_time": time.time() - start_time
+                }
+            )
+            
+        except Exception as e:
+            response_time = time.time() - start_time
+            logger.error(f"Erro na requisição {method} {url}: {e}")
+            
+            stale_age = self._stale_age(stale_entry)
+            client_error = (
+                isinstance(e, httpx.HTTPStatusError)
+                and not is_failure_status(e.response.status_code)
+            )
+            if stale_age is not None and stale_age < settings.cache_stale_if_error \
+                    and not client_error:
+                logger.warning(f"Servindo cache vencido há {stale_age:.0f}s para {url}")
+                return self._stale_response(stale_entry, cache_key, "upstream_error", start_time)
+            
+            detail = {
+                "message": f"Erro ao acessar API externa: {str(e)}",
+                "url": url,
+                "response_time": response_time
+            }
+            if isinstance(e, httpx.HTTPStatusError):
+                detail["upstream_status"] = e.response.status_code
+            raise HTTPException(status_code=503, detail=detail)
+
+
+def is_not_found_error(exc: Exception) -> bool:
+    """Erro do HTTPClient causado por 404/410 do upstream (item inexistente)"""
+    detail = getattr(exc, "detail", None)
+    return isinstance(detail, dict) and detail.get("upstream_status") in (404, 410)
+
 
 @asynccontextmanager
 async def http_client():
@@ -0,0 +1,128 @@
+import json
+from typing import Any, Iterable, List
+
+import httpx
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - dependência opcional
+    ijson = None
+
+
+class _AsyncResponseReader:
+    """Adapta o corpo em streaming do httpx para o `read()` assíncrono do ijson"""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                break
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class JSONProjection:
+    """
+    Projeção de campos de um documento JSON.
+
+    Os caminhos usam a notação de prefixos do ijson: chaves separadas por
+    ponto e `item` para elementos de lista. Exemplos:
+    `docs.item.title` (campo de cada elemento de `docs`), `numFound`
+    (escalar no topo) e `item.name.common` (lista no topo).
+
+    Um caminho mantém a subárvore inteira daquele ponto; todo o resto é
+    descartado. Com o ijson disponível o corpo é lido em streaming e só os
+    campos projetados chegam a ser construídos; sem ele, o documento é
+    parseado inteiro e a projeção é aplicada depois.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths: List[str] = sorted(set(paths))
+        self._prefixes = set()
+        self._memo = {}
+        for path in self.paths:
+            parts = path.split(".")
+            for i in range(len(parts)):
+                self._prefixes.add(".".join(parts[:i]))
+
+    @property
+    def signature(self) -> List[str]:
+        return self.paths
+
+    def _keeps(self, prefix: str) -> bool:
+        kept = self._memo.get(prefix)
+        if kept is None:
+            if len(self._memo) > 10000:
+                self._memo.clear()
+            kept = prefix in self._prefixes or any(
+                prefix == path or prefix.startswith(path + ".") for path in self.paths
+            )
+            self._memo[prefix] = kept
+        return kept
+
+    @staticmethod
+    def _child(prefix: str, key: str) -> str:
+        return f"{prefix}.{key}" if prefix else key
+
+    def apply(self, document: Any, prefix: str = "") -> Any:
+        """Aplica a projeção a um documento já parseado"""
+        if prefix in self.paths or any(prefix.startswith(p + ".") for p in self.paths):
+            return document
+        if isinstance(document, dict):
+            return {
+                key: self.apply(value, self._child(prefix, key))
+                for key, value in document.items()
+                if self._keeps(self._child(prefix, key))
+            }
+        if isinstance(document, list):
+            item_prefix = self._child(prefix, "item")
+            if not self._keeps(item_prefix):
+                return []
+            return [self.apply(value, item_prefix) for value in document]
+        return document
+
+    async def parse_stream(self, response: httpx.Response) -> Any:
+        """Lê o corpo em streaming construindo apenas os campos projetados"""
+        if ijson is None:
+            await response.aread()
+            return self.apply(json.loads(response.content))
+
+        root: List[Any] = []
+        # Pilha de [container, chave pendente]
+        stack: List[List[Any]] = [[root, None]]
+
+        def attach(value: Any) -> None:
+            container, key = stack[-1]
+            if isinstance(container, dict):
+                container[key] = value
+            else:
+                container.append(value)
+
+        async for prefix, event, value in ijson.parse_async(
+            _AsyncResponseReader(response), use_float=True
+        ):
+            if event == "map_key":
+                if self._keeps(prefix):
+                    stack[-1][1] = value
+                continue
+            if not self._keeps(prefix):
+                # Subárvore fora da projeção: nada é construído
+                continue
+            if event in ("start_map", "start_array"):
+                container: Any = {} if event == "start_map" else []
+                attach(container)
+                stack.append([container, None])
+            elif event in ("end_map", "end_array"):
+                stack.pop()
+            else:
+                attach(value)
+
+        return root[0] if root else None
@@ -0,0 +1,158 @@
+import fnmatch
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.core.settings import settings
+from src.utils.metrics import (
+    L1_CACHE_BYTES,
+    L1_CACHE_EVICTIONS,
+    REDIS_FALLBACK_BYTES,
+    REDIS_FALLBACK_EVICTIONS,
+)
+
+
+def key_namespace(key: str) -> Optional[str]:
+    """Prefixo lógico da chave (`nexus:v1:<namespace>:...`)"""
+    parts = key.split(":", 3)
+    return parts[2] if len(parts) > 2 else None
+
+
+def metric_namespace(key: str) -> str:
+    """Rótulo das métricas da chave: o namespace ou, no cache HTTP, `http:<provedor>`"""
+    parts = key.split(":", 4)
+    if len(parts) > 4 and parts[2] == "http_cache":
+        return f"http:{parts[3]}"
+    return key_namespace(key) or "default"
+
+
+class _Entry:
+    __slots__ = ("value", "size", "expires_at", "hits")
+
+    def __init__(self, value: Any, size: int, expires_at: float):
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.hits = 0
+
+
+class LocalCache:
+    """
+    Cache em memória do processo (L1) na frente do Redis (L2).
+
+    Guarda os valores já desserializados, então um hit não custa rede nem
+    `json.loads`; os valores são compartilhados entre chamadores e devem
+    ser tratados como somente leitura. O orçamento é em bytes do valor
+    serializado; ao estourar, sai a entrada menos recente (lru) ou, entre
+    as `EVICTION_SAMPLE` menos recentes, a menos acessada (lfu). O TTL é
+    limitado a `l1_cache_max_ttl` e nunca passa do TTL restante no Redis.
+    """
+
+    EVICTION_SAMPLE = 5
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_ttl: Optional[float] = None,
+        policy: Optional[str] = None,
+        bytes_gauge=L1_CACHE_BYTES,
+        evictions_counter=L1_CACHE_EVICTIONS
+    ):
+        self.max_bytes = max_bytes or settings.l1_cache_max_bytes
+        self.max_ttl = max_ttl or settings.l1_cache_max_ttl
+        self.policy = (policy or settings.l1_cache_policy).lower()
+        self._bytes_gauge = bytes_gauge
+        self._evictions_counter = evictions_counter
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str, reason: Optional[str] = None) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            if reason:
+                self._evictions_counter.labels(metric_namespace(key), reason).inc()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if time.monotonic() >= entry.expires_at:
+            self._remove(key, "expired")
+            self._bytes_gauge.set(self.bytes)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> None:
+        ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        self._remove(key)
+        # Valores grandes demais expulsariam boa parte do cache de uma vez
+        if ttl <= 0 or size > self.max_bytes // 4:
+            self._bytes_gauge.set(self.bytes)
+            return
+
+        self._entries[key] = _Entry(value, size, time.monotonic() + ttl)
+        self.bytes += size
+        while self.bytes > self.max_bytes and self._entries:
+            self._remove(self._victim(), "capacity")
+        self._bytes_gauge.set(self.bytes)
+
+    def _victim(self) -> str:
+        now = time.monotonic()
+        candidates = []
+        for key, entry in self._entries.items():
+            if now >= entry.expires_at:
+                return key
+            candidates.append((entry.hits, key))
+            if self.policy != "lfu" or len(candidates) >= self.EVICTION_SAMPLE:
+                break
+        return min(candidates)[1]
+
+    def delete(self, key: str) -> None:
+        self._remove(key)
+        self._bytes_gauge.set(self.bytes)
+
+    def delete_matching(self, pattern: str) -> int:
+        keys = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+        for key in keys:
+            self._remove(key)
+        self._bytes_gauge.set(self.bytes)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+        self._bytes_gauge.set(0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+local_cache = LocalCache()
+
+# Usado no lugar do Redis enquanto ele está fora do ar (ver report_redis_error)
+fallback_cache = LocalCache(
+    max_bytes=settings.redis_fallback_max_bytes,
+    max_ttl=settings.redis_fallback_max_ttl,
+    bytes_gauge=REDIS_FALLBACK_BYTES,
+    evictions_counter=REDIS_FALLBACK_EVICTIONS
+)
@@ -0,0 +1,245 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# Métricas expostas no /metrics do Instrumentator (registry padrão)
+
+UPSTREAM_COALESCED_WAITERS = Histogram(
+    "nexus_upstream_coalesced_waiters",
+    "Chamadores extras atendidos por cada requisição líder coalescida",
+    ["provider"],
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500)
+)
+
+UPSTREAM_COALESCED_REQUESTS = Counter(
+    "nexus_upstream_coalesced_requests_total",
+    "Requisições upstream evitadas por coalescência (singleflight)",
+    ["provider"]
+)
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    "nexus_circuit_breaker_state",
+    "Estado do circuit breaker por provedor (0=fechado, 1=meio-aberto, 2=aberto)",
+    ["provider"]
+)
+
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    "nexus_circuit_breaker_rejections_total",
+    "Requisições rejeitadas imediatamente com o circuito aberto",
+    ["provider"]
+)
+
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "nexus_circuit_breaker_transitions_total",
+    "Transições de estado do circuit breaker",
+    ["provider", "state"]
+)
+
+UPSTREAM_RETRIES = Counter(
+    "nexus_upstream_retries_total",
+    "Novas tentativas enviadas ao provedor",
+    ["provider", "reason"]
+)
+
+UPSTREAM_RETRY_BUDGET_EXHAUSTED = Counter(
+    "nexus_upstream_retry_budget_exhausted_total",
+    "Retries descartados por falta de orçamento de retries",
+    ["provider"]
+)
+
+UPSTREAM_HEDGEABLE_REQUESTS = Counter(
+    "nexus_upstream_hedgeable_requests_total",
+    "Requisições elegíveis a hedging",
+    ["provider"]
+)
+
+UPSTREAM_HEDGED_REQUESTS = Counter(
+    "nexus_upstream_hedged_requests_total",
+    "Requisições duplicadas (hedge) enviadas após o atraso do quantil",
+    ["provider"]
+)
+
+UPSTREAM_HEDGE_WINS = Counter(
+    "nexus_upstream_hedge_wins_total",
+    "Requisições em que o hedge respondeu antes da original",
+    ["provider"]
+)
+
+UPSTREAM_HEDGE_CANCELLED = Counter(
+    "nexus_upstream_hedge_cancelled_total",
+    "Cópias perdedoras do hedge canceladas depois que a outra respondeu",
+    ["provider"]
+)
+
+UPSTREAM_HEDGE_DELAY = Gauge(
+    "nexus_upstream_hedge_delay_seconds",
+    "Atraso atual antes de disparar o hedge (latência no quantil configurado)",
+    ["provider"]
+)
+
+CONCURRENCY_LIMIT = Gauge(
+    "nexus_upstream_concurrency_limit",
+    "Limite adaptativo de requisições simultâneas por provedor",
+    ["provider"]
+)
+
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "nexus_upstream_concurrency_in_flight",
+    "Requisições em andamento por provedor",
+    ["provider"]
+)
+
+CONCURRENCY_QUEUED = Gauge(
+    "nexus_upstream_concurrency_queued",
+    "Requisições aguardando vaga no limitador de concorrência",
+    ["provider"]
+)
+
+CONCURRENCY_QUEUE_WAIT = Histogram(
+    "nexus_upstream_concurrency_queue_wait_seconds",
+    "Tempo de espera por uma vaga no limitador de concorrência",
+    ["provider"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5)
+)
+
+CONCURRENCY_REJECTIONS = Counter(
+    "nexus_upstream_concurrency_rejections_total",
+    "Requisições rejeitadas após esperar demais na fila do limitador",
+    ["provider"]
+)
+
+QUOTA_REMAINING = Gauge(
+    "nexus_upstream_quota_remaining",
+    "Chamadas restantes na cota da API por janela",
+    ["provider", "window"]
+)
+
+QUOTA_THROTTLED = Counter(
+    "nexus_upstream_quota_throttled_total",
+    "Chamadas ao upstream bloqueadas pelo gerenciador de cotas",
+    ["provider", "reason"]
+)
+
+UPSTREAM_STALE_SERVED = Counter(
+    "nexus_upstream_stale_served_total",
+    "Respostas servidas do cache vencido no lugar de uma chamada ao upstream",
+    ["provider", "reason"]
+)
+
+DEADLINE_EXCEEDED = Counter(
+    "nexus_request_deadline_exceeded_total",
+    "Requisições interrompidas por esgotarem o prazo",
+    ["stage"]
+)
+
+REQUESTS_ABANDONED = Counter(
+    "nexus_requests_abandoned_total",
+    "Requisições canceladas porque o cliente desconectou antes da resposta",
+    ["route"]
+)
+
+REQUEST_ABANDONED_SECONDS = Histogram(
+    "nexus_request_abandoned_seconds",
+    "Tempo de processamento até o cliente desconectar",
+    ["route"],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+
+UPSTREAM_CANCELLED = Counter(
+    "nexus_upstream_cancelled_total",
+    "Chamadas ao upstream interrompidas por cancelamento antes da resposta",
+    ["provider"]
+)
+
+CACHE_LOOKUPS = Counter(
+    "nexus_cache_lookups_total",
+    "Consultas ao cache por namespace e camada (l1: memória do processo, l2: Redis)",
+    ["namespace", "tier", "result"]
+)
+
+CACHE_OPERATION_SECONDS = Histogram(
+    "nexus_cache_operation_seconds",
+    "Latência das operações no Redis por namespace (get, set, get_many, ...)",
+    ["namespace", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+
+CACHE_VALUE_BYTES = Histogram(
+    "nexus_cache_value_bytes",
+    "Tamanho armazenado (após codec) de cada valor gravado no cache",
+    ["namespace"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+)
+
+CACHE_ERRORS = Counter(
+    "nexus_cache_errors_total",
+    "Falhas em operações de cache (Redis indisponível, valor ilegível, ...)",
+    ["namespace", "operation"]
+)
+
+L1_CACHE_BYTES = Gauge(
+    "nexus_l1_cache_bytes",
+    "Bytes (valor serializado) ocupados no cache em memória"
+)
+
+REDIS_CONNECTED = Gauge(
+    "nexus_redis_connected",
+    "Redis disponível para o cache (1) ou em reconexão (0)"
+)
+
+REDIS_RECONNECT_ATTEMPTS = Counter(
+    "nexus_redis_reconnect_attempts_total",
+    "Tentativas de reconexão ao Redis",
+    ["result"]
+)
+
+REDIS_FALLBACK_BYTES = Gauge(
+    "nexus_redis_fallback_cache_bytes",
+    "Bytes ocupados no cache local usado enquanto o Redis está fora"
+)
+
+REDIS_FALLBACK_EVICTIONS = Counter(
+    "nexus_redis_fallback_cache_evictions_total",
+    "Entradas removidas do cache local usado enquanto o Redis está fora",
+    ["namespace", "reason"]
+)
+
+L1_CACHE_EVICTIONS = Counter(
+    "nexus_l1_cache_evictions_total",
+    "Entradas removidas do cache em memória",
+    ["namespace", "reason"]
+)
+
+CACHE_STALE_SERVED = Counter(
+    "nexus_cache_stale_served_total",
+    "Entradas servidas vencidas por namespace (revalidando, por falha, cota ou prazo)",
+    ["namespace", "reason"]
+)
+
+CACHE_NEGATIVE_HITS = Counter(
+    "nexus_cache_negative_hits_total",
+    "Consultas respondidas por entrada negativa (não encontrado) no cache",
+    ["namespace"]
+)
+
+CACHE_EARLY_REFRESHES = Counter(
+    "nexus_cache_early_refreshes_total",
+    "Entradas ainda válidas atualizadas antes do vencimento (XFetch)",
+    ["namespace"]
+)
+
+CACHE_CODEC_BYTES = Counter(
+    "nexus_cache_codec_bytes_total",
+    "Bytes gravados no cache: serializados (raw) e efetivamente armazenados (stored)",
+    ["namespace", "kind"]
+)
+
+CACHE_WARM_RUNS = Counter(
+    "nexus_cache_warm_runs_total",
+    "Renovações feitas pelo aquecedor de cache",
+    ["target", "result"]
+)
+
+CACHE_WARM_COVERAGE = Gauge(
+    "nexus_cache_warm_coverage_ratio",
+    "Fração das chamadas quentes com entrada renovada dentro do TTL"
+)
@@ -0,0 +1,145 @@
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from src.core.config import get_redis_client, report_redis_error
+from src.core.settings import settings
+from src.utils.metrics import QUOTA_REMAINING, QUOTA_THROTTLED
+
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, provider: str, reason: str):
+        self.provider = provider
+        self.reason = reason
+        super().__init__(f"Cota da API {provider} indisponível ({reason})")
+
+
+class ProviderQuota:
+    """
+    Cota de uso de uma API com chave (diária e por minuto).
+
+    O consumo fica em contadores no Redis, compartilhados por todos os
+    workers; sem Redis, cada processo conta localmente. Perto do limite
+    diário (`quota_throttle_ratio`) o consumo passa a ser distribuído
+    proporcionalmente ao tempo restante do dia, para a cota não acabar
+    de manhã.
+    """
+
+    def __init__(self, provider: str, daily: Optional[int] = None, per_minute: Optional[int] = None):
+        self.provider = provider
+        self.daily = daily
+        self.per_minute = per_minute
+        self._local: Dict[str, int] = {}
+
+    def _keys(self, now: float) -> Tuple[str, str]:
+        day = time.strftime("%Y%m%d", time.gmtime(now))
+        minute = int(now // 60)
+        return (
+            f"quota:{self.provider}:day:{day}",
+            f"quota:{self.provider}:minute:{minute}"
+        )
+
+    async def _incr(self, day_key: str, minute_key: str, amount: int) -> Tuple[int, int]:
+        redis_client = get_redis_client()
+        if redis_client:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.incrby(day_key, amount)
+                pipe.expire(day_key, 90000)
+                pipe.incrby(minute_key, amount)
+                pipe.expire(minute_key, 120)
+                day_used, _, minute_used, _ = await pipe.execute()
+                return int(day_used), int(minute_used)
+            except Exception as e:
+                report_redis_error(e)
+                logger.warning(f"Erro ao atualizar cota de {self.provider} no Redis: {e}")
+
+        if len(self._local) > 1000:
+            self._local.clear()
+        self._local[day_key] = self._local.get(day_key, 0) + amount
+        self._local[minute_key] = self._local.get(minute_key, 0) + amount
+        return self._local[day_key], self._local[minute_key]
+
+    async def _read(self, day_key: str, minute_key: str) -> Tuple[int, int]:
+        redis_client = get_redis_client()
+        if redis_client:
+            try:
+                day_used, minute_used = await redis_client.mget(day_key, minute_key)
+                return int(day_used or 0), int(minute_used or 0)
+            except Exception as e:
+                report_redis_error(e)
+                logger.warning(f"Erro ao ler cota de {self.provider} no Redis: {e}")
+        return self._local.get(day_key, 0), self._local.get(minute_key, 0)
+
+    def _denial(self, now: float, day_used: int, minute_used: int) -> Optional[str]:
+        if self.per_minute and minute_used > self.per_minute:
+            return "per_minute_exhausted"
+        if self.daily:
+            if day_used > self.daily:
+                return "daily_exhausted"
+            if day_used > self.daily * settings.quota_throttle_ratio:
+                elapsed = (now % 86400) / 86400
+                if day_used > self.daily * elapsed:
+                    return "throttled"
+        return None
+
+    def _publish(self, day_used: int, minute_used: int) -> None:
+        if self.daily:
+            QUOTA_REMAINING.labels(self.provider, "day").set(max(0, self.daily - day_used))
+        if self.per_minute:
+            QUOTA_REMAINING.labels(self.provider, "minute").set(max(0, self.per_minute - minute_used))
+
+    async def acquire(self) -> None:
+        """Registra uma chamada ao upstream ou levanta QuotaExceeded"""
+        now = time.time()
+        day_key, minute_key = self._keys(now)
+        day_used, minute_used = await self._incr(day_key, minute_key, 1)
+
+        reason = self._denial(now, day_used, minute_used)
+        if reason:
+            # Devolve a unidade reservada: a chamada não vai acontecer
+            day_used, minute_used = await self._incr(day_key, minute_key, -1)
+            self._publish(day_used, minute_used)
+            QUOTA_THROTTLED.labels(self.provider, reason).inc()
+            logger.warning(f"Chamada para {self.provider} bloqueada pela cota: {reason}")
+            raise QuotaExceeded(self.provider, reason)
+
+        self._publish(day_used, minute_used)
+
+    async def status(self) -> Dict[str, Any]:
+        day_key, minute_key = self._keys(time.time())
+        day_used, minute_used = await self._read(day_key, minute_key)
+        self._publish(day_used, minute_used)
+        return {
+            "daily_limit": self.daily,
+            "daily_remaining": max(0, self.daily - day_used) if self.daily else None,
+            "per_minute_limit": self.per_minute,
+            "per_minute_remaining": max(0, self.per_minute - minute_used) if self.per_minute else None
+        }
+
+
+_quotas: Dict[str, ProviderQuota] = {}
+
+
+def get_quota(provider: str) -> Optional[ProviderQuota]:
+    """Cota configurada do provedor, ou None se ele não tem limite"""
+    quota = _quotas.get(provider)
+    if quota is None:
+        limits = settings.api_quotas.get(provider)
+        if not limits:
+            return None
+        quota = ProviderQuota(provider, **limits)
+        _quotas[provider] = quota
+    return quota
+
+
+async def quotas_status() -> Dict[str, Dict[str, Any]]:
+    status = {}
+    for provider in settings.api_quotas:
+        quota = get_quota(provider)
+        if quota:
+            status[provider] = await quota.status()
+    return status
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import math
+import random
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.core.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_URL_HEADER = "X-Upstream-URL"
+
+# Parâmetros com credenciais: não entram na chave nem nas fixtures
+SECRET_PARAMS = {"apikey", "api_key", "appid", "key", "token"}
+
+# Headers que descrevem a codificação do corpo original, já decodificado
+DROPPED_HEADERS = {
+    "content-encoding", "content-length", "transfer-encoding", "connection",
+    "keep-alive", "set-cookie"
+}
+
+
+def _resolve_provider(url: httpx.URL) -> str:
+    for name, base_url in settings.api_endpoints.items():
+        if str(url).startswith(base_url):
+            return name
+    return url.host or "unknown"
+
+
+def _public_url(url: httpx.URL) -> str:
+    params = sorted(
+        (k, v) for k, v in url.params.multi_items() if k.lower() not in SECRET_PARAMS
+    )
+    return str(url.copy_with(query=None).copy_merge_params(params))
+
+
+class FixtureStore:
+    """
+    Respostas gravadas do upstream, uma por arquivo JSON.
+
+    Os arquivos ficam em `<diretório>/<provedor>/<hash>.json`; a chave é o
+    método mais a URL com a query ordenada e sem credenciais, então a
+    mesma chamada casa independentemente da ordem dos parâmetros ou da
+    chave de API usada.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or settings.upstream_fixtures_dir)
+        self._memory: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    @staticmethod
+    def key(method: str, url: httpx.URL) -> str:
+        return f"{method.upper()} {_public_url(url)}"
+
+    def _path(self, provider: str, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()[:20]
+        return self.directory / provider / f"{digest}.json"
+
+    def load(self, provider: str, method: str, url: httpx.URL) -> Optional[Dict[str, Any]]:
+        key = self.key(method, url)
+        if key not in self._memory:
+            path = self._path(provider, key)
+            self._memory[key] = json.loads(path.read_text()) if path.exists() else None
+        return self._memory[key]
+
+    def save(self, provider: str, request: httpx.Request, response: httpx.Response) -> None:
+        key = self.key(request.method, request.url)
+        content = response.content
+        try:
+            body: Dict[str, str] = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode()}
+
+        fixture = {
+            "request": {"method": request.method, "url": _public_url(request.url)},
+            "status_code": response.status_code,
+            "headers": {
+                k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS
+            },
+            "body": body
+        }
+        path = self._path(provider, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(fixture, ensure_ascii=False, indent=2))
+        self._memory[key] = fixture
+        logger.debug(f"Fixture gravada: {key} -> {path}")
+
+
+class ReplayProfile:
+    """
+    Comportamento simulado de um provedor: latência log-normal definida por
+    mediana e p99 (ms), fração de respostas de erro e de timeouts.
+    """
+
+    def __init__(
+        self,
+        median_ms: float = 50.0,
+        p99_ms: float = 250.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        timeout_rate: float = 0.0
+    ):
+        self.mu = math.log(median_ms / 1000)
+        # z(0.99) ≈ 2.326 desvios padrão acima da mediana
+        self.sigma = max(0.0, math.log(p99_ms / median_ms) / 2.326)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+
+    def latency(self, rng: random.Random) -> float:
+        return rng.lognormvariate(self.mu, self.sigma)
+
+
+def get_replay_profile(provider: str) -> ReplayProfile:
+    profiles = settings.upstream_replay_profiles
+    return ReplayProfile(**profiles.get(provider, profiles.get("default", {})))
+
+
+def _fixture_response(
+    fixture: Optional[Dict[str, Any]],
+    request: httpx.Request
+) -> httpx.Response:
+    if fixture is None:
+        logger.warning(f"Sem fixture para {request.method} {_public_url(request.url)}")
+        return httpx.Response(
+            404,
+            headers={"X-Replay-Miss": "1"},
+            json={"error": "Fixture não encontrada"},
+            request=request
+        )
+
+    headers = fixture["headers"]
+    etag = headers.get("etag")
+    if etag and request.headers.get("if-none-match") == etag:
+        return httpx.Response(304, headers=headers, request=request)
+
+    body = fixture["body"]
+    content = (
+        body["text"].encode("utf-8") if "text" in body else base64.b64decode(body["base64"])
+    )
+    return httpx.Response(
+        fixture["status_code"], headers=headers, content=content, request=request
+    )
+
+
+async def simulate(
+    provider: str,
+    fixture: Optional[Dict[str, Any]],
+    request: httpx.Request,
+    rng: random.Random
+) -> httpx.Response:
+    """Aplica latência e falhas do perfil do provedor e devolve a fixture"""
+    profile = get_replay_profile(provider)
+    await asyncio.sleep(profile.latency(rng))
+
+    roll = rng.random()
+    if roll < profile.timeout_rate:
+        raise httpx.ReadTimeout("Timeout simulado pelo replay", request=request)
+    if roll < profile.timeout_rate + profile.error_rate:
+        return httpx.Response(
+            profile.error_status, json={"error": "Falha simulada pelo replay"}, request=request
+        )
+    return _fixture_response(fixture, request)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transporte que repassa ao upstream real e grava cada resposta"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, store: FixtureStore):
+        self._transport = transport
+        self._store = store
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        if request.method.upper() != "GET" or response.status_code == 304:
+            return response
+
+        content = await response.aread()
+        await response.aclose()
+        recorded = httpx.Response(
+            response.status_code,
+            headers={
+                k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS
+            },
+            content=content,
+            request=request
+        )
+        self._store.save(_resolve_provider(request.url), request, recorded)
+        return recorded
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte que nunca acessa a rede externa.
+
+    Sem `server_url` as fixtures são servidas no próprio processo; com ele,
+    cada requisição vai ao servidor substituto local (pelo `transport`
+    interno, com pool e conexões reais) levando a URL original no header
+    `X-Upstream-URL`.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        server_url: Optional[str] = None,
+        seed: Optional[int] = None
+    ):
+        self._store = store
+        self._transport = transport
+        self._server_url = httpx.URL(server_url) if server_url else None
+        self._rng = random.Random(seed)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._server_url is not None and self._transport is not None:
+            request.headers[UPSTREAM_URL_HEADER] = str(request.url)
+            request.url = self._server_url.copy_with(
+                path=f"/{_resolve_provider(request.url)}{request.url.path}"
+            )
+            return await self._transport.handle_async_request(request)
+
+        provider = _resolve_provider(request.url)
+        fixture = self._store.load(provider, request.method, request.url)
+        return await simulate(provider, fixture, request, self._rng)
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+
+
+def wrap_transport(transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    """Aplica o modo de upstream configurado (live, record ou replay)"""
+    mode = settings.upstream_mode.lower()
+    if mode == "record":
+        return RecordingTransport(transport, FixtureStore())
+    if mode == "replay":
+        return ReplayTransport(
+            FixtureStore(),
+            transport=transport,
+            server_url=settings.upstream_replay_url,
+            seed=settings.upstream_replay_seed
+        )
+    return transport
+
+
+def create_replay_app(store: Optional[FixtureStore] = None, seed: Optional[int] = None):
+    """Servidor substituto dos upstreams, servindo as fixtures gravadas"""
+    from fastapi import FastAPI, Request, Response
+
+    store = store or FixtureStore()
+    rng = random.Random(seed)
+    app = FastAPI(title="Nexus upstream replay", docs_url=None, redoc_url=None)
+
+    @app.api_route("/{provider}/{path:path}", methods=["GET", "HEAD", "POST"])
+    async def replay(provider: str, path: str, request: Request):
+        url = httpx.URL(request.headers.get(UPSTREAM_URL_HEADER) or str(request.url))
+        upstream_request = httpx.Request(request.method, url, headers=request.headers.raw)
+        fixture = store.load(provider, "GET" if request.method == "HEAD" else request.method, url)
+        try:
+            response = await simulate(provider, fixture, upstream_request, rng)
+        except httpx.TimeoutException:
+            # Simula o upstream pendurado: o cliente é quem desiste
+            await asyncio.sleep(settings.http_timeout)
+            return Response(status_code=504)
+        return Response(
+            content=response.content if request.method != "HEAD" else b"",
+            status_code=response.status_code,
+            headers={
+                k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS
+            }
+        )
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Servidor substituto dos upstreams")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--fixtures", default=settings.upstream_fixtures_dir)
+    parser.add_argument("--seed", type=int, default=settings.upstream_replay_seed)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_replay_app(FixtureStore(args.fixtures), args.seed),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
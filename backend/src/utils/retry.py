@@ -0,0 +1,143 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+from src.core.settings import settings
+
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    # Conexão keep-alive fechada pelo servidor antes da resposta
+    httpx.RemoteProtocolError,
+)
+
+
+class RetryPolicy:
+    """
+    Decide se uma falha deve ser repetida e quanto esperar.
+
+    Só repete métodos idempotentes com falhas transitórias (conexão,
+    timeout, 429 e 502-504). O atraso usa backoff com "decorrelated
+    jitter" e respeita o header Retry-After quando presente. Subclasses
+    podem sobrescrever `should_retry` e `next_delay`.
+    """
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ):
+        self.max_retries = settings.max_retries if max_retries is None else max_retries
+        self.base_delay = base_delay or settings.retry_base_delay
+        self.max_delay = max_delay or settings.retry_max_delay
+
+    def should_retry(self, method: str, error: Exception) -> bool:
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, RETRYABLE_EXCEPTIONS)
+
+    def next_delay(
+        self,
+        previous_delay: Optional[float],
+        error: Exception
+    ) -> Optional[float]:
+        """Atraso até a próxima tentativa, ou None se não vale esperar"""
+        retry_after = self.retry_after(error)
+        if retry_after is not None:
+            # O provedor pediu para esperar mais do que aceitamos: desiste
+            return retry_after if retry_after <= self.max_delay else None
+
+        previous = previous_delay or self.base_delay
+        return min(self.max_delay, random.uniform(self.base_delay, previous * 3))
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        if not isinstance(error, httpx.HTTPStatusError):
+            return None
+        value = error.response.headers.get("retry-after")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def reason(error: Exception) -> str:
+        if isinstance(error, httpx.HTTPStatusError):
+            return str(error.response.status_code)
+        return type(error).__name__
+
+
+class RetryBudget:
+    """
+    Token bucket que limita retries a uma fração do tráfego do provedor.
+
+    Cada requisição deposita `ratio` tokens e cada retry consome um. Um
+    piso de `min_per_second` garante alguns retries com tráfego baixo.
+    """
+
+    def __init__(
+        self,
+        ratio: Optional[float] = None,
+        min_per_second: Optional[float] = None
+    ):
+        self.ratio = settings.retry_budget_ratio if ratio is None else ratio
+        self.min_per_second = (
+            settings.retry_budget_min_per_second if min_per_second is None else min_per_second
+        )
+        # Permite uma rajada de até 10s de retries do piso mínimo
+        self.capacity = max(1.0, self.min_per_second * 10)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self.min_per_second
+        )
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+default_retry_policy = RetryPolicy()
+
+_budgets: Dict[str, RetryBudget] = {}
+
+
+def get_retry_budget(provider: str) -> RetryBudget:
+    budget = _budgets.get(provider)
+    if budget is None:
+        budget = RetryBudget()
+        _budgets[provider] = budget
+    return budget
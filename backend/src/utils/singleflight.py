@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from src.utils.deadline import deadline_context
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.shared = 0
+
+
+class SingleFlight:
+    """
+    Coalesce chamadas concorrentes com a mesma chave em uma única execução.
+
+    O líder executa a função em uma task separada; os demais chamadores
+    aguardam a mesma task e recebem o mesmo resultado ou exceção. A task
+    só é cancelada quando todos os chamadores desistem dela.
+
+    A task roda num contexto vazio que carrega só o prazo do líder: os
+    timeouts e retries do upstream seguem esse prazo, mas a política de
+    cache e demais contextvars do líder não vazam para os seguidores.
+    Cada chamador continua limitado pelo próprio prazo (o timeout dele
+    cancela só a sua espera, protegida pelo shield).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool, int]:
+        """
+        Retorna (resultado, compartilhado, seguidores).
+
+        `compartilhado` indica se o chamador reutilizou uma execução já em
+        andamento; `seguidores` é o número de chamadores extras que o líder
+        atendeu (só preenchido para o líder).
+        """
+        call = self._calls.get(key)
+        is_leader = call is None
+
+        if is_leader:
+            call = _Call(asyncio.get_running_loop().create_task(
+                func(), context=deadline_context()
+            ))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            call.shared += 1
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+            raise
+        call.waiters -= 1
+
+        return result, not is_leader, call.shared if is_leader else 0
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if call.task.cancelled():
+            return
+        if call.task.exception() is not None and call.waiters == 0:
+            # Evita "Task exception was never retrieved" quando ninguém aguardava
+            logger.debug(f"Requisição coalescida falhou sem aguardadores: {key}")
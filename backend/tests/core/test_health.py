@@ -0,0 +1,40 @@
+import httpx
+import pytest
+
+from src.core import config
+from src.core.config import create_app
+
+
+@pytest.fixture
+def client():
+    # ASGITransport não roda o lifespan: sem Redis nem aquecimento real
+    transport = httpx.ASGITransport(app=create_app())
+    return httpx.AsyncClient(transport=transport, base_url="http://localhost")
+
+
+async def test_ready_responde_503_durante_o_aquecimento(client, monkeypatch):
+    monkeypatch.setitem(config.http_warmup, "done", False)
+
+    response = await client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+
+async def test_ready_responde_200_apos_o_aquecimento(client, monkeypatch):
+    monkeypatch.setitem(config.http_warmup, "done", True)
+
+    response = await client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+async def test_health_continua_200_durante_o_aquecimento(client, monkeypatch):
+    monkeypatch.setitem(config.http_warmup, "done", False)
+    monkeypatch.setattr(config, "redis_client", None)
+
+    response = await client.get("/health")
+
+    assert response.status_code == 200
+    assert response.json()["ready"] is False
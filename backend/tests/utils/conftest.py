@@ -0,0 +1,35 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import config
+from src.core.settings import settings
+from src.utils import cache as cache_module
+from src.utils.local_cache import fallback_cache, local_cache
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Cache sem Redis: as entradas ficam no L1 e no cache local de fallback"""
+    monkeypatch.setattr(config, "redis_client", None)
+    monkeypatch.setattr(settings, "cache_enabled", True)
+    monkeypatch.setattr(settings, "redis_fallback_enabled", True)
+    local_cache.clear()
+    fallback_cache.clear()
+    yield
+    local_cache.clear()
+    fallback_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio de parede do módulo de cache, avançado manualmente"""
+    state = SimpleNamespace(now=time.time())
+    fake = SimpleNamespace(
+        time=lambda: state.now,
+        perf_counter=time.perf_counter,
+        monotonic=time.monotonic
+    )
+    monkeypatch.setattr(cache_module, "time", fake)
+    return state
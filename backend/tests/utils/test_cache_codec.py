@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from src.core.settings import settings
+from src.utils import cache_codec
+from src.utils.cache_codec import (
+    COMPRESSION_LZ4,
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    MAGIC,
+    SERIALIZER_JSON,
+    SERIALIZER_MSGPACK,
+    decode,
+    encode,
+)
+
+SMALL = {"city": "São Paulo", "temp": 21.5, "tags": ["a", "b"], "ok": True, "none": None}
+LARGE = {"items": [{"id": i, "name": f"país {i}", "region": "Americas"} for i in range(200)]}
+
+
+def header(stored: bytes):
+    return stored[:len(MAGIC)], stored[len(MAGIC)], stored[len(MAGIC) + 1]
+
+
+@pytest.fixture(autouse=True)
+def codec_settings(monkeypatch):
+    monkeypatch.setattr(settings, "cache_binary_codec", True)
+    monkeypatch.setattr(settings, "cache_serializer", "json")
+    monkeypatch.setattr(settings, "cache_compression", "none")
+    monkeypatch.setattr(settings, "cache_compression_min_bytes", 1024)
+
+
+def test_valor_pequeno_nao_e_comprimido(monkeypatch):
+    monkeypatch.setattr(settings, "cache_compression", "zstd")
+    stored, raw_size = encode(SMALL)
+
+    assert header(stored) == (MAGIC, SERIALIZER_JSON, COMPRESSION_NONE)
+    assert decode(stored) == (SMALL, raw_size)
+
+
+@pytest.mark.parametrize("compression, module, expected", [
+    ("zstd", "zstandard", COMPRESSION_ZSTD),
+    ("lz4", "lz4.frame", COMPRESSION_LZ4),
+])
+def test_ida_e_volta_comprimido(monkeypatch, compression, module, expected):
+    pytest.importorskip(module)
+    monkeypatch.setattr(settings, "cache_compression", compression)
+    stored, raw_size = encode(LARGE)
+
+    assert header(stored) == (MAGIC, SERIALIZER_JSON, expected)
+    assert len(stored) < raw_size
+    assert decode(stored) == (LARGE, raw_size)
+
+
+def test_ida_e_volta_msgpack(monkeypatch):
+    pytest.importorskip("msgpack")
+    monkeypatch.setattr(settings, "cache_serializer", "msgpack")
+    stored, _ = encode(SMALL)
+
+    assert header(stored)[1] == SERIALIZER_MSGPACK
+    assert decode(stored)[0] == SMALL
+
+
+@pytest.mark.parametrize("legacy", [json.dumps(SMALL), json.dumps(SMALL).encode()])
+def test_le_valor_antigo_em_json(legacy):
+    assert decode(legacy)[0] == SMALL
+
+
+def test_codec_desligado_grava_json_legivel(monkeypatch):
+    monkeypatch.setattr(settings, "cache_binary_codec", False)
+    stored, _ = encode(SMALL)
+
+    assert not stored.startswith(MAGIC)
+    assert json.loads(stored) == SMALL
+    assert decode(stored)[0] == SMALL
+
+
+def test_compressao_sem_pacote_cai_para_lz4_ou_nada(monkeypatch):
+    monkeypatch.setattr(settings, "cache_compression", "zstd")
+    monkeypatch.setattr(cache_codec, "zstandard", None)
+    monkeypatch.setattr(cache_codec, "lz4_frame", None)
+    stored, raw_size = encode(LARGE)
+
+    assert header(stored)[2] == COMPRESSION_NONE
+    assert decode(stored) == (LARGE, raw_size)
@@ -0,0 +1,60 @@
+from src.utils.cache import build_cache_key, cache_namespace
+from src.utils.local_cache import key_namespace, metric_namespace
+
+
+class Service:
+    async def lookup(self, code: str, lang: str = "pt"):
+        return code
+
+
+def test_chave_e_namespace_usam_o_mesmo_nome():
+    key = build_cache_key(Service.lookup, "", (Service(), "br"), {})
+    assert key_namespace(key) == cache_namespace(Service.lookup) == "Service.lookup"
+
+
+def test_posicional_nomeado_e_padrao_geram_a_mesma_chave():
+    service = Service()
+    assert (
+        build_cache_key(Service.lookup, "x", (service, "br"), {})
+        == build_cache_key(Service.lookup, "x", (service,), {"code": "br", "lang": "pt"})
+    )
+
+
+def test_prefixo_define_o_namespace():
+    key = build_cache_key(Service.lookup, "lookup_ns", (Service(), "br"), {})
+    assert key_namespace(key) == "lookup_ns"
+
+
+def test_chave_do_cache_http_carrega_o_provedor():
+    from src.core.settings import settings
+    from src.utils.http_client import HTTPClient
+
+    key = HTTPClient()._generate_cache_key(
+        "GET", f"{settings.api_endpoints['weather']}/weather", {"q": "Recife"}
+    )
+    assert key_namespace(key) == "http_cache"
+    assert metric_namespace(key) == "http:weather"
+    assert metric_namespace(build_cache_key(Service.lookup, "", (Service(), "br"), {})) == "Service.lookup"
+
+
+async def test_metricas_do_cache_http_separadas_por_provedor(memory_cache):
+    from prometheus_client import REGISTRY
+
+    from src.core.settings import settings
+    from src.utils.cache import CacheManager
+    from src.utils.http_client import HTTPClient
+
+    def misses(namespace: str) -> float:
+        return REGISTRY.get_sample_value(
+            "nexus_cache_lookups_total", {"namespace": namespace, "tier": "l1", "result": "miss"}
+        ) or 0.0
+
+    client = HTTPClient()
+    before = {provider: misses(f"http:{provider}") for provider in ("news", "worldbank")}
+    for provider in before:
+        await CacheManager.get(client._generate_cache_key(
+            "GET", f"{settings.api_endpoints[provider]}/metrics-test"
+        ))
+
+    assert misses("http:news") == before["news"] + 1
+    assert misses("http:worldbank") == before["worldbank"] + 1
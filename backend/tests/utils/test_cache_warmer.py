@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from src.core.settings import settings
+from src.utils import quota as quota_module
+from src.utils.cache_warmer import CacheWarmer, WarmTarget, default_targets
+from src.utils.quota import get_quota
+
+
+def test_alvos_sem_cache_sao_ignorados(monkeypatch):
+    from src.api.v1.services.worldbank_service import worldbank_service
+
+    async def get_economic_indicator(country, indicator):
+        return {"success": True}
+
+    monkeypatch.setattr(settings, "cache_warm_weather_cities", [])
+    monkeypatch.setattr(settings, "cache_warm_news_headlines", [])
+    monkeypatch.setattr(settings, "cache_warm_worldbank_countries", ["BR"])
+    monkeypatch.setattr(worldbank_service, "get_economic_indicator", get_economic_indicator)
+
+    targets = default_targets()
+    assert [target.name for target in targets] == ["countries_all"]
+    assert targets[0].ttl
+
+
+@pytest.fixture
+def quotas(monkeypatch, memory_cache):
+    monkeypatch.setattr(quota_module, "_quotas", {})
+    monkeypatch.setattr(settings, "api_quotas", {"keyed": {"daily": 100, "per_minute": None}})
+    monkeypatch.setattr(settings, "cache_warm_rate_per_minute", 6000)
+
+
+def make_target(name: str, provider: str, calls: list) -> WarmTarget:
+    async def call():
+        calls.append(name)
+        return {"success": True}
+    return WarmTarget(name, provider, 60, call)
+
+
+async def test_provedor_com_cota_baixa_nao_e_aquecido(quotas):
+    calls = []
+    warmer = CacheWarmer([make_target("keyed", "keyed", calls), make_target("free", "free", calls)])
+    quota = get_quota("keyed")
+    day_key, _ = quota._keys(time.time())
+    quota._local[day_key] = 60
+
+    assert await warmer.run_once() == 1
+    assert calls == ["free"]
+
+
+async def test_cota_alonga_o_intervalo_de_renovacao(quotas):
+    calls = []
+    keyed = make_target("keyed", "keyed", calls)
+    free = make_target("free", "free", calls)
+    warmer = CacheWarmer([keyed, free])
+
+    assert await warmer.run_once() == 2
+    # 20% de 100 chamadas por dia: uma renovação a cada 4320s, não a cada 48s
+    assert warmer._refresh_interval(keyed) == pytest.approx(4320)
+    assert warmer._refresh_interval(free) == pytest.approx(48)
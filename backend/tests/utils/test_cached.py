@@ -0,0 +1,161 @@
+from src.utils.cache import cached
+
+
+async def test_falha_devolvida_pelo_servico_serve_o_valor_vencido(memory_cache, clock):
+    responses = [
+        {"success": True, "value": 1},
+        {"success": False, "error": "upstream fora do ar"},
+        {"success": False, "error": "upstream fora do ar"},
+    ]
+
+    @cached(ttl=60, key_prefix="test_stale_if_error", stale_while_revalidate=0, stale_if_error=600)
+    async def fetch(code: str):
+        return responses.pop(0)
+
+    assert await fetch("a") == {"success": True, "value": 1}
+
+    clock.now += 120
+    stale = await fetch("a")
+    assert stale["value"] == 1
+    assert stale["cache_info"]["stale"] is True
+    assert stale["cache_info"]["stale_reason"] == "upstream_error"
+
+    clock.now += 600
+    assert await fetch("a") == {"success": False, "error": "upstream fora do ar"}
+
+
+async def test_falha_nao_e_cacheada(memory_cache):
+    calls = 0
+
+    @cached(ttl=60, key_prefix="test_failure_not_cached")
+    async def fetch(code: str):
+        nonlocal calls
+        calls += 1
+        return {"success": False, "error": "falhou"}
+
+    await fetch("a")
+    await fetch("a")
+    assert calls == 2
+
+
+async def test_lote_recalcula_so_os_itens_ausentes(memory_cache, monkeypatch):
+    from src.utils.cache import CacheManager, cached_batch
+
+    lookups = []
+    batches = []
+    original_get_many = CacheManager.get_many
+
+    async def get_many(*args, **kwargs):
+        lookups.append(args)
+        return await original_get_many(*args, **kwargs)
+
+    monkeypatch.setattr(CacheManager, "get_many", get_many)
+
+    @cached(ttl=60, key_prefix="test_batch")
+    async def fetch_one(code: str):
+        return {"success": True, "code": code, "via": "unit"}
+
+    @cached_batch("codes", ttl=60, key_prefix="test_batch", item_key="code")
+    async def fetch_many(codes):
+        batches.append(list(codes))
+        return {code: {"success": True, "code": code, "via": "batch"} for code in codes}
+
+    await fetch_one("a")
+    first = await fetch_many(["a", "b"])
+    assert batches == [["b"]]
+    assert first["a"]["via"] == "unit"
+    assert first["b"]["via"] == "batch"
+    assert len(lookups) == 1
+
+    second = await fetch_many(["a", "b", "c"])
+    assert batches == [["b"], ["c"]]
+    assert list(second) == ["a", "b", "c"]
+    assert len(lookups) == 2
+
+    # A versão unitária lê a entrada gravada pelo lote
+    assert (await fetch_one("c"))["via"] == "batch"
+
+
+async def test_lote_nao_cacheia_itens_omitidos(memory_cache):
+    from src.utils.cache import cached_batch
+
+    batches = []
+
+    @cached_batch("codes", ttl=60, key_prefix="test_batch_missing", item_key="code")
+    async def fetch_many(codes):
+        batches.append(list(codes))
+        return {code: {"success": True, "code": code} for code in codes if code != "b"}
+
+    assert list(await fetch_many(["a", "b"])) == ["a"]
+    assert list(await fetch_many(["a", "b"])) == ["a"]
+    assert batches == [["a", "b"], ["b"]]
+
+
+async def test_nao_encontrado_fica_no_cache_pelo_ttl_negativo(memory_cache, clock):
+    calls = 0
+
+    @cached(ttl=3600, key_prefix="test_negative", negative_ttl=30, stale_if_error=600)
+    async def fetch(code: str):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return {"success": False, "error": "não encontrado", "not_found": True}
+        return {"success": False, "error": "upstream fora do ar"}
+
+    first = await fetch("a")
+    assert first["not_found"] is True
+
+    clock.now += 20
+    assert await fetch("a") == first
+    assert calls == 1
+
+    # Vencido o TTL negativo, recalcula e nunca serve o "não encontrado" vencido
+    clock.now += 20
+    assert await fetch("a") == {"success": False, "error": "upstream fora do ar"}
+    assert calls == 2
+
+
+async def test_lote_usa_o_ttl_negativo_por_item(memory_cache, clock):
+    from src.utils.cache import cached_batch
+
+    batches = []
+
+    @cached_batch("codes", ttl=3600, key_prefix="test_negative_batch", item_key="code", negative_ttl=30)
+    async def fetch_many(codes):
+        batches.append(list(codes))
+        return {
+            code: {"success": False, "not_found": True} if code == "b" else {"success": True}
+            for code in codes
+        }
+
+    await fetch_many(["a", "b"])
+    clock.now += 20
+    await fetch_many(["a", "b"])
+    assert batches == [["a", "b"]]
+
+    clock.now += 20
+    assert (await fetch_many(["a", "b"]))["b"]["not_found"] is True
+    assert batches == [["a", "b"], ["b"]]
+
+
+async def test_cota_esgotada_no_clima_serve_o_valor_vencido(memory_cache, clock):
+    from src.core.settings import settings
+    from src.utils.http_client import HTTPException
+
+    calls = 0
+
+    @cached(ttl=1800, key_prefix="weather_current")
+    async def fetch(city: str):
+        nonlocal calls
+        calls += 1
+        if calls > 1:
+            raise HTTPException(status_code=429, detail={"message": "cota esgotada"})
+        return {"temperature": 25}
+
+    await fetch("test-quota-city")
+
+    # Vencido além do stale-if-error padrão, mas dentro da janela das APIs com cota
+    clock.now += 1800 + settings.cache_stale_if_error + 60
+    stale = await fetch("test-quota-city")
+    assert stale["temperature"] == 25
+    assert stale["cache_info"]["stale_reason"] == "upstream_error"
@@ -0,0 +1,106 @@
+import httpx
+import pytest
+
+from src.utils import circuit_breaker as cb_module
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.http_client import HTTPClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cb_module.time, "monotonic", fake)
+    return fake
+
+
+def make_breaker(**overrides) -> CircuitBreaker:
+    params = dict(failure_rate=0.5, min_requests=4, window=60, open_seconds=30, half_open_probes=1)
+    params.update(overrides)
+    return CircuitBreaker("test", **params)
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.min_requests):
+        breaker.before_request()
+        breaker.record_failure()
+
+
+def test_abre_ao_passar_da_taxa_de_falhas(clock):
+    breaker = make_breaker()
+    for ok in (True, False, True):
+        breaker.before_request()
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_meio_aberto_fecha_com_sonda_bem_sucedida(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+
+    clock.now += 31
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        # Só uma sonda por vez
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_meio_aberto_reabre_com_sonda_falha(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+
+    clock.now += 31
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_release_devolve_a_sonda(clock):
+    breaker = make_breaker()
+    open_breaker(breaker)
+
+    clock.now += 31
+    breaker.before_request()
+    breaker.release()
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+async def test_erro_inesperado_libera_a_sonda(clock):
+    def handler(request):
+        raise RuntimeError("falha fora do httpx")
+
+    breaker = make_breaker()
+    open_breaker(breaker)
+    clock.now += 31
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(RuntimeError):
+            await HTTPClient(client)._attempt(
+                "GET", "http://upstream.test/x", "upstream", False, breaker, None
+            )
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
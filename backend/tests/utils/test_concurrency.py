@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from src.utils.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+
+
+def make_limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    params = dict(initial_limit=1, min_limit=1, max_limit=10, queue_timeout=1.0)
+    params.update(overrides)
+    return AdaptiveConcurrencyLimiter("test", **params)
+
+
+async def test_fila_rejeita_apos_o_timeout():
+    limiter = make_limiter()
+    await limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await limiter.acquire(timeout=0.01)
+
+    assert limiter.in_flight == 1
+    assert limiter.snapshot()["queued"] == 0
+
+
+async def test_vaga_liberada_passa_para_a_fila():
+    limiter = make_limiter()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release(0.01)
+    await waiter
+
+    assert limiter.in_flight == 1
+
+
+async def test_cancelar_depois_de_receber_a_vaga_devolve_a_vaga():
+    limiter = make_limiter()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # A vaga é entregue e o chamador é cancelado antes de retomar
+    limiter.release(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert limiter.in_flight == 0
+    await limiter.acquire(timeout=0.01)
+    assert limiter.in_flight == 1
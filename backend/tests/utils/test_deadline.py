@@ -0,0 +1,36 @@
+import pytest
+
+from src.core.settings import settings
+from src.utils.deadline import route_budget
+
+
+@pytest.fixture(autouse=True)
+def deadlines(monkeypatch):
+    monkeypatch.setattr(settings, "request_deadline_default", 25.0)
+    monkeypatch.setattr(settings, "request_deadline_max", 60.0)
+    monkeypatch.setattr(settings, "request_deadlines", {"/api/v1/cep": 10.0})
+
+
+def test_prazo_padrao_e_da_rota():
+    assert route_budget("/api/v1/weather/current") == 25.0
+    assert route_budget("/api/v1/cep/01001000") == 10.0
+
+
+def test_header_reduz_o_prazo():
+    assert route_budget("/api/v1/weather/current", "5") == 5.0
+    assert route_budget("/api/v1/cep/01001000", "2.5") == 2.5
+
+
+def test_header_nao_aumenta_o_prazo_da_rota():
+    assert route_budget("/api/v1/cep/01001000", "30") == 10.0
+    assert route_budget("/api/v1/weather/current", "600") == 25.0
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "-1", "0", "abc", ""])
+def test_header_invalido_e_ignorado(value):
+    assert route_budget("/api/v1/cep/01001000", value) == 10.0
+
+
+def test_prazo_da_rota_respeita_o_maximo(monkeypatch):
+    monkeypatch.setattr(settings, "request_deadline_max", 8.0)
+    assert route_budget("/api/v1/cep/01001000") == 8.0
@@ -0,0 +1,207 @@
+import asyncio
+import sys
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.settings import settings
+from src.utils import hedging as hedging_module
+from src.utils.hedging import Hedger, get_hedger
+
+
+class FakeResponse:
+    def __init__(self, name: str):
+        self.name = name
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def primed(hedger: Hedger, latency: float = 0.01, samples: int = 0) -> Hedger:
+    for _ in range(max(samples, settings.hedge_min_samples)):
+        hedger.latencies.observe(latency)
+    return hedger
+
+
+@pytest.fixture
+def hedgers(monkeypatch):
+    monkeypatch.setattr(hedging_module, "_hedgers", {})
+    monkeypatch.setattr(settings, "hedge_min_delay", 0.01)
+
+
+async def test_resposta_perdedora_e_fechada(hedgers):
+    hedger = primed(Hedger("test"))
+    responses = []
+    release = asyncio.Event()
+
+    async def send():
+        response = FakeResponse(f"r{len(responses)}")
+        responses.append(response)
+        if response.name == "r0":
+            await release.wait()
+        return response
+
+    winner = await hedger.run(send)
+    assert winner.name == "r1"
+    assert not winner.closed
+    # A original foi cancelada antes de responder
+    assert len(responses) == 2
+
+
+async def test_perdedora_que_responde_junto_e_fechada(hedgers):
+    hedger = primed(Hedger("test"))
+    responses = []
+    gate = asyncio.Event()
+
+    async def send():
+        response = FakeResponse(f"r{len(responses)}")
+        responses.append(response)
+        if response.name == "r0":
+            await gate.wait()
+        else:
+            gate.set()
+        return response
+
+    winner = await hedger.run(send)
+    loser, = [response for response in responses if response is not winner]
+    assert loser.closed
+    assert not winner.closed
+
+
+@pytest.fixture
+def slow_first_upstream(monkeypatch, memory_cache, hedgers):
+    """Pool HTTP em que a primeira requisição demora e a segunda responde na hora"""
+    monkeypatch.setattr(settings, "circuit_breaker_enabled", False)
+    monkeypatch.setattr(settings, "concurrency_limit_enabled", False)
+    requests = []
+    bodies = {}
+
+    async def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=bodies[request.url.path])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    http_client_module = sys.modules["src.utils.http_client"]
+    monkeypatch.setattr(http_client_module, "get_http_pool", lambda url: client)
+    yield requests, bodies
+
+
+async def test_indicador_do_world_bank_usa_hedging(slow_first_upstream):
+    from src.api.v1.services.worldbank_service import worldbank_service
+
+    requests, bodies = slow_first_upstream
+    bodies["/v2/country/br/indicator/SP.POP.TOTL"] = [
+        {"total": 1},
+        [{"date": "2020", "value": 212, "country": {"value": "Brasil"},
+          "countryiso3code": "BRA", "indicator": {"value": "População"}}]
+    ]
+    primed(get_hedger("worldbank"))
+
+    result = await worldbank_service.get_economic_indicator("br", "SP.POP.TOTL")
+
+    assert result["success"] is True
+    assert result["data"][0]["value"] == 212
+    assert len(requests) == 2
+
+
+async def test_busca_do_open_library_usa_hedging(slow_first_upstream):
+    from src.api.v1.services.openlibrary_service import openlibrary_service
+
+    requests, bodies = slow_first_upstream
+    bodies["/search.json"] = {"numFound": 1, "start": 0, "docs": [{"title": "Dom Casmurro"}]}
+    primed(get_hedger("openlibrary"))
+
+    result = await openlibrary_service.search_books("dom casmurro")
+
+    assert result["success"] is True
+    assert len(requests) == 2
+
+
+def sample(name: str, provider: str) -> float:
+    return REGISTRY.get_sample_value(name, {"provider": provider}) or 0.0
+
+
+async def test_vitoria_do_hedge_e_contada(hedgers):
+    hedger = primed(Hedger("test-wins"))
+    calls = 0
+
+    async def send():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(5)
+        return FakeResponse(f"r{calls}")
+
+    await hedger.run(send)
+
+    assert sample("nexus_upstream_hedged_requests_total", "test-wins") == 1
+    assert sample("nexus_upstream_hedge_wins_total", "test-wins") == 1
+    assert sample("nexus_upstream_hedge_cancelled_total", "test-wins") == 1
+
+
+async def test_original_que_vence_o_hedge_nao_conta_vitoria(hedgers):
+    hedger = primed(Hedger("test-primary"))
+    calls = 0
+
+    async def send():
+        nonlocal calls
+        calls += 1
+        name = f"r{calls}"
+        await asyncio.sleep(0.05 if name == "r1" else 5)
+        return FakeResponse(name)
+
+    assert (await hedger.run(send)).name == "r1"
+
+    assert sample("nexus_upstream_hedged_requests_total", "test-primary") == 1
+    assert sample("nexus_upstream_hedge_wins_total", "test-primary") == 0
+    assert sample("nexus_upstream_hedge_cancelled_total", "test-primary") == 1
+
+
+async def test_hedges_limitados_a_max_ratio(hedgers):
+    # Janela cheia de respostas rápidas: as lentas não sobem o atraso do hedge
+    hedger = primed(Hedger("test-cap", quantile=0.5, max_ratio=0.1), latency=0.001, samples=200)
+    copies = []
+
+    async def send():
+        copies.append(None)
+        if len(copies) == 1:
+            await asyncio.sleep(0.03)
+        return FakeResponse(f"r{len(copies)}")
+
+    for _ in range(50):
+        copies.clear()
+        await hedger.run(send)
+
+    hedges = sample("nexus_upstream_hedged_requests_total", "test-cap")
+    # Um token inicial mais 0.1 por requisição
+    assert 5 <= hedges <= 6
+    assert sample("nexus_upstream_hedge_wins_total", "test-cap") == hedges
+
+
+async def test_perdedora_do_hedge_nao_conta_como_desistencia(monkeypatch, hedgers):
+    from src.utils.http_client import HTTPClient
+
+    monkeypatch.setattr(settings, "hedge_policies", {"hedge.test": {"quantile": 0.95}})
+    primed(get_hedger("hedge.test"))
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"ok": True})
+
+    before = sample("nexus_upstream_cancelled_total", "hedge.test")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        response = await HTTPClient(client)._hedged_attempt(
+            "GET", "http://hedge.test/x", "hedge.test", False, None, None
+        )
+
+    assert response.json() == {"ok": True}
+    assert sample("nexus_upstream_hedge_cancelled_total", "hedge.test") == 1
+    assert sample("nexus_upstream_cancelled_total", "hedge.test") == before
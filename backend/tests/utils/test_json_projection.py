@@ -0,0 +1,145 @@
+import json
+
+import httpx
+import pytest
+
+from src.utils import json_projection as projection_module
+from src.utils.json_projection import JSONProjection
+
+
+SEARCH = {
+    "numFound": 2,
+    "start": 0,
+    "q": "machado",
+    "docs": [
+        {
+            "title": "Dom Casmurro",
+            "author_name": ["Machado de Assis"],
+            "isbn": ["8535910689", "9788535910681"],
+            "ratings_average": 4.25,
+            "edition_key": ["OL1M", "OL2M"],
+            "ia": {"collection": ["a", "b"]}
+        },
+        {"title": "Memórias Póstumas", "author_name": [], "cover_i": None, "extra": {"x": 1}}
+    ]
+}
+
+INDICATOR = [
+    {"page": 1, "pages": 1, "per_page": 100, "total": 2},
+    [
+        {
+            "indicator": {"id": "SP.POP.TOTL", "value": "População"},
+            "country": {"id": "BR", "value": "Brasil"},
+            "countryiso3code": "BRA",
+            "date": "2022",
+            "value": 215313498,
+            "decimal": 0
+        },
+        {
+            "indicator": {"id": "SP.POP.TOTL", "value": "População"},
+            "country": {"id": "BR", "value": "Brasil"},
+            "countryiso3code": "BRA",
+            "date": "2021",
+            "value": None,
+            "decimal": 0
+        }
+    ]
+]
+
+COUNTRIES = [
+    {
+        "name": {"common": "Brasil", "official": "República Federativa do Brasil",
+                 "nativeName": {"por": {"common": "Brasil"}}},
+        "capital": ["Brasília"],
+        "currencies": {"BRL": {"name": "Real", "symbol": "R$"}},
+        "translations": {"ita": {"common": "Brasile"}},
+        "latlng": [-10.0, -55.0]
+    }
+]
+
+SEARCH_PROJECTION = JSONProjection([
+    "numFound", "start", "docs.item.title", "docs.item.author_name",
+    "docs.item.isbn", "docs.item.ratings_average", "docs.item.cover_i"
+])
+INDICATOR_PROJECTION = JSONProjection([
+    "item.total", "item.item.date", "item.item.value",
+    "item.item.country.value", "item.item.countryiso3code", "item.item.indicator.value"
+])
+COUNTRIES_PROJECTION = JSONProjection(["item.name.common", "item.capital", "item.currencies"])
+
+CASES = [
+    (SEARCH_PROJECTION, SEARCH),
+    (INDICATOR_PROJECTION, INDICATOR),
+    (COUNTRIES_PROJECTION, COUNTRIES),
+    (INDICATOR_PROJECTION, [{"page": 1, "total": 0}, None]),
+    (INDICATOR_PROJECTION, [{"message": [{"id": "120", "value": "Invalid value"}]}]),
+    (SEARCH_PROJECTION, {"numFound": 0, "docs": []}),
+]
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    """Corpo entregue em pedaços pequenos, cortando tokens ao meio"""
+
+    def __init__(self, body: bytes, size: int = 7):
+        self._body = body
+        self._size = size
+
+    async def __aiter__(self):
+        for i in range(0, len(self._body), self._size):
+            yield self._body[i:i + self._size]
+
+
+def streamed(document) -> httpx.Response:
+    body = json.dumps(document, ensure_ascii=False).encode()
+    return httpx.Response(200, stream=ChunkedStream(body))
+
+
+@pytest.mark.parametrize("projection,document", CASES)
+async def test_stream_com_ijson_igual_ao_parse_completo(projection, document):
+    assert projection_module.ijson is not None
+    expected = projection.apply(json.loads(json.dumps(document)))
+    assert await projection.parse_stream(streamed(document)) == expected
+
+
+@pytest.mark.parametrize("projection,document", CASES)
+async def test_stream_sem_ijson_igual_ao_parse_completo(projection, document, monkeypatch):
+    monkeypatch.setattr(projection_module, "ijson", None)
+    expected = projection.apply(json.loads(json.dumps(document)))
+    assert await projection.parse_stream(streamed(document)) == expected
+
+
+async def test_projecao_em_listas_aninhadas():
+    projected = await SEARCH_PROJECTION.parse_stream(streamed(SEARCH))
+    assert projected == {
+        "numFound": 2,
+        "start": 0,
+        "docs": [
+            {
+                "title": "Dom Casmurro",
+                "author_name": ["Machado de Assis"],
+                "isbn": ["8535910689", "9788535910681"],
+                "ratings_average": 4.25
+            },
+            {"title": "Memórias Póstumas", "author_name": [], "cover_i": None}
+        ]
+    }
+
+
+async def test_projecao_de_lista_no_topo_mantem_subarvores():
+    projected = await INDICATOR_PROJECTION.parse_stream(streamed(INDICATOR))
+    assert projected[0] == {"total": 2}
+    assert projected[1][0] == {
+        "indicator": {"value": "População"},
+        "country": {"value": "Brasil"},
+        "countryiso3code": "BRA",
+        "date": "2022",
+        "value": 215313498
+    }
+    assert projected[1][1]["value"] is None
+
+    countries = await COUNTRIES_PROJECTION.parse_stream(streamed(COUNTRIES))
+    assert countries == [{
+        "name": {"common": "Brasil"},
+        "capital": ["Brasília"],
+        "currencies": {"BRL": {"name": "Real", "symbol": "R$"}}
+    }]
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.core.settings import settings
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+from src.utils.http_client import HTTPClient
+from src.utils.quota import ProviderQuota, QuotaExceeded
+
+
+URL = "http://upstream.test/x"
+
+
+def used_today(quota: ProviderQuota) -> int:
+    day_key, _ = quota._keys(time.time())
+    return quota._local.get(day_key, 0)
+
+
+@pytest.fixture
+def client():
+    return httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+
+
+async def test_circuito_aberto_nao_consome_cota(memory_cache, client):
+    quota = ProviderQuota("test", daily=100)
+    breaker = CircuitBreaker("test", failure_rate=0.5, min_requests=1, window=60, open_seconds=30)
+    breaker.before_request()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        await HTTPClient(client)._attempt("GET", URL, "test", False, breaker, None, quota)
+
+    assert used_today(quota) == 0
+
+
+async def test_limitador_cheio_nao_consome_cota(memory_cache, client):
+    quota = ProviderQuota("test", daily=100)
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1, queue_timeout=0.01)
+    await limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await HTTPClient(client)._attempt("GET", URL, "test", False, None, limiter, quota)
+
+    assert used_today(quota) == 0
+
+
+async def test_cota_esgotada_devolve_a_vaga_e_a_sonda(memory_cache, client, monkeypatch):
+    monkeypatch.setattr(settings, "quota_throttle_ratio", 1.0)
+    quota = ProviderQuota("test", daily=1)
+    await quota.acquire()
+    limiter = AdaptiveConcurrencyLimiter("test", initial_limit=1, min_limit=1)
+    breaker = CircuitBreaker(
+        "test", failure_rate=0.5, min_requests=1, window=60, open_seconds=0.01, half_open_probes=1
+    )
+    breaker.before_request()
+    breaker.record_failure()
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(QuotaExceeded):
+        await HTTPClient(client)._attempt("GET", URL, "test", False, breaker, limiter, quota)
+
+    assert limiter.in_flight == 0
+    # A sonda do meio-aberto foi devolvida: outra chamada pode testar o upstream
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
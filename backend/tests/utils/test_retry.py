@@ -0,0 +1,108 @@
+import email.utils
+import time
+
+import httpx
+import pytest
+
+from src.utils import retry as retry_module
+from src.utils.retry import RetryBudget, RetryPolicy
+
+
+def status_error(status_code: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://upstream.test/x")
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError("erro", request=request, response=response)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = {"now": 1000.0}
+    monkeypatch.setattr(retry_module.time, "monotonic", lambda: state["now"])
+    return state
+
+
+def test_jitter_decorrelacionado_fica_entre_a_base_e_o_triplo_do_anterior():
+    policy = RetryPolicy(max_retries=3, base_delay=0.2, max_delay=5.0)
+    error = httpx.ConnectError("recusada")
+
+    delay = None
+    for _ in range(200):
+        previous = delay
+        delay = policy.next_delay(previous, error)
+        assert 0.2 <= delay <= min(5.0, (previous or 0.2) * 3)
+
+
+def test_jitter_nunca_passa_do_maximo():
+    policy = RetryPolicy(max_retries=3, base_delay=0.2, max_delay=1.0)
+    assert all(
+        policy.next_delay(10.0, httpx.ReadTimeout("lento")) <= 1.0 for _ in range(100)
+    )
+
+
+def test_retry_after_em_segundos_e_respeitado():
+    policy = RetryPolicy(max_retries=3, base_delay=0.2, max_delay=5.0)
+    assert policy.next_delay(None, status_error(429, {"Retry-After": "2"})) == 2.0
+
+
+def test_retry_after_em_data_http():
+    when = email.utils.formatdate(time.time() + 3, usegmt=True)
+    delay = RetryPolicy.retry_after(status_error(503, {"Retry-After": when}))
+    assert 0 < delay <= 3
+
+
+def test_retry_after_acima_do_maximo_desiste():
+    policy = RetryPolicy(max_retries=3, base_delay=0.2, max_delay=5.0)
+    assert policy.next_delay(None, status_error(429, {"Retry-After": "60"})) is None
+
+
+def test_retry_after_invalido_e_ignorado():
+    assert RetryPolicy.retry_after(status_error(503, {"Retry-After": "depois"})) is None
+
+
+@pytest.mark.parametrize("status_code,expected", [
+    (429, True), (502, True), (503, True), (504, True),
+    (400, False), (404, False), (500, False), (501, False),
+])
+def test_classificacao_de_status(status_code, expected):
+    assert RetryPolicy().should_retry("GET", status_error(status_code)) is expected
+
+
+@pytest.mark.parametrize("error,expected", [
+    (httpx.ConnectError("recusada"), True),
+    (httpx.ReadTimeout("lento"), True),
+    (httpx.RemoteProtocolError("fechada"), True),
+    (httpx.WriteError("quebrada"), False),
+])
+def test_classificacao_de_excecoes(error, expected):
+    assert RetryPolicy().should_retry("GET", error) is expected
+
+
+def test_metodo_nao_idempotente_nao_repete():
+    assert RetryPolicy().should_retry("POST", status_error(503)) is False
+
+
+def test_orcamento_se_esgota_e_reabastece(clock):
+    budget = RetryBudget(ratio=0.5, min_per_second=0.5)
+    assert budget.capacity == 5.0
+
+    assert sum(budget.try_acquire() for _ in range(10)) == 5
+    assert budget.try_acquire() is False
+
+    # Duas requisições depositam um retry
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_acquire() is True
+    assert budget.try_acquire() is False
+
+    # Piso mínimo: 0.5 token por segundo
+    clock["now"] += 2
+    assert budget.try_acquire() is True
+    assert budget.try_acquire() is False
+
+
+def test_orcamento_nao_passa_da_capacidade(clock):
+    budget = RetryBudget(ratio=1.0, min_per_second=0.1)
+    for _ in range(100):
+        budget.record_request()
+    clock["now"] += 3600
+    assert budget.tokens == budget.capacity == 1.0
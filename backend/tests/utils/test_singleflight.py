@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.settings import settings
+from src.utils.cache_policy import (
+    CachePolicy, current_cache_policy, reset_current_policy, set_current_policy
+)
+from src.utils.deadline import remaining, reset_deadline, set_deadline
+from src.utils.http_client import HTTPClient, HTTPException
+from src.utils.singleflight import SingleFlight
+
+
+async def test_chamadas_concorrentes_executam_uma_vez():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    followers = [asyncio.create_task(flight.do("k", fetch)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await leader == ("ok", False, 3)
+    assert [await f for f in followers] == [("ok", True, 0)] * 3
+    assert calls == 1
+    assert flight.in_flight() == 0
+
+
+async def test_seguidor_recebe_a_excecao_do_lider():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise ValueError("boom")
+
+    tasks = [asyncio.create_task(flight.do("k", fetch)) for _ in range(2)]
+    await asyncio.sleep(0)
+    release.set()
+
+    for task in tasks:
+        try:
+            await task
+        except ValueError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("esperava ValueError")
+
+
+async def test_cancelar_o_lider_nao_cancela_o_seguidor():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", fetch))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == ("ok", True, 0)
+    assert leader.cancelled()
+
+
+async def test_execucao_compartilhada_herda_so_o_prazo_do_lider():
+    flight = SingleFlight()
+    seen = []
+
+    async def fetch():
+        seen.append((remaining(), current_cache_policy()))
+        return "ok"
+
+    token = set_deadline(1.0)
+    policy_token = set_current_policy(CachePolicy(CachePolicy.PROCESSED))
+    try:
+        await flight.do("k", fetch)
+    finally:
+        reset_current_policy(policy_token)
+        reset_deadline(token)
+
+    (time_left, policy), = seen
+    assert 0 < time_left <= 1.0
+    assert policy is None
+
+
+async def test_get_coalescido_respeita_o_prazo_do_chamador(monkeypatch):
+    monkeypatch.setattr(settings, "circuit_breaker_enabled", False)
+    monkeypatch.setattr(settings, "concurrency_limit_enabled", False)
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(503)
+
+    token = set_deadline(0.5)
+    try:
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(HTTPException) as exc:
+                await HTTPClient(client).request(
+                    "GET", "http://deadline.test/x", use_cache=False
+                )
+    finally:
+        reset_deadline(token)
+
+    assert exc.value.status_code == 503
+    assert timeouts and all(timeout <= 0.5 for timeout in timeouts)
+    assert len(timeouts) < settings.max_retries + 1